@@ -32,7 +32,9 @@ from headless_cms.models import (
     LocalizedPublicationModel,
     LocalizedSingletonModel,
     M2MSortedOrderThrough,
+    PublishedQuerySet,
     SortableGenericBaseModel,
+    latest_version_subquery,
 )
 from headless_cms.utils.custom_import_export import override_modelresource_factory
 
@@ -40,10 +42,74 @@ from headless_cms.utils.custom_import_export import override_modelresource_facto
 class PublishStatusInlineMixin:
     """
     Mixin to show the publish status of related objects in inline admin.
+
+    The inline queryset selects the related objects and is annotated with their latest
+    version, so the status of every row is resolved without extra queries.
     """
 
     readonly_fields = ("publish_status",)
 
+    def get_publish_status_field(self):
+        """
+        Get the name of the field of the inline model holding the object whose publish
+        status is shown.
+
+        Returns:
+            str: The field name, or None if the status is the one of the inline object
+            itself or cannot be resolved.
+        """
+        if issubclass(self.model, M2MSortedOrderThrough):
+            field_name = None
+            for field in self.model._meta.get_fields():
+                rel_model = field.related_model
+                if not rel_model or not issubclass(
+                    rel_model, LocalizedPublicationModel
+                ):
+                    continue
+                if self.fk_name:
+                    if field.name != self.fk_name:
+                        return field.name
+                elif rel_model != self.parent_model:
+                    field_name = field.name
+            return field_name
+        if self.model._meta.auto_created:
+            parent_model = self.model._meta.auto_created
+            for field in self.model._meta.get_fields():
+                rel_model = field.related_model
+                if (
+                    rel_model
+                    and issubclass(rel_model, LocalizedPublicationModel)
+                    and rel_model != parent_model
+                ):
+                    return field.name
+        return None
+
+    def get_queryset(self, request):
+        """
+        Get the inline queryset, with the objects whose publish status is shown and their
+        latest version ID.
+
+        Args:
+            request (HttpRequest): The request object.
+
+        Returns:
+            QuerySet: The queryset.
+        """
+        queryset = super().get_queryset(request)
+        field_name = self.get_publish_status_field()
+        if field_name:
+            field = self.model._meta.get_field(field_name)
+            return queryset.select_related(field_name).annotate(
+                publish_status_latest_version_id=latest_version_subquery(
+                    field.related_model, field.attname, using=queryset.db
+                )
+            )
+        if issubclass(self.model, LocalizedPublicationModel):
+            return queryset.annotate(
+                latest_version_id=latest_version_subquery(self.model, using=queryset.db)
+            )
+        return queryset
+
     def _get_publish_status(self, obj):
         """
         Get the publish status of an object.
@@ -55,9 +121,8 @@ class PublishStatusInlineMixin:
             str: The publish status.
         """
         published_state = "unpublished"
-        if obj.published_version:
-            last_ver = Version.objects.get_for_object(obj).first()
-            if last_ver.id == obj.published_version.id:
+        if obj.published_version_id:
+            if obj.get_latest_version_id() == obj.published_version_id:
                 published_state = "published (latest)"
             else:
                 published_state = "published (outdated)"
@@ -73,36 +138,17 @@ class PublishStatusInlineMixin:
         Returns:
             str: The publish status.
         """
-        published_state = "unpublished"
-        if isinstance(obj, M2MSortedOrderThrough):
-            fields = obj._meta.get_fields()
-            for field in fields:
-                rel_model = field.related_model
-                if not rel_model or not issubclass(
-                    rel_model, LocalizedPublicationModel
-                ):
-                    continue
-                if self.fk_name:
-                    if field.name == self.fk_name:
-                        continue
-                    else:
-                        return self._get_publish_status(getattr(obj, field.name))
-                elif rel_model != self.parent_model:
-                    published_state = self._get_publish_status(getattr(obj, field.name))
-        elif obj._meta.auto_created:
-            parent_model = obj._meta.auto_created
-            fields = obj._meta.get_fields()
-            for field in fields:
-                rel_model = field.related_model
-                if not rel_model or not issubclass(
-                    rel_model, LocalizedPublicationModel
-                ):
-                    continue
-                if field.related_model != parent_model:
-                    return self._get_publish_status(getattr(obj, field.name))
-        else:
-            published_state = self._get_publish_status(obj)
-        return published_state
+        field_name = self.get_publish_status_field()
+        if field_name:
+            related_obj = getattr(obj, field_name)
+            if related_obj is None:
+                return "unpublished"
+            if "publish_status_latest_version_id" in obj.__dict__:
+                related_obj.latest_version_id = obj.publish_status_latest_version_id
+            return self._get_publish_status(related_obj)
+        if isinstance(obj, LocalizedPublicationModel):
+            return self._get_publish_status(obj)
+        return "unpublished"
 
 
 class BaseGenericAdmin(
@@ -128,6 +174,49 @@ class BaseSortableGenericAdmin(
     extra = 0
 
 
+def get_published_queryset(queryset):
+    """
+    Get a `PublishedQuerySet` of the objects selected by an admin queryset.
+
+    Args:
+        queryset (QuerySet): The selected objects.
+
+    Returns:
+        PublishedQuerySet: The same objects.
+    """
+    if isinstance(queryset, PublishedQuerySet):
+        return queryset
+    return PublishedQuerySet(
+        queryset.model, query=queryset.query.clone(), using=queryset.db
+    )
+
+
+class PublishStateFilter(admin.SimpleListFilter):
+    """
+    Changelist filter on the publication state of the objects, computed in SQL.
+    """
+
+    title = "publish state"
+    parameter_name = "publish_state"
+
+    def lookups(self, request, model_admin):
+        return [
+            ("unpublished", "unpublished"),
+            ("outdated", "published (outdated)"),
+            ("latest", "published (latest)"),
+        ]
+
+    def queryset(self, request, queryset):
+        queryset = get_published_queryset(queryset)
+        if self.value() == "unpublished":
+            return queryset.unpublished()
+        if self.value() == "outdated":
+            return queryset.published_outdated()
+        if self.value() == "latest":
+            return queryset.published_latest()
+        return queryset
+
+
 @admin.action(description="Publish selected")
 def publish(modeladmin, request, queryset):
     """
@@ -138,10 +227,7 @@ def publish(modeladmin, request, queryset):
         request (HttpRequest): The request object.
         queryset (QuerySet): The selected objects.
     """
-    obj: LocalizedPublicationModel
-
-    for obj in queryset.all():
-        obj.publish(request.user)
+    get_published_queryset(queryset).bulk_publish(request.user)
 
 
 @admin.action(description="Unpublish selected")
@@ -154,10 +240,7 @@ def unpublish(modeladmin, request, queryset):
         request (HttpRequest): The request object.
         queryset (QuerySet): The selected objects.
     """
-    obj: LocalizedPublicationModel
-
-    for obj in queryset.all():
-        obj.unpublish(request.user)
+    get_published_queryset(queryset).bulk_unpublish(request.user)
 
 
 @admin.action(description="Translate untranslated contents")
@@ -215,6 +298,21 @@ class EnhancedLocalizedVersionAdmin(
         models.TextField: {"widget": AdminMartorWidget},
     }
 
+    def get_queryset(self, request):
+        """
+        Get the queryset of the admin, annotated with the latest version of each object
+        so their publication state is known without extra queries.
+
+        Args:
+            request (HttpRequest): The request object.
+
+        Returns:
+            PublishedQuerySet: The annotated queryset.
+        """
+        return get_published_queryset(
+            super().get_queryset(request)
+        ).annotate_latest_version()
+
     def get_list_display(self, request):
         """
         Get the list display fields for the admin changelist.
@@ -228,6 +326,19 @@ class EnhancedLocalizedVersionAdmin(
         list_display = super().get_list_display(request)
         return list_display + ("published_state",)
 
+    def get_list_filter(self, request):
+        """
+        Get the list filters for the admin changelist.
+
+        Args:
+            request (HttpRequest): The request object.
+
+        Returns:
+            tuple: The list filters.
+        """
+        list_filter = tuple(super().get_list_filter(request))
+        return list_filter + (PublishStateFilter,)
+
     def render_change_form(self, request, context, *args, **kwargs):
         """
         Render the change form for the admin.
@@ -252,10 +363,9 @@ class EnhancedLocalizedVersionAdmin(
             )
 
             published_state = "unpublished"
-            if obj.published_version:
-                last_ver = Version.objects.get_for_object(obj).first()
+            if obj.published_version_id:
                 show_unpublish = True
-                if last_ver.id == obj.published_version.id:
+                if obj.get_latest_version_id() == obj.published_version_id:
                     published_state = "published (latest)"
                     show_publish = False
                 else:
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_metadata", "0002_awmetadata_add_skip_translation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awmetadata",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadataimage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadataopengraph",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadatarobot",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadatatwitter",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+    ]
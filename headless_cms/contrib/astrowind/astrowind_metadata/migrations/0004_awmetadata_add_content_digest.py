@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_metadata", "0003_awmetadata_add_tree_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awmetadata",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadataimage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadataopengraph",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadatarobot",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awmetadatatwitter",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -12,20 +12,20 @@ from headless_cms.models import (
 )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWMetadataRobot(LocalizedPublicationModel):
     index = BooleanField(default=False)
     follow = BooleanField(default=False)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWMetadataImage(LocalizedPublicationModel):
     url = LocalizedCharField(blank=True, null=True, required=False)
     width = IntegerField(default=0)
     height = IntegerField(default=0)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWMetaDataOpenGraph(LocalizedPublicationModel):
     url = LocalizedCharField(blank=True, null=True, required=False)
     site_name = LocalizedCharField(blank=True, null=True, required=False)
@@ -36,14 +36,14 @@ class AWMetaDataOpenGraph(LocalizedPublicationModel):
     type = models.CharField(default="", blank=True)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWMetaDataTwitter(LocalizedPublicationModel):
     handle = LocalizedCharField(blank=True, null=True, required=False)
     site = LocalizedCharField(blank=True, null=True, required=False)
     card_type = LocalizedCharField(blank=True, null=True, required=False)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWMetadata(LocalizedPublicationModel):
     title = LocalizedTextField(blank=True, null=True, required=False)
     title_template = LocalizedTextField(
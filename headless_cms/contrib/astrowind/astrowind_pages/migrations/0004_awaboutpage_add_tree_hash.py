@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_pages", "0003_awaboutpage_add_skip_translation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awaboutpage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awcontactpage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awindexpage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpostpage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpricingpage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awsite",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+    ]
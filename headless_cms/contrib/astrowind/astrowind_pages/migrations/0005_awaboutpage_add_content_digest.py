@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_pages", "0004_awaboutpage_add_tree_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awaboutpage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awcontactpage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awindexpage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpostpage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpricingpage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awsite",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -26,7 +26,7 @@ from headless_cms.models import (
 )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWIndexPage(LocalizedSingletonModel):
     title = LocalizedTextField(default=dict, blank=True, null=True)
 
@@ -58,7 +58,7 @@ class AWIndexPageContentThrough(M2MSortedOrderThrough):
     content = models.ForeignKey(AWContent, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWSite(LocalizedSingletonModel):
     header = models.ForeignKey(
         AWHeader, blank=True, null=True, on_delete=models.SET_NULL
@@ -93,7 +93,7 @@ class AWAboutStep2Through(M2MSortedOrderThrough):
     step2 = models.ForeignKey(AWStep2, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWAboutPage(LocalizedSingletonModel):
     title = LocalizedTextField(default=dict, blank=True, null=True)
 
@@ -110,7 +110,7 @@ class AWAboutPage(LocalizedSingletonModel):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPricingPage(LocalizedSingletonModel):
     title = LocalizedTextField(default=dict, blank=True, null=True)
 
@@ -130,7 +130,7 @@ class AWPricingPage(LocalizedSingletonModel):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWContactPage(LocalizedSingletonModel):
     title = LocalizedTextField(default=dict, blank=True, null=True)
 
@@ -145,7 +145,7 @@ class AWContactPage(LocalizedSingletonModel):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPostPage(LocalizedSingletonModel):
     title = LocalizedTextField(default=dict, blank=True, null=True)
     subtitle = LocalizedTextField(default=dict, blank=True, null=True)
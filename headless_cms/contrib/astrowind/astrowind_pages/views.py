@@ -9,11 +9,11 @@ from headless_cms.contrib.astrowind.astrowind_pages.models import (
     AWPricingPage,
     AWSite,
 )
-from headless_cms.mixins import CMSSchemaMixin
+from headless_cms.mixins import CMSSchemaMixin, PublishedSnapshotMixin
 from headless_cms.serializers import HashModelSerializer, auto_serializer
 
 
-class AWPageView(CMSSchemaMixin, RetrieveAPIView):
+class AWPageView(PublishedSnapshotMixin, CMSSchemaMixin, RetrieveAPIView):
     model = None
 
     def get_object(self):
@@ -24,6 +24,11 @@ class AWPageView(CMSSchemaMixin, RetrieveAPIView):
         return obj
 
 
+class AWPageHashView(AWPageView):
+    use_published_snapshot = False
+    serializer_class = HashModelSerializer
+
+
 class AWIndexPageView(AWPageView):
     serializer_class = auto_serializer(AWIndexPage)
     model = AWIndexPage
@@ -54,31 +59,25 @@ class AWPostPageView(AWPageView):
     model = AWPostPage
 
 
-class AWIndexPageHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWIndexPageHashView(AWPageHashView):
     model = AWIndexPage
 
 
-class AWSiteHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWSiteHashView(AWPageHashView):
     model = AWSite
 
 
-class AWAboutPageHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWAboutPageHashView(AWPageHashView):
     model = AWAboutPage
 
 
-class AWPricingPageHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWPricingPageHashView(AWPageHashView):
     model = AWPricingPage
 
 
-class AWContactPageHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWContactPageHashView(AWPageHashView):
     model = AWContactPage
 
 
-class AWPostPageHashView(AWPageView):
-    serializer_class = HashModelSerializer
+class AWPostPageHashView(AWPageHashView):
     model = AWPostPage
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_posts", "0003_alter_awpostimage_src_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awcategory",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpost",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpostimage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awposttag",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_posts", "0004_awcategory_add_tree_hash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="awpost",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("publish_date"), descending=True, nulls_first=True
+                ),
+                models.OrderBy(models.F("created_date"), descending=True),
+                condition=models.Q(("published_version__isnull", False)),
+                name="awpost_published_order_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_posts", "0005_awpost_published_order_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awcategory",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpost",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpostimage",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="awposttag",
+            name="content_digest",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
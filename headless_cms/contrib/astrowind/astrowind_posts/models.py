@@ -12,15 +12,16 @@ from headless_cms.models import (
     LocalizedDynamicFileModel,
     LocalizedTitleSlugModel,
     M2MSortedOrderThrough,
+    published_ordering_index,
 )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPostImage(LocalizedDynamicFileModel):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPost(LocalizedTitleSlugModel):
     excerpt = LocalizedTextField(blank=True, null=True, required=False)
     image = models.ForeignKey(
@@ -60,6 +61,9 @@ class AWPost(LocalizedTitleSlugModel):
     class Meta:
         ordering = [F("publish_date").desc(nulls_first=True), "-created_date"]
         index_together = ["publish_date", "created_date"]
+        indexes = [
+            published_ordering_index(ordering, name="awpost_published_order_idx")
+        ]
 
 
 class AWRelatedPost(M2MSortedOrderThrough):
@@ -73,11 +77,11 @@ class AWRelatedPost(M2MSortedOrderThrough):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWCategory(LocalizedTitleSlugModel):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPostTag(LocalizedTitleSlugModel):
     pass
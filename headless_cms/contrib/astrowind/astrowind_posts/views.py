@@ -13,7 +13,12 @@ from headless_cms.contrib.astrowind.astrowind_posts.models import (
 from headless_cms.contrib.astrowind.astrowind_posts.serializers import (
     RelatedPostSerializer,
 )
-from headless_cms.mixins import CMSSchemaMixin, HashModelMixin
+from headless_cms.mixins import (
+    CMSSchemaMixin,
+    CompiledSerializerMixin,
+    ETagMixin,
+    HashModelMixin,
+)
 from headless_cms.serializers import auto_serializer
 
 
@@ -45,7 +50,13 @@ class PostFilter(django_filters.FilterSet):
         fields = ["id", "category", "tag"]
 
 
-class AWPostCMSViewSet(CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet):
+class AWPostCMSViewSet(
+    ETagMixin,
+    CompiledSerializerMixin,
+    CMSSchemaMixin,
+    HashModelMixin,
+    ReadOnlyModelViewSet,
+):
     queryset = AWPost.published_objects.published(auto_prefetch=True)
     serializer_class = auto_serializer(
         AWPost,
@@ -57,13 +68,15 @@ class AWPostCMSViewSet(CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet):
     pagination_class = AWPostPaginator
 
 
-class AWPostTagViewSet(CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet):
+class AWPostTagViewSet(ETagMixin, CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet):
     queryset = AWPostTag.published_objects.published()
     serializer_class = auto_serializer(AWPostTag)
     pagination_class = None
 
 
-class AWCategoryViewSet(CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet):
+class AWCategoryViewSet(
+    ETagMixin, CMSSchemaMixin, HashModelMixin, ReadOnlyModelViewSet
+):
     queryset = AWCategory.published_objects.published()
     serializer_class = auto_serializer(AWCategory)
     pagination_class = None
@@ -0,0 +1,168 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_widgets", "0003_alter_awimage_src_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="awaction",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awbloghighlightedpost",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awbloglatestpost",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awbrand",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awcalltoaction",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awcontact",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awcontent",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awdisclaimer",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfaq",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfeature",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfeature2",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfeature3",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfooter",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfooterlink",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awfooterlinkitem",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awheader",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awheaderlink",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awhero",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awherotext",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awimage",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awinput",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awitem",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpriceitem",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awpricing",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awstat",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awstatitem",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awstep",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awstep2",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awtestimonial",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awtestimonialitem",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name="awtextarea",
+            name="tree_hash",
+            field=models.CharField(editable=False, max_length=128, null=True),
+        ),
+    ]
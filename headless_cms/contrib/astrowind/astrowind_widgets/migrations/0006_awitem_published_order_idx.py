@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("astrowind_widgets", "0005_awaction_add_content_digest"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="awinput",
+            index=models.Index(
+                models.OrderBy(models.F("position")),
+                condition=models.Q(("published_version__isnull", False)),
+                name="awinput_published_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="awitem",
+            index=models.Index(
+                models.OrderBy(models.F("position")),
+                condition=models.Q(("published_version__isnull", False)),
+                name="awitem_published_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="awtestimonialitem",
+            index=models.Index(
+                models.OrderBy(models.F("position")),
+                condition=models.Q(("published_version__isnull", False)),
+                name="awtestimonialitem_pub_idx",
+            ),
+        ),
+    ]
@@ -15,6 +15,7 @@ from headless_cms.models import (
     LocalizedPublicationModel,
     M2MSortedOrderThrough,
     SortableGenericBaseModel,
+    published_ordering_index,
 )
 
 
@@ -38,12 +39,20 @@ class AWAction(LocalizedPublicationModel):
     icon = CharField(default="", blank=True)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWItem(SortableGenericBaseModel):
     title = LocalizedTextField(blank=True, null=True, required=False)
     description = LocalizedTextField(blank=True, null=True, required=False)
     icon = models.CharField(blank=True, default="")
 
+    class Meta(SortableGenericBaseModel.Meta):
+        indexes = [
+            published_ordering_index(
+                SortableGenericBaseModel.Meta.ordering,
+                name="awitem_published_order_idx",
+            )
+        ]
+
 
 class AWBaseInput(LocalizedPublicationModel):
     type = CharField(default="text", blank=True)
@@ -56,17 +65,23 @@ class AWBaseInput(LocalizedPublicationModel):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWInput(SortableGenericBaseModel, AWBaseInput):
-    pass
+    class Meta(SortableGenericBaseModel.Meta):
+        indexes = [
+            published_ordering_index(
+                SortableGenericBaseModel.Meta.ordering,
+                name="awinput_published_order_idx",
+            )
+        ]
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWDisclaimer(LocalizedPublicationModel):
     label = LocalizedCharField(blank=True, null=True, required=False)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWTextArea(LocalizedPublicationModel):
     name = CharField(default="message")
     label = LocalizedCharField(blank=True, null=True, required=False)
@@ -84,7 +99,7 @@ class AWFragment(LocalizedPublicationModel):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWForm(LocalizedPublicationModel):
     inputs = GenericRelation(AWInput)
     textarea = models.ForeignKey(
@@ -111,7 +126,7 @@ class AWSection(AWFragment):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWHero(AWFragment):
     content = LocalizedTextField(blank=True, null=True, required=False)
 
@@ -135,13 +150,13 @@ class AWHeroActionThrough(M2MSortedOrderThrough):
     action = models.ForeignKey(AWAction, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFaq(AWSection):
     columns = IntegerField(default=2)
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWCallToAction(LocalizedPublicationModel):
     title = LocalizedTextField(blank=True, null=True, required=False)
     subtitle = LocalizedTextField(blank=True, null=True, required=False)
@@ -169,17 +184,17 @@ class BlogPostsBase(LocalizedPublicationModel):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWBlogHighlightedPost(BlogPostsBase):
     post_ids = ArrayField(IntegerField(), default=list, blank=True)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWBlogLatestPost(BlogPostsBase):
     count = IntegerField(default=0)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWBrand(AWFragment):
     images = models.ManyToManyField(
         AWImage,
@@ -194,12 +209,12 @@ class AWBrandImageThrough(M2MSortedOrderThrough):
     image = models.ForeignKey(AWImage, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWContact(AWFragment, AWForm):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWContent(AWSection):
     call_to_action = models.ForeignKey(
         AWAction,
@@ -232,17 +247,17 @@ class AWBaseFeature(AWSection):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFeature(AWBaseFeature):
     columns = models.IntegerField(default=2)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFeature2(AWBaseFeature):
     columns = models.IntegerField(default=3)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFeature3(AWBaseFeature):
     is_before_content = models.BooleanField(default=False)
     is_after_content = models.BooleanField(default=False)
@@ -258,7 +273,7 @@ class AWBaseLinkItem(LocalizedPublicationModel):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWHeaderLink(AWBaseLinkItem):
     links = models.ManyToManyField(
         "self", through="AWHeaderLinkSelfThrough", symmetrical=False
@@ -274,7 +289,7 @@ class AWHeaderLinkSelfThrough(M2MSortedOrderThrough):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWHeader(LocalizedPublicationModel):
     links = models.ManyToManyField(
         AWHeaderLink,
@@ -300,7 +315,7 @@ class AWHeaderActionThrough(M2MSortedOrderThrough):
     action = models.ForeignKey(AWAction, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFooterLink(LocalizedPublicationModel):
     title = LocalizedTextField(default=dict, blank=True, null=True, required=False)
     links = models.ManyToManyField(
@@ -311,7 +326,7 @@ class AWFooterLink(LocalizedPublicationModel):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFooterLinkItem(AWBaseLinkItem):
     pass
 
@@ -321,7 +336,7 @@ class AWFooterLinkThrough(M2MSortedOrderThrough):
     footer_link_item = models.ForeignKey(AWFooterLinkItem, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWFooter(LocalizedPublicationModel):
     links = models.ManyToManyField(
         AWFooterLink,
@@ -364,7 +379,7 @@ class AWFooterSocialLinksThrough(AWFooterLinkBaseThough):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWHeroText(AWFragment):
     content = LocalizedTextField(blank=True, null=True, required=False)
     call_to_action = models.ForeignKey(
@@ -383,7 +398,7 @@ class AWHeroText(AWFragment):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPriceItem(LocalizedPublicationModel):
     title = LocalizedCharField(blank=True, null=True, required=False)
     subtitle = LocalizedCharField(blank=True, null=True, required=False)
@@ -403,7 +418,7 @@ class AWPriceItem(LocalizedPublicationModel):
     items = GenericRelation(AWItem)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWPricing(AWFragment):
     prices = models.ManyToManyField(
         AWPriceItem,
@@ -418,7 +433,7 @@ class AWPriceItemThrough(M2MSortedOrderThrough):
     price_item = models.ForeignKey(AWPriceItem, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWStat(AWFragment):
     stats = models.ManyToManyField(
         "AWStatItem",
@@ -428,7 +443,7 @@ class AWStat(AWFragment):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWStatItem(LocalizedPublicationModel):
     title = LocalizedCharField(blank=True, null=True, required=False)
     amount = LocalizedCharField(blank=True, null=True, required=False)
@@ -440,7 +455,7 @@ class AWStatItemThrough(M2MSortedOrderThrough):
     stat_item = models.ForeignKey(AWStatItem, on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWStep(AWSection):
     is_reversed = models.BooleanField(default=False)
     image = models.ForeignKey(
@@ -452,7 +467,7 @@ class AWStep(AWSection):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWStep2(AWSection):
     is_reversed = models.BooleanField(default=False)
     call_to_action = models.ForeignKey(
@@ -464,7 +479,7 @@ class AWStep2(AWSection):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWTestimonial(AWFragment):
     call_to_action = models.ForeignKey(
         AWAction,
@@ -475,7 +490,7 @@ class AWTestimonial(AWFragment):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class AWTestimonialItem(LocalizedPublicationModel):
     title = LocalizedCharField(blank=True, null=True, required=False)
     testimonial = LocalizedCharField(blank=True, null=True, required=False)
@@ -502,3 +517,4 @@ class AWTestimonialItem(LocalizedPublicationModel):
 
     class Meta:
         ordering = ["position"]
+        indexes = [published_ordering_index(ordering, name="awtestimonialitem_pub_idx")]
@@ -0,0 +1,128 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from headless_cms.contrib.revision_partitions.partitioning import (
+    PARTITION_SIZE,
+    delete_orphans,
+    get_partition_range,
+    get_partitioning_manager,
+    is_partitioned,
+    partition_revision_tables,
+)
+
+
+class Command(BaseCommand):
+    """
+    Creates the upcoming monthly partitions of the revision tables and drops the ones
+    older than the retention period, except those holding published versions.
+
+    Usage:
+        python manage.py partition_revisions [--using DATABASE] [--convert] [--skip-create] [--skip-delete] [--dry-run]
+
+    Options:
+        --using: The database of the revision data.
+        --convert: Convert the revision tables into partitioned tables first, if needed.
+        --skip-create: Do not create partitions.
+        --skip-delete: Do not drop partitions.
+        --dry-run: Only list the partitions that would be created and dropped.
+
+    Converting the tables drops the foreign key constraints pointing to them, such as
+    the one of `published_version` on every CMS model, as PostgreSQL cannot keep them
+    on partitioned tables. The columns are kept, but the database no longer enforces
+    their referential integrity: only deletions made through the ORM clear them.
+    """
+
+    help = (
+        "Creates the upcoming partitions of the revision tables and drops the expired"
+        " ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--using",
+            default=DEFAULT_DB_ALIAS,
+            help="The database of the revision data.",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help=(
+                "Convert the revision tables into partitioned tables first, if needed."
+                " This drops the foreign key constraints pointing to them, e.g. from"
+                " published_version, which are not recreated."
+            ),
+        )
+        parser.add_argument(
+            "--skip-create",
+            action="store_true",
+            help="Do not create partitions.",
+        )
+        parser.add_argument(
+            "--skip-delete",
+            action="store_true",
+            help="Do not drop partitions.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the partitions that would be created and dropped.",
+        )
+
+    def convert(self, **options):
+        """
+        Convert the revision tables into partitioned tables, if needed.
+        """
+        using = options["using"]
+        if is_partitioned(using):
+            return
+        if not options["convert"]:
+            raise CommandError(
+                "The revision tables are not partitioned, run the command with"
+                " --convert to convert them."
+            )
+
+        if not options["dry_run"]:
+            partition_revision_tables(using)
+        if options["verbosity"] >= 1:
+            self.stdout.write(
+                "The revision tables would be partitioned."
+                if options["dry_run"]
+                else "Partitioned the revision tables."
+            )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+        using = options["using"]
+
+        self.convert(**options)
+        if options["dry_run"] and not is_partitioned(using):
+            return
+
+        plan = get_partitioning_manager(using).plan(
+            skip_create=options["skip_create"],
+            skip_delete=options["skip_delete"],
+            using=using,
+        )
+        if verbosity >= 1:
+            for model_plan in plan.model_plans:
+                table = model_plan.config.model._meta.db_table
+                for partition in model_plan.creations:
+                    self.stdout.write(f"+ {table}_{partition.name()}")
+                for partition in model_plan.deletions:
+                    self.stdout.write(f"- {table}_{partition.name()}")
+
+        if options["dry_run"]:
+            return
+
+        plan.apply(using=using)
+        if plan.deletions:
+            _, newest_end = max(map(get_partition_range, plan.deletions))
+            deleted = delete_orphans(newest_end + PARTITION_SIZE.as_delta(), using)
+            if verbosity >= 1:
+                self.stdout.write(f"Deleted {deleted} orphan rows.")
+
+        if verbosity >= 1:
+            self.stdout.write(
+                f"Created {len(plan.creations)} partitions, dropped"
+                f" {len(plan.deletions)} partitions."
+            )
@@ -0,0 +1,41 @@
+from django.db import models
+from psqlextra.models import PostgresPartitionedModel
+from psqlextra.types import PostgresPartitioningMethod
+
+
+class PartitionedRevision(PostgresPartitionedModel):
+    """
+    The reversion revision table, range partitioned by creation date.
+
+    The table is owned by `reversion.models.Revision`, this model only describes its
+    partitioning so psqlextra can manage the partitions.
+    """
+
+    date_created = models.DateTimeField()
+
+    class PartitioningMeta:
+        method = PostgresPartitioningMethod.RANGE
+        key = ["date_created"]
+
+    class Meta:
+        managed = False
+        db_table = "reversion_revision"
+
+
+class PartitionedVersion(PostgresPartitionedModel):
+    """
+    The reversion version table, range partitioned by the creation date of its revision.
+
+    The `date_created` column is added to the table when it is partitioned and filled in
+    by the database when a version is saved.
+    """
+
+    date_created = models.DateTimeField()
+
+    class PartitioningMeta:
+        method = PostgresPartitioningMethod.RANGE
+        key = ["date_created"]
+
+    class Meta:
+        managed = False
+        db_table = "reversion_version"
@@ -0,0 +1,312 @@
+from collections.abc import Generator
+from datetime import datetime, timezone
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from psqlextra.partitioning import (
+    PostgresCurrentTimePartitioningStrategy,
+    PostgresPartitioningConfig,
+    PostgresPartitioningManager,
+    PostgresTimePartition,
+    PostgresTimePartitionSize,
+)
+from psqlextra.partitioning.constants import AUTO_PARTITIONED_COMMENT
+from reversion.models import Revision, Version
+
+from headless_cms.contrib.revision_partitions.models import (
+    PartitionedRevision,
+    PartitionedVersion,
+)
+from headless_cms.models import LocalizedPublicationModel
+from headless_cms.settings import headless_cms_settings
+
+PARTITIONED_MODELS = (PartitionedRevision, PartitionedVersion)
+PARTITION_SIZE = PostgresTimePartitionSize(months=1)
+
+
+def get_partition_range(partition: PostgresTimePartition) -> tuple[datetime, datetime]:
+    """
+    Get the time range covered by a partition.
+
+    Args:
+        partition (PostgresTimePartition): The partition.
+
+    Returns:
+        tuple: The aware `(start, end)` datetimes, as the partition bounds are in UTC.
+    """
+    return (
+        partition.start_datetime.replace(tzinfo=timezone.utc),
+        partition.end_datetime.replace(tzinfo=timezone.utc),
+    )
+
+
+def holds_published_versions(
+    start: datetime, end: datetime, using: str = DEFAULT_DB_ALIAS
+) -> bool:
+    """
+    Check whether a time range of the revision tables holds a currently published
+    version, either in the version partition or in the revision partition.
+
+    Args:
+        start (datetime): The start of the range, included.
+        end (datetime): The end of the range, excluded.
+        using (str): The database alias.
+
+    Returns:
+        bool: True if dropping the partitions of the range would unpublish an object.
+    """
+    for model in apps.get_models():
+        if not issubclass(model, LocalizedPublicationModel) or model._meta.proxy:
+            continue
+
+        versions = PartitionedVersion.objects.using(using).filter(
+            pk=OuterRef("published_version_id"),
+            date_created__gte=start,
+            date_created__lt=end,
+        )
+        if (
+            model._base_manager.using(using)
+            .filter(
+                Q(Exists(versions))
+                | Q(
+                    published_version__revision__date_created__gte=start,
+                    published_version__revision__date_created__lt=end,
+                )
+            )
+            .exists()
+        ):
+            return True
+    return False
+
+
+class RevisionPartitioningStrategy(PostgresCurrentTimePartitioningStrategy):
+    """
+    Time partitioning strategy of the revision tables, which never deletes partitions
+    holding currently published versions.
+    """
+
+    def __init__(self, *args, using: str = DEFAULT_DB_ALIAS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.using = using
+
+    def to_delete(self) -> Generator[PostgresTimePartition, None, None]:
+        for partition in super().to_delete():
+            if not holds_published_versions(
+                *get_partition_range(partition), self.using
+            ):
+                yield partition
+
+
+def get_partitioning_manager(
+    using: str = DEFAULT_DB_ALIAS,
+) -> PostgresPartitioningManager:
+    """
+    Get the psqlextra partitioning manager of the revision tables.
+
+    Both tables are partitioned by month with the same strategy, so their partitions
+    cover the same ranges and are created and dropped together.
+
+    Args:
+        using (str): The database alias.
+
+    Returns:
+        PostgresPartitioningManager: The partitioning manager.
+    """
+    retention = headless_cms_settings.REVISION_RETENTION_MONTHS
+    strategy = RevisionPartitioningStrategy(
+        size=PARTITION_SIZE,
+        count=headless_cms_settings.REVISION_PARTITIONS_AHEAD,
+        max_age=relativedelta(months=retention) if retention else None,
+        using=using,
+    )
+    return PostgresPartitioningManager(
+        [PostgresPartitioningConfig(model, strategy) for model in PARTITIONED_MODELS]
+    )
+
+
+def is_partitioned(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Check whether the revision tables are partitioned.
+
+    Args:
+        using (str): The database alias.
+
+    Returns:
+        bool: True if both tables are partitioned.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        return all(
+            connection.introspection.get_partitioned_table(cursor, model._meta.db_table)
+            for model in PARTITIONED_MODELS
+        )
+
+
+def _get_constraints(cursor, table, excluded_tables):
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass
+            AND (contype != 'f' OR confrelid::regclass::text != ALL(%s))
+        """,
+        [table, list(excluded_tables)],
+    )
+    return cursor.fetchall()
+
+
+def _get_indexes(cursor, table):
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(indexrelid)
+        FROM pg_index
+        WHERE indrelid = %s::regclass
+            AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+        """,
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _partition_table(schema_editor, cursor, model, start):
+    table = model._meta.db_table
+    quoted_table = schema_editor.quote_name(table)
+    unpartitioned = schema_editor.quote_name(f"{table}_unpartitioned")
+    key = schema_editor.quote_name("date_created")
+
+    constraints = _get_constraints(
+        cursor, table, (m._meta.db_table for m in PARTITIONED_MODELS)
+    )
+    indexes = _get_indexes(cursor, table)
+    cursor.execute(
+        "SELECT pg_get_serial_sequence(%s, 'id'), attidentity != '' "
+        "FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'",
+        [table, table],
+    )
+    sequence, is_identity = cursor.fetchone()
+
+    cursor.execute(f"ALTER TABLE {quoted_table} RENAME TO {unpartitioned}")
+    cursor.execute(
+        f"CREATE TABLE {quoted_table} (LIKE {unpartitioned} INCLUDING DEFAULTS "
+        f"INCLUDING IDENTITY INCLUDING STORAGE INCLUDING COMMENTS) "
+        f"PARTITION BY RANGE ({key})"
+    )
+
+    # Existing rows get one partition per month since the oldest one, later rows
+    # outside the created partitions land in the default partition.
+    partition_start = PARTITION_SIZE.start(start.astimezone(timezone.utc))
+    end = PARTITION_SIZE.start(datetime.now(timezone.utc)) + (
+        PARTITION_SIZE.as_delta() * headless_cms_settings.REVISION_PARTITIONS_AHEAD
+    )
+    while partition_start < end:
+        PostgresTimePartition(
+            size=PARTITION_SIZE, start_datetime=partition_start
+        ).create(model, schema_editor, comment=AUTO_PARTITIONED_COMMENT)
+        partition_start += PARTITION_SIZE.as_delta()
+    schema_editor.add_default_partition(model, "default")
+
+    cursor.execute(f"INSERT INTO {quoted_table} SELECT * FROM {unpartitioned}")
+    if is_identity:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), MAX(id)) "
+            f"FROM {quoted_table} HAVING MAX(id) IS NOT NULL",
+            [table],
+        )
+    elif sequence:
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {quoted_table}.id")
+
+    # Dropping the old table also drops the foreign keys pointing to it, which cannot
+    # point to a partitioned table without including its partition key.
+    cursor.execute(f"DROP TABLE {unpartitioned} CASCADE")
+
+    for name, constraint_type, definition in constraints:
+        cursor.execute(
+            f"ALTER TABLE {quoted_table} ADD CONSTRAINT "
+            f"{schema_editor.quote_name(name)} "
+            # Unique constraints of partitioned tables must include the partition key.
+            + (
+                f"{definition[:-1]}, {key})"
+                if constraint_type in ("p", "u")
+                else definition
+            )
+        )
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_revision_tables(using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Convert the reversion revision and version tables into tables range partitioned by
+    creation date, in a single transaction.
+
+    The versions get a `date_created` column, filled in with the creation date of their
+    revision for the existing rows and with the statement time for new ones. Primary
+    keys and unique constraints are extended with the partition key. The foreign key
+    constraints pointing to either table, e.g. from `published_version`, are dropped and
+    not recreated, so the database no longer enforces the integrity of those columns.
+
+    Args:
+        using (str): The database alias.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        with connection.schema_editor(atomic=False) as schema_editor:
+            cursor.execute(
+                "ALTER TABLE reversion_version ADD COLUMN date_created "
+                "timestamp with time zone"
+            )
+            cursor.execute(
+                "UPDATE reversion_version SET date_created = reversion_revision.date_created "
+                "FROM reversion_revision "
+                "WHERE reversion_revision.id = reversion_version.revision_id"
+            )
+            cursor.execute(
+                "ALTER TABLE reversion_version "
+                "ALTER COLUMN date_created SET DEFAULT statement_timestamp(), "
+                "ALTER COLUMN date_created SET NOT NULL"
+            )
+
+            start = (
+                Revision.objects.using(using)
+                .order_by("date_created")
+                .values_list("date_created", flat=True)
+                .first()
+            ) or datetime.now(timezone.utc)
+            for model in PARTITIONED_MODELS:
+                _partition_table(schema_editor, cursor, model, start)
+
+
+def delete_orphans(before: datetime, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Delete the versions whose revision was dropped with an older partition, and the
+    revisions left without versions, up to a date.
+
+    A version is dated when it is saved, shortly after its revision, so a few of them
+    can land in the partition after the one of their revision.
+
+    Args:
+        before (datetime): Only rows created before this date are deleted.
+        using (str): The database alias.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    deleted, _ = (
+        Version.objects.using(using)
+        .filter(
+            pk__in=PartitionedVersion.objects.using(using)
+            .filter(date_created__lt=before)
+            .values("pk")
+        )
+        .exclude(Exists(Revision.objects.filter(pk=OuterRef("revision_id"))))
+        .delete()
+    )
+    revisions_deleted, _ = (
+        Revision.objects.using(using)
+        .filter(date_created__lt=before)
+        .exclude(Exists(Version.objects.filter(revision_id=OuterRef("pk"))))
+        .delete()
+    )
+    return deleted + revisions_deleted
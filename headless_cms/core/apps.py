@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "headless_cms.core"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from headless_cms.core import signals  # noqa
@@ -1,9 +1,14 @@
+import time
 from datetime import timedelta
 
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
 from django.db import models, router, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Cast
 from django.utils import timezone
 from reversion.management.commands import BaseRevisionCommand
-from reversion.models import Revision
+from reversion.models import Revision, Version
 
 from headless_cms.models import LocalizedPublicationModel
 
@@ -12,14 +17,19 @@ class Command(BaseRevisionCommand):
     """
     Deletes outdated drafts.
 
+    A revision is outdated when it holds a version older than the published version of
+    its object. Revisions still holding a published version are kept.
+
     Usage:
-        python manage.py clean_outdated_drafts [app_label ...] [--using DATABASE] [--model-db DATABASE] [--days DAYS]
+        python manage.py clean_outdated_drafts [app_label ...] [--using DATABASE] [--model-db DATABASE] [--days DAYS] [--batch-size BATCH_SIZE] [--dry-run]
 
     Options:
         app_label: Optional app_label or app_label.model_name list.
         --using: The database to query for revision data.
         --model-db: The database to query for model data.
         --days: Delete only revisions older than the specified number of days.
+        --batch-size: Number of revisions deleted per transaction.
+        --dry-run: Only count the outdated revisions.
     """
 
     help = "Deletes outdated drafts."
@@ -32,51 +42,142 @@ class Command(BaseRevisionCommand):
             type=int,
             help="Delete only revisions older than the specified number of days.",
         )
+        parser.add_argument(
+            "--batch-size",
+            default=1000,
+            type=int,
+            help="Number of revisions deleted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the outdated revisions.",
+        )
+
+    def get_outdated_versions(self, model, using, model_db):
+        """
+        Get the versions of a model that are older than the published version of their
+        object.
+
+        Args:
+            model (type[LocalizedPublicationModel]): The model class.
+            using (str): The database of the revision data.
+            model_db (str): The database of the model data, or None to route it.
+
+        Returns:
+            QuerySet: The outdated versions.
+        """
+        published_objs = (
+            model._base_manager.using(using)
+            .annotate(object_key=Cast("pk", models.CharField()))
+            .filter(
+                object_key=OuterRef("object_id"),
+                published_version_id__gt=OuterRef("pk"),
+            )
+        )
+        return Version.objects.using(using).filter(
+            Exists(published_objs),
+            content_type=ContentType.objects.db_manager(using).get_for_model(model),
+            db=model_db or router.db_for_write(model),
+        )
+
+    def get_outdated_revisions(self, publication_models, using, model_db, days):
+        """
+        Get the outdated revisions of the given models.
+
+        Args:
+            publication_models (list): The model classes.
+            using (str): The database of the revision data.
+            model_db (str): The database of the model data, or None to route it.
+            days (int): Only revisions older than this number of days are included.
+
+        Returns:
+            QuerySet: The outdated revisions, ordered by ID.
+        """
+        outdated = models.Q()
+        for model in publication_models:
+            outdated |= models.Q(
+                pk__in=self.get_outdated_versions(model, using, model_db).values(
+                    "revision_id"
+                )
+            )
+
+        # Deleting a revision deletes all its versions, so revisions still holding a
+        # published version, possibly of another model, are kept.
+        published = models.Q()
+        for model in apps.get_models():
+            if issubclass(model, LocalizedPublicationModel) and not model._meta.proxy:
+                published |= models.Q(
+                    Exists(
+                        model._base_manager.using(using).filter(
+                            published_version__revision=OuterRef("pk")
+                        )
+                    )
+                )
+
+        return (
+            Revision.objects.using(using)
+            .filter(outdated, date_created__lt=timezone.now() - timedelta(days=days))
+            .exclude(published)
+            .order_by("pk")
+        )
 
     def handle(self, *app_labels, **options):
         verbosity = options["verbosity"]
-        using = options["using"]
-        days = options["days"]
-        using = using or router.db_for_write(Revision)
-        with transaction.atomic(using=using):
-            revision_query = models.Q()
-            remove_revision_ids = set()
-            can_delete = False
-            for model in self.get_models(options):
-                if not issubclass(model, LocalizedPublicationModel):
-                    continue
+        using = options["using"] or router.db_for_write(Revision)
+        model_db = options["model_db"]
+        batch_size = options["batch_size"]
+
+        publication_models = []
+        for model in self.get_models(options):
+            if issubclass(model, LocalizedPublicationModel):
+                publication_models.append(model)
                 if verbosity >= 1:
                     self.stdout.write(
                         f"Finding outdated draft revisions for {model._meta.verbose_name}"
                     )
+        if not publication_models:
+            return
 
-                published_objs = (
-                    model.objects.using(using)
-                    .prefetch_related("versions")
-                    .filter(published_version_id__isnull=False)
-                )
-                for obj in published_objs:
-                    remove_revision_ids.update(
-                        obj.versions.filter(id__lt=obj.published_version_id)
-                        .values_list("revision_id", flat=True)
-                        .iterator()
-                    )
+        revisions_to_delete = self.get_outdated_revisions(
+            publication_models, using, model_db, options["days"]
+        )
 
-                revision_query |= models.Q(pk__in=remove_revision_ids)
-                can_delete = True
-            if can_delete:
-                revisions_to_delete = (
-                    Revision.objects.using(using)
-                    .filter(
-                        revision_query,
-                        date_created__lt=timezone.now() - timedelta(days=days),
-                    )
-                    .order_by()
+        if options["dry_run"]:
+            if verbosity >= 1:
+                self.stdout.write(
+                    f"{revisions_to_delete.count()} revisions would be deleted."
                 )
-            else:
-                revisions_to_delete = Revision.objects.using(using).none()
+            return
+
+        deleted = 0
+        last_pk = 0
+        started = time.monotonic()
+        while True:
+            # Each batch resumes after the last one, so deleted rows are not scanned again.
+            pks = list(
+                revisions_to_delete.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic(using=using):
+                Revision.objects.using(using).filter(pk__in=pks).delete()
+            deleted += len(pks)
+            last_pk = pks[-1]
+
             if verbosity >= 1:
                 self.stdout.write(
-                    f"Deleting {revisions_to_delete.count()} revisions..."
+                    f"Deleted {deleted} revisions ({self.rate(deleted, started)})..."
                 )
-            revisions_to_delete.delete()
+
+        if verbosity >= 1:
+            self.stdout.write(
+                f"Deleted {deleted} revisions in {time.monotonic() - started:.1f}s."
+            )
+
+    def rate(self, count, started):
+        elapsed = time.monotonic() - started
+        return f"{count / elapsed if elapsed else 0:.1f}/s"
@@ -1,14 +1,210 @@
+import functools
 import json
-import shutil
+import time
 from datetime import datetime
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import NamedTuple, Optional
 
-from django.contrib.contenttypes.fields import GenericRelation
+import reversion
+from django.apps import apps
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.core.management import CommandError
 from django.db.models import ForeignKey, ManyToManyField
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from reversion.management.commands import BaseRevisionCommand
+from reversion.models import Version
 
 from headless_cms.models import LocalizedPublicationModel
-from headless_cms.utils.custom_import_export import override_modelresource_factory
+from headless_cms.utils.archives import (
+    ARCHIVE_EXTENSIONS,
+    ArchiveReader,
+    ArchiveWriter,
+    get_archive_format,
+    guess_archive_format,
+)
+from headless_cms.utils.custom_import_export import (
+    DEFAULT_CHUNK_SIZE,
+    MANIFEST_FILE_NAME,
+    get_row_digest,
+    override_modelresource_factory,
+)
+from headless_cms.utils.executors import PROCESS, SYNC, iter_actions
+
+
+def get_updated_pks(model, since):
+    """
+    Get the objects of a model with a version created after a date.
+
+    Args:
+        model (type[Model]): The model class.
+        since (datetime): The date.
+
+    Returns:
+        set[str]: The primary keys of the objects, or None if the model is not
+        versioned.
+    """
+    if not reversion.is_registered(model):
+        return None
+    return set(
+        Version.objects.get_for_model(model)
+        .filter(revision__date_created__gt=since)
+        .values_list("object_id", flat=True)
+    )
+
+
+class ExportOptions(NamedTuple):
+    """
+    Options of the export of the data of a model.
+
+    Attributes:
+        output_format (str): The output format, `json` or `jsonl`.
+        compact (bool): Whether to write the JSON format without indentation.
+        chunk_size (int): The number of objects fetched per query with the `jsonl`
+            format or a manifest.
+        manifest (bool): Whether to hash the objects for the export manifest, and only
+            write the changed ones, see `write_model_delta`.
+        since (datetime): The date of the previous export, with `manifest`.
+        previous_hashes (dict): The object hashes of the previous export by primary
+            key, with `manifest`.
+        published (bool): Whether to export the published version of each object.
+    """
+
+    output_format: str = "json"
+    compact: bool = False
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    manifest: bool = False
+    since: Optional[datetime] = None
+    previous_hashes: Optional[dict] = None
+    published: bool = False
+
+
+DEFAULT_EXPORT_OPTIONS = ExportOptions()
+
+
+def write_model_delta(resource, file, options):
+    """
+    Write the objects of a model changed since a previous export, and hash all of them
+    for the export manifest.
+
+    An object is written if its hash differs from the one of the previous export, or if
+    it has a version created after `options.since`. Without either, every object is
+    written.
+
+    Args:
+        resource (LocalizedModelResource): The resource of the model.
+        file (TextIO): The file to write to.
+        options (ExportOptions): The export options.
+
+    Returns:
+        dict: The hashes of all the objects, by primary key.
+    """
+    previous_hashes = options.previous_hashes
+    updated_pks = (
+        get_updated_pks(resource._meta.model, options.since) if options.since else None
+    )
+
+    def is_changed(pk, digest):
+        if previous_hashes is not None and previous_hashes.get(pk) != digest:
+            return True
+        if updated_pks is not None:
+            return pk in updated_pks
+        # Objects of unversioned models are only compared by hash.
+        return previous_hashes is None
+
+    hashes = {}
+    rows = []
+    for obj, row in resource.iter_export_rows(chunk_size=options.chunk_size):
+        pk = str(obj.pk)
+        hashes[pk] = get_row_digest(row)
+        if not is_changed(pk, hashes[pk]):
+            continue
+        if options.output_format == "jsonl":
+            file.write(json.dumps(row))
+            file.write("\n")
+        else:
+            rows.append(row)
+
+    if options.output_format != "jsonl":
+        file.write(json.dumps(rows) if options.compact else json.dumps(rows, indent=2))
+    return hashes
+
+
+def write_model_data(model_label, file, options=DEFAULT_EXPORT_OPTIONS):
+    """
+    Write the data of a model to a text file.
+
+    Args:
+        model_label (str): The `app_label.ModelName` label of the model.
+        file (TextIO): The file to write to.
+        options (ExportOptions): The export options.
+
+    Returns:
+        dict: The hashes of the objects by primary key with `options.manifest`, else
+        None.
+    """
+    export_model_resource = override_modelresource_factory(
+        apps.get_model(model_label),
+        exclude_m2m=True,
+        with_published=options.published,
+    )
+    export_model = export_model_resource()
+
+    if options.manifest:
+        return write_model_delta(export_model, file, options)
+
+    if options.output_format == "jsonl":
+        export_model.export_jsonl(file, chunk_size=options.chunk_size)
+    else:
+        data = export_model.export()
+        file.write(data.json if options.compact else json.dumps(data.dict, indent=2))
+    return None
+
+
+def export_model_data(model_label, dest_file, options=DEFAULT_EXPORT_OPTIONS):
+    """
+    Export the data of a model to a file.
+
+    Args:
+        model_label (str): The `app_label.ModelName` label of the model.
+        dest_file (Path): The file to write to.
+        options (ExportOptions): The export options.
+
+    Returns:
+        tuple[float, dict]: The export duration in seconds and the object hashes.
+    """
+    started = time.monotonic()
+    dest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(dest_file, "w") as f:
+        hashes = write_model_data(model_label, f, options)
+    return time.monotonic() - started, hashes
+
+
+def read_manifest(path):
+    """
+    Read the manifest of a previous export.
+
+    Args:
+        path (Path): The manifest file, or the export directory or archive.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        CommandError: If the export has no manifest.
+    """
+    if path.is_dir():
+        path = path / MANIFEST_FILE_NAME
+    if path.suffix == ".json":
+        return json.loads(path.read_text())
+
+    with ArchiveReader(path, guess_archive_format(path)) as archive:
+        f = archive.open(MANIFEST_FILE_NAME)
+        if f is None:
+            raise CommandError(f"The export {path} has no manifest.")
+        with f:
+            return json.load(f)
 
 
 class Command(BaseRevisionCommand):
@@ -16,15 +212,27 @@ class Command(BaseRevisionCommand):
     Exports data recursively of a Django app into JSON files.
 
     Usage:
-        python manage.py export_cms_data [app_label ...] [--using DATABASE] [--model-db DATABASE] [--output DIRECTORY] [--compress] [--cf FORMAT]
+        python manage.py export_cms_data [app_label ...] [--using DATABASE] [--model-db DATABASE] [--output DIRECTORY] [--compress] [--cf FORMAT] [--format FORMAT] [--chunk-size CHUNK_SIZE] [--jobs JOBS] [--manifest] [--since DATE_OR_EXPORT] [--published]
 
     Options:
         app_label: Optional app_label or app_label.model_name list.
         --using: The database to query for revision data.
         --model-db: The database to query for model data.
         --output: Export data to this directory.
-        --compress: Compress data.
-        --cf, --compress-format: Compression format (default is zip).
+        --compress: Write the data straight into an archive, without a temporary
+            directory.
+        --cf, --compress-format: Compression format, zip, tar, gztar, bztar, xztar or
+            zstd (default is zip). The zstd format requires the zstandard package.
+        --format: Output format, json or jsonl (default is json). The jsonl format is
+            streamed one object per line, with bounded memory usage.
+        --chunk-size: Number of objects fetched per query with the jsonl format.
+        --jobs: Number of models exported in parallel, each in its own process with its
+            own database connection (default is 1).
+        --manifest: Write a manifest with the hash of each exported object.
+        --since: Only export the objects changed since a date, or since a previous
+            export given by its manifest, directory or archive. Implies --manifest.
+        --published: Also export the published version of each object, restored by
+            import_cms_data.
     """
 
     help = "Export data recursively of a Django app into JSON files."
@@ -42,7 +250,7 @@ class Command(BaseRevisionCommand):
             "--compress-format",
             default="zip",
             type=str,
-            help="Compression format.",
+            help="Compression format: zip, tar, gztar, bztar, xztar or zstd.",
         )
         parser.add_argument(
             "--compress",
@@ -50,23 +258,87 @@ class Command(BaseRevisionCommand):
             action="store_true",
             help="Compress data",
         )
+        parser.add_argument(
+            "--format",
+            default="json",
+            choices=["json", "jsonl"],
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            default=DEFAULT_CHUNK_SIZE,
+            type=int,
+            help="Number of objects fetched per query with the jsonl format.",
+        )
+        parser.add_argument(
+            "--jobs",
+            default=1,
+            type=int,
+            help="Number of models exported in parallel processes.",
+        )
+        parser.add_argument(
+            "--manifest",
+            default=False,
+            action="store_true",
+            help="Write a manifest with the hash of each exported object.",
+        )
+        parser.add_argument(
+            "--since",
+            default=None,
+            type=str,
+            help="Only export the objects changed since a date or a previous export.",
+        )
+        parser.add_argument(
+            "--published",
+            default=False,
+            action="store_true",
+            help="Also export the published version of each object.",
+        )
 
     def __init__(self, stdout=None, stderr=None, no_color=False, force_color=False):
         super().__init__(stdout, stderr, no_color, force_color)
-        self.exported_models = set()
+        self.visited_models = set()
+        # The exported models, each one after the models it depends on.
+        self.exported_models = []
+        # The models of generic relations, which may point to any exported model.
+        self.generic_models = []
         self.base_output_dir = None
         self.data_output_dir = None
         self.current_time = None
         self.should_compress = False
+        self.archive = None
+        self.output_format = "json"
+        self.chunk_size = DEFAULT_CHUNK_SIZE
+        self.with_manifest = False
+        self.started_at = None
+        self.since = None
+        self.previous_hashes = None
+        self.hashes = {}
+        self.with_published = False
         self.verbosity = 0
 
     def export_model(self, model):
-        if model in self.exported_models:
+        """
+        Add a model to the export after the publication models it depends on, followed
+        by its many-to-many through models, in the order `import_cms_data` reads them,
+        so archives can be read sequentially. The models of generic relations are
+        deferred, see `add_generic_models`.
+
+        Args:
+            model (type[Model]): The model class.
+        """
+        if model in self.visited_models:
             return
-        self.exported_models.add(model)
+        self.visited_models.add(model)
         model_fields = model._meta.get_fields()
+
+        through_models = []
         for field in model_fields:
-            if isinstance(field, (GenericRelation, ForeignKey)) and issubclass(
+            if isinstance(field, GenericRelation) and issubclass(
+                field.related_model, LocalizedPublicationModel
+            ):
+                self.generic_models.append(field.related_model)
+            elif isinstance(field, ForeignKey) and issubclass(
                 field.related_model, LocalizedPublicationModel
             ):
                 self.export_model(field.related_model)
@@ -75,55 +347,249 @@ class Command(BaseRevisionCommand):
             ):
                 self.export_model(field.related_model)
                 through = getattr(model, field.name).through
-                self.export_model(through)
+                through_models.append(through)
 
-        export_model_resource = override_modelresource_factory(model, exclude_m2m=True)
-        export_model = export_model_resource()
+        self.exported_models.append(model)
+        for through in through_models:
+            self.export_model(through)
 
-        data = export_model.export()
+    def add_generic_models(self):
+        """
+        Add the deferred models of generic relations, which may point to any exported
+        model, last.
+        """
+        while self.generic_models:
+            self.export_model(self.generic_models.pop(0))
+
+    def get_file_name(self, model):
+        """
+        Get the path of the data file of a model, relative to the export root.
+
+        Args:
+            model (type[Model]): The model class.
+
+        Returns:
+            str: The file path.
+        """
+        return f"{model._meta.app_label}/{model._meta.object_name}.{self.output_format}"
+
+    def iter_exports(self, models, jobs):
+        """
+        Export the data of models to the output directory, or straight into the archive
+        when compressing.
+
+        Args:
+            models (list[type[Model]]): The model classes.
+            jobs (int): The number of models exported in parallel.
+
+        Yields:
+            tuple[int, float, dict]: The index of each exported model, its export
+            duration and its object hashes, in completion order, or in the export order
+            when writing into an archive.
+        """
+        options = [
+            ExportOptions(
+                output_format=self.output_format,
+                compact=self.should_compress,
+                chunk_size=self.chunk_size,
+                manifest=self.with_manifest,
+                since=self.since,
+                previous_hashes=(
+                    None
+                    if self.previous_hashes is None
+                    else self.previous_hashes.get(model._meta.label, {})
+                ),
+                published=self.with_published,
+            )
+            for model in models
+        ]
+        executor = PROCESS if jobs > 1 else SYNC
+
+        if self.archive is None:
+            actions = [
+                functools.partial(
+                    export_model_data,
+                    model._meta.label,
+                    self.data_output_dir / self.get_file_name(model),
+                    model_options,
+                )
+                for model, model_options in zip(models, options)
+            ]
+            for index, (elapsed, hashes) in iter_actions(
+                actions, executor=executor, max_workers=jobs
+            ):
+                yield index, elapsed, hashes
+        elif jobs > 1:
+            # The archive is written by this process only. The workers write each model
+            # to a temporary file, copied into the archive in the export order.
+            with TemporaryDirectory() as temp_dir:
+                temp_files = [
+                    Path(temp_dir) / self.get_file_name(model) for model in models
+                ]
+                actions = [
+                    functools.partial(
+                        export_model_data, model._meta.label, temp_file, model_options
+                    )
+                    for model, temp_file, model_options in zip(
+                        models, temp_files, options
+                    )
+                ]
+                done = {}
+                next_index = 0
+                for index, result in iter_actions(
+                    actions, executor=executor, max_workers=jobs
+                ):
+                    done[index] = result
+                    while next_index in done:
+                        elapsed, hashes = done.pop(next_index)
+                        started = time.monotonic()
+                        temp_file = temp_files[next_index]
+                        self.archive.write_file(
+                            self.get_file_name(models[next_index]), temp_file
+                        )
+                        temp_file.unlink()
+                        yield next_index, elapsed + time.monotonic() - started, hashes
+                        next_index += 1
+        else:
+            for index, model in enumerate(models):
+                started = time.monotonic()
+                with self.archive.open(self.get_file_name(model)) as f:
+                    hashes = write_model_data(model._meta.label, f, options[index])
+                yield index, time.monotonic() - started, hashes
+
+    def export_models(self, jobs):
+        """
+        Export the data of the added models, reporting the duration of each one.
+
+        Args:
+            jobs (int): The number of models exported in parallel.
+        """
+        models = list(self.exported_models)
+
+        started = time.monotonic()
+        for index, elapsed, hashes in self.iter_exports(models, jobs):
+            if hashes is not None:
+                self.hashes[models[index]._meta.label] = hashes
+            if self.verbosity >= 1:
+                self.stdout.write(
+                    f"Export data for {models[index]._meta.object_name}"
+                    f" ({elapsed:.2f}s)"
+                )
         if self.verbosity >= 1:
-            self.stdout.write(f"Export data for {model._meta.object_name}")
+            self.stdout.write(
+                f"Exported {len(models)} models in {time.monotonic() - started:.2f}s"
+            )
 
-        dest_dir: Path = self.data_output_dir / model._meta.app_label
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        dest_file: Path = dest_dir / f"{model._meta.object_name}.json"
+    def parse_since(self, value):
+        """
+        Parse the `--since` option.
 
-        with open(dest_file, "w") as f:
-            f.write(
-                json.dumps(data.dict, indent=2)
-                if not self.should_compress
-                else data.json
+        Args:
+            value (str): A date, a date and time, or the manifest, directory or archive
+                of a previous export.
+
+        Returns:
+            tuple[datetime, dict]: The date to export the changes since, and the object
+            hashes of the previous export by model label, or None for a date.
+        """
+        path = Path(value)
+        if path.exists():
+            manifest = read_manifest(path)
+            return datetime.fromisoformat(manifest["created"]), manifest["models"]
+
+        since = parse_datetime(value)
+        if since is None and (date := parse_date(value)):
+            since = datetime.combine(date, datetime.min.time())
+        if since is None:
+            raise CommandError(
+                f"--since must be a date, a date and time, or a previous export: {value}"
             )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since, None
+
+    def build_manifest(self):
+        """
+        Build the export manifest, with the hash of each object and, for a delta export
+        since a previous one, the objects deleted since.
+
+        Returns:
+            dict: The manifest.
+        """
+        deleted = {}
+        if self.previous_hashes is not None:
+            for label, hashes in self.hashes.items():
+                if pks := set(self.previous_hashes.get(label, {})) - set(hashes):
+                    deleted[label] = sorted(pks)
+        return {
+            "created": self.started_at.isoformat(),
+            "since": self.since.isoformat() if self.since else None,
+            "models": self.hashes,
+            "deleted": deleted,
+        }
+
+    def write_manifest(self):
+        data = json.dumps(self.build_manifest(), indent=2)
+        if self.archive is None:
+            (self.data_output_dir / MANIFEST_FILE_NAME).write_text(data)
+        else:
+            self.archive.write(MANIFEST_FILE_NAME, data)
 
     def handle(self, *app_labels, **options):
         self.base_output_dir = Path(options["output"])
         self.current_time = datetime.now().strftime("%Y%m%d-%H%M%S")
         self.data_output_dir = self.base_output_dir / self.current_time
 
-        print(f"Export data to {self.data_output_dir}")
-
         self.should_compress = options["compress"]
+        self.output_format = options["format"]
+        self.chunk_size = options["chunk_size"]
+        self.verbosity = options["verbosity"]
+        # Taken before reading any object, so the next delta export sees the changes
+        # made during this one.
+        self.started_at = timezone.now()
+        if options["since"]:
+            self.since, self.previous_hashes = self.parse_since(options["since"])
+        self.with_manifest = options["manifest"] or self.since is not None
+        self.with_published = options["published"]
 
-        if not self.data_output_dir.exists():
-            self.data_output_dir.mkdir(parents=True, exist_ok=True)
+        if self.should_compress:
+            try:
+                archive_format = get_archive_format(options["cf"])
+            except ValueError as e:
+                raise CommandError(e) from e
+            output_path = self.base_output_dir / (
+                f"{self.current_time}{ARCHIVE_EXTENSIONS[archive_format]}"
+            )
+        else:
+            output_path = self.data_output_dir
 
-        self.verbosity = options["verbosity"]
+        print(f"Export data to {output_path}")
 
         for model in self.get_models(options):
             if not issubclass(model, LocalizedPublicationModel):
                 continue
 
-            self.export_model(model)
-
-        if self.should_compress:
-            self.compress_output(options["cf"])
-
-        self.clean_up()
+            if any(
+                isinstance(f, GenericForeignKey) for f in model._meta.private_fields
+            ):
+                self.generic_models.append(model)
+            else:
+                self.export_model(model)
+        self.add_generic_models()
 
-    def compress_output(self, compress_format):
-        dest_file = self.base_output_dir / f"{self.current_time}"
-        shutil.make_archive(dest_file, compress_format, self.data_output_dir)
+        if not self.should_compress:
+            self.data_output_dir.mkdir(parents=True, exist_ok=True)
+            self.export_models(options["jobs"])
+            if self.with_manifest:
+                self.write_manifest()
+            return
 
-    def clean_up(self):
-        if self.should_compress:
-            shutil.rmtree(self.data_output_dir)
+        self.base_output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.archive = ArchiveWriter(output_path, archive_format)
+        except ValueError as e:
+            raise CommandError(e) from e
+        with self.archive:
+            self.export_models(options["jobs"])
+            if self.with_manifest:
+                self.write_manifest()
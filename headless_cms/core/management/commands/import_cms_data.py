@@ -1,17 +1,112 @@
 import cgi
-import shutil
-from datetime import datetime
+import json
+import os
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from urllib.request import urlopen, urlretrieve
+from urllib.parse import urlparse
+from urllib.request import urlopen
 
-from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.core.management import CommandError
 from django.db import transaction
 from django.db.models import ForeignKey, ManyToManyField
 from reversion.management.commands import BaseRevisionCommand
 from tablib import Dataset
 
 from headless_cms.models import LocalizedPublicationModel
-from headless_cms.utils.custom_import_export import override_modelresource_factory
+from headless_cms.utils.archives import (
+    ArchiveReader,
+    guess_archive_format,
+    open_remote_file,
+)
+from headless_cms.utils.custom_import_export import (
+    DEFAULT_CHUNK_SIZE,
+    MANIFEST_FILE_NAME,
+    override_modelresource_factory,
+    read_jsonl,
+)
+
+COMMIT_IMPORT = "import"
+COMMIT_MODEL = "model"
+COMMIT_CHUNK = "chunk"
+DEFAULT_CHECKPOINT_FILE = "import_checkpoint.json"
+
+
+class ImportCheckpoint:
+    """
+    Manifest of the progress of an import, saved after each commit so an interrupted
+    import can be resumed.
+
+    It records the imported models and, in the chunk commit mode, the number of rows
+    imported from the model in progress.
+    """
+
+    def __init__(self, path=None, input_path=None):
+        self.path = path
+        self.input = str(input_path)
+        self.models = []
+        self.current_model = None
+        self.current_rows = 0
+        self.finished = False
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a checkpoint manifest.
+
+        Args:
+            path (Path): The manifest file.
+
+        Returns:
+            ImportCheckpoint: The checkpoint.
+        """
+        data = json.loads(path.read_text())
+        checkpoint = cls(path, data["input"])
+        checkpoint.models = data["models"]
+        checkpoint.current_model = data["current_model"]
+        checkpoint.current_rows = data["current_rows"]
+        checkpoint.finished = data["finished"]
+        return checkpoint
+
+    def save(self):
+        """
+        Write the manifest, atomically so an interruption cannot corrupt it. Nothing is
+        written without a path.
+        """
+        if self.path is None:
+            return
+        data = {
+            "input": self.input,
+            "models": self.models,
+            "current_model": self.current_model,
+            "current_rows": self.current_rows,
+            "finished": self.finished,
+        }
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        temp_path.write_text(json.dumps(data, indent=2))
+        os.replace(temp_path, self.path)
+
+    def is_imported(self, label):
+        return label in self.models
+
+    def get_imported_rows(self, label):
+        return self.current_rows if self.current_model == label else 0
+
+    def save_rows(self, label, rows):
+        self.current_model = label
+        self.current_rows = rows
+        self.save()
+
+    def save_model(self, label):
+        self.models.append(label)
+        self.current_model = None
+        self.current_rows = 0
+        self.save()
+
+    def finish(self):
+        self.finished = True
+        self.save()
 
 
 class Command(BaseRevisionCommand):
@@ -19,14 +114,31 @@ class Command(BaseRevisionCommand):
     Imports data recursively of a Django app from JSON files.
 
     Usage:
-        python manage.py import_cms_data [app_label ...] [--using DATABASE] [--model-db DATABASE] [--input DIRECTORY_OR_FILE] [--cf FORMAT]
+        python manage.py import_cms_data [app_label ...] [--using DATABASE] [--model-db DATABASE] [--input DIRECTORY_OR_FILE] [--cf FORMAT] [--chunk-size CHUNK_SIZE] [--fast] [--commit {import,model,chunk}] [--checkpoint FILE] [--resume] [--delta]
 
     Options:
         app_label: Optional app_label or app_label.model_name list.
-        --using: The database to query for revision data.
+        --using: The database of the revision data, where the imported versions are
+            written.
         --model-db: The database to query for model data.
-        --input: Directory or compression file to import data from.
-        --cf, --compress-format: Compression format (default is zip).
+        --input: Directory, compression file or compression file URL to import data
+            from. Remote zip archives are read in place with range requests if the
+            server supports them, or downloaded first otherwise. Remote tar archives
+            are read sequentially as they are downloaded. The published versions of an
+            export written with --published are restored.
+        --cf, --compress-format: Compression format of archives without a known
+            extension (default is zip). Archives are read in place.
+        --chunk-size: Number of objects imported at once.
+        --fast: Upsert the objects of each model in bulk, chunk by chunk, with foreign
+            keys resolved from in-memory id maps and one revision per chunk, which
+            only versions the changed objects.
+        --commit: Commit the whole import in one transaction (default), after each model
+            or after each chunk of objects. The last two write a checkpoint manifest
+            after each commit.
+        --checkpoint: Checkpoint manifest file (default is import_checkpoint.json).
+        --resume: Skip what the checkpoint manifest records as imported.
+        --delta: Apply a delta export, also deleting the objects its manifest records as
+            deleted.
     """
 
     help = "Import data recursively of a Django app from JSON files."
@@ -37,7 +149,7 @@ class Command(BaseRevisionCommand):
             "--input",
             required=True,
             type=str,
-            help="Directory or compression file to import data from.",
+            help="Directory, compression file or URL to import data from.",
         )
         parser.add_argument(
             "--cf",
@@ -46,14 +158,61 @@ class Command(BaseRevisionCommand):
             type=str,
             help="Compression format.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            default=DEFAULT_CHUNK_SIZE,
+            type=int,
+            help="Number of objects imported at once.",
+        )
+        parser.add_argument(
+            "--fast",
+            default=False,
+            action="store_true",
+            help="Upsert the objects in bulk, with one revision per chunk.",
+        )
+        parser.add_argument(
+            "--commit",
+            default=COMMIT_IMPORT,
+            choices=[COMMIT_IMPORT, COMMIT_MODEL, COMMIT_CHUNK],
+            help="Commit the whole import at once, after each model or each chunk.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=DEFAULT_CHECKPOINT_FILE,
+            type=str,
+            help="Checkpoint manifest written after each commit.",
+        )
+        parser.add_argument(
+            "--resume",
+            default=False,
+            action="store_true",
+            help="Resume the import recorded in the checkpoint manifest.",
+        )
+        parser.add_argument(
+            "--delta",
+            default=False,
+            action="store_true",
+            help="Also delete the objects the export manifest records as deleted.",
+        )
 
     def __init__(self, stdout=None, stderr=None, no_color=False, force_color=False):
         super().__init__(stdout, stderr, no_color, force_color)
         self.imported_models = set()
+        # The imported models, each one after the models it depends on.
+        self.import_order = []
+        # The models of generic relations, which may point to any imported model.
+        self.generic_models = []
         self.input_data_path = ""
-        self.temp_download_dir = None
+        self.remote_file = None
         self.data_input_dir = None
-        self.temp_extracted_input_dir = None
+        self.archive = None
+        self.chunk_size = DEFAULT_CHUNK_SIZE
+        self.fast = False
+        self.id_maps = {}
+        self.commit = COMMIT_IMPORT
+        self.checkpoint = ImportCheckpoint()
+        self.export_manifest = None
+        self.revision_db = None
         self.verbosity = 0
 
     def import_model(self, model):
@@ -64,7 +223,11 @@ class Command(BaseRevisionCommand):
 
         through_models = []
         for field in model_fields:
-            if isinstance(field, (GenericRelation, ForeignKey)) and issubclass(
+            if isinstance(field, GenericRelation) and issubclass(
+                field.related_model, LocalizedPublicationModel
+            ):
+                self.generic_models.append(field.related_model)
+            elif isinstance(field, ForeignKey) and issubclass(
                 field.related_model, LocalizedPublicationModel
             ):
                 self.import_model(field.related_model)
@@ -75,33 +238,101 @@ class Command(BaseRevisionCommand):
                 through = getattr(model, field.name).through
                 through_models.append(through)
 
-        if self.verbosity >= 1:
-            self.stdout.write(f"Import data for {model._meta.object_name}")
-
-        file_to_import: Path = (
-            self.data_input_dir
-            / model._meta.app_label
-            / f"{model._meta.object_name}.json"
-        )
-
-        if file_to_import.exists():
-            with open(file_to_import) as fh:
-                imported_data = Dataset().load(fh)
+        label = model._meta.label
+        if self.checkpoint.is_imported(label):
+            if self.verbosity >= 1:
+                self.stdout.write(f"Skip imported data for {model._meta.object_name}")
+        else:
+            if self.verbosity >= 1:
+                self.stdout.write(f"Import data for {model._meta.object_name}")
 
             import_model_resource = override_modelresource_factory(
                 model, exclude_m2m=True
             )
-            import_model = import_model_resource()
-
-            import_model.import_data(imported_data, raise_errors=True)
+            with self.read_input_rows(
+                f"{model._meta.app_label}/{model._meta.object_name}"
+            ) as rows:
+                if rows is not None:
+                    self.import_rows(
+                        import_model_resource(revision_db=self.revision_db), rows
+                    )
+            self.checkpoint.save_model(label)
+        self.import_order.append(model)
 
         for through in through_models:
             self.import_model(through)
 
-    def check_input_path(self, input_path):
-        if str(input_path).startswith("https://"):
-            self.temp_download_dir = Path("temp_import/")
-            self.temp_download_dir.mkdir(parents=True, exist_ok=True)
+    @contextmanager
+    def read_input_rows(self, name):
+        """
+        Read the rows of a data file of the input, either `{name}.json` or
+        `{name}.jsonl`.
+
+        Args:
+            name (str): The file path without extension, relative to the input root.
+
+        Yields:
+            Iterator[dict]: The rows, or None if the input has no such file.
+        """
+        fh, file_name = self.open_input_file(f"{name}.json", f"{name}.jsonl")
+        if fh is None:
+            yield None
+        elif file_name.endswith(".jsonl"):
+            with fh:
+                yield read_jsonl(fh)
+        else:
+            # Read first, as detecting the format seeks, and archive streams may not.
+            with fh:
+                data = fh.read()
+            yield iter(Dataset().load(data).dict)
+
+    def import_rows(self, resource, rows):
+        """
+        Import the rows of a model, in one transaction, or in one transaction per chunk
+        with checkpoints in the chunk commit mode.
+
+        Args:
+            resource (LocalizedModelResource): The resource of the model.
+            rows (Iterator[dict]): The rows.
+        """
+        label = resource._meta.model._meta.label
+        bulk = self.fast and resource.supports_bulk_upsert()
+
+        if self.commit == COMMIT_CHUNK:
+            imported = self.checkpoint.get_imported_rows(label)
+            rows = islice(rows, imported, None)
+            chunks = iter(lambda: list(islice(rows, self.chunk_size)), [])
+        else:
+            chunks = [rows]
+
+        for chunk in chunks:
+            with transaction.atomic():
+                if bulk:
+                    resource.bulk_import(
+                        chunk, self.id_maps, chunk_size=self.chunk_size
+                    )
+                else:
+                    resource.import_rows(
+                        chunk, chunk_size=self.chunk_size, raise_errors=True
+                    )
+            if self.commit == COMMIT_CHUNK:
+                imported += len(chunk)
+                self.checkpoint.save_rows(label, imported)
+
+    def check_input_path(self, input_path, compress_format="zip"):
+        """
+        Open the input archive when it is a URL. Zip archives are read in place, tar
+        archives are read sequentially, straight from the response.
+
+        Args:
+            input_path (str): The input path or URL.
+            compress_format (str): The compression format of archives without a known
+                extension.
+
+        Returns:
+            str: The input path, or the archive file name for a URL.
+        """
+        if urlparse(str(input_path)).scheme in ("http", "https"):
             remote_file = urlopen(input_path)
             content_disposition = remote_file.info()["Content-Disposition"]
             if content_disposition:
@@ -111,51 +342,164 @@ class Command(BaseRevisionCommand):
                 filename = input_path.rsplit("/", 1)[-1]  # infer from url
 
             if "." not in filename:
+                remote_file.close()
                 raise ValueError(f"URL must download a zip file, not {filename}")
 
-            temp_input_data_path = self.temp_download_dir / filename
-            urlretrieve(input_path, temp_input_data_path)
-
-            input_path = temp_input_data_path
+            try:
+                archive_format = guess_archive_format(filename, compress_format)
+            except ValueError as e:
+                remote_file.close()
+                raise CommandError(e) from e
+            if archive_format == "zip":
+                # Read in place, with range requests if supported.
+                self.remote_file = open_remote_file(remote_file)
+            else:
+                self.remote_file = remote_file
+            input_path = filename
 
         return input_path
 
     def prepare_for_input(self, input_path, compress_format):
-        input_path = self.check_input_path(input_path)
+        input_path = self.check_input_path(input_path, compress_format)
 
         self.input_data_path = Path(input_path)
 
-        if self.input_data_path.is_dir():
+        if self.remote_file is None and self.input_data_path.is_dir():
             self.data_input_dir = Path(self.input_data_path)
         else:
-            self.temp_extracted_input_dir = Path("temp-extracted-input")
-            self.data_input_dir = (
-                self.temp_extracted_input_dir / datetime.now().strftime("%Y%m%d-%H%M%S")
+            # Archive members are read in place, without extracting the archive.
+            try:
+                archive_format = guess_archive_format(
+                    self.input_data_path, compress_format
+                )
+            except ValueError as e:
+                raise CommandError(e) from e
+            self.archive = ArchiveReader(
+                self.input_data_path, archive_format, fileobj=self.remote_file
             )
-            self.uncompress_input(compress_format)
 
-    def handle(self, *app_labels, **options):
-        self.prepare_for_input(options["input"], options["cf"])
+    def open_input_file(self, *names):
+        """
+        Open the first data file of the input directory or archive found among several
+        names.
+
+        Args:
+            *names (str): The file paths, relative to the input root.
+
+        Returns:
+            tuple[TextIO, str]: The file and its path, or `(None, None)` if the input
+            has none of the files.
+        """
+        if self.archive:
+            return self.archive.open_any(list(names))
+        for name in names:
+            path = self.data_input_dir / name
+            if path.exists():
+                return open(path), name
+        return None, None
+
+    def prepare_checkpoint(self, options):
+        """
+        Set up the checkpoint manifest of a per model or per chunk commit mode, loading
+        it to resume an interrupted import.
+        """
+        self.commit = options["commit"]
+        if self.commit == COMMIT_IMPORT:
+            if options["resume"]:
+                raise CommandError("--resume requires --commit model or chunk.")
+            return
 
-        self.verbosity = options["verbosity"]
+        path = Path(options["checkpoint"])
+        if not options["resume"]:
+            self.checkpoint = ImportCheckpoint(path, options["input"])
+            self.checkpoint.save()
+            return
 
-        with transaction.atomic():
-            for model in self.get_models(options):
-                if not issubclass(model, LocalizedPublicationModel):
-                    continue
+        if not path.exists():
+            raise CommandError(f"No checkpoint to resume from at {path}.")
+        self.checkpoint = ImportCheckpoint.load(path)
+        if self.checkpoint.input != str(options["input"]):
+            raise CommandError(
+                f"The checkpoint at {path} is for the import of"
+                f" {self.checkpoint.input}."
+            )
 
+    def read_export_manifest(self):
+        """
+        Read the manifest of the delta export to apply.
+
+        Returns:
+            dict: The manifest.
+        """
+        fh, _ = self.open_input_file(MANIFEST_FILE_NAME)
+        if fh is None:
+            raise CommandError(
+                f"--delta requires an export with a {MANIFEST_FILE_NAME}, written by"
+                " export_cms_data --manifest or --since."
+            )
+        with fh:
+            return json.load(fh)
+
+    def delete_objects(self):
+        """
+        Delete the objects of the imported models that the export manifest records as
+        deleted, in the reverse import order, so the models depending on others are
+        deleted first and no deletion cascades.
+        """
+        deleted_pks = self.export_manifest["deleted"]
+        for model in reversed(self.import_order):
+            if (pks := deleted_pks.get(model._meta.label)) is None:
+                continue
+            deleted, _ = model._base_manager.filter(pk__in=pks).delete()
+            if self.verbosity >= 1:
+                self.stdout.write(
+                    f"Deleted {deleted} objects for {model._meta.object_name}"
+                )
+
+    def import_models(self, options):
+        for model in self.get_models(options):
+            if not issubclass(model, LocalizedPublicationModel):
+                continue
+
+            if any(
+                isinstance(f, GenericForeignKey) for f in model._meta.private_fields
+            ):
+                self.generic_models.append(model)
+            else:
                 self.import_model(model)
+        # They are imported last, so they come after the models they point to.
+        while self.generic_models:
+            self.import_model(self.generic_models.pop(0))
 
-        self.clean_up()
+        if self.export_manifest is not None:
+            with transaction.atomic():
+                self.delete_objects()
 
-    def uncompress_input(self, compress_format):
-        shutil.unpack_archive(
-            self.input_data_path, self.data_input_dir, compress_format
-        )
+    def handle(self, *app_labels, **options):
+        self.verbosity = options["verbosity"]
+        self.revision_db = options["using"]
+        self.chunk_size = options["chunk_size"]
+        self.fast = options["fast"]
+        self.prepare_checkpoint(options)
+
+        try:
+            self.prepare_for_input(options["input"], options["cf"])
+
+            if options["delta"]:
+                self.export_manifest = self.read_export_manifest()
+
+            if self.commit == COMMIT_IMPORT:
+                with transaction.atomic():
+                    self.import_models(options)
+            else:
+                self.import_models(options)
+                self.checkpoint.finish()
+        finally:
+            self.clean_up()
 
     def clean_up(self):
-        if self.temp_extracted_input_dir:
-            shutil.rmtree(self.temp_extracted_input_dir)
+        if self.archive:
+            self.archive.close()
 
-        if self.temp_download_dir:
-            shutil.rmtree(self.temp_download_dir)
+        if self.remote_file:
+            self.remote_file.close()
@@ -0,0 +1,70 @@
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+
+from headless_cms.models import LocalizedPublicationModel
+from headless_cms.utils.tree_hash import rebuild_tree_hashes
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the stored tree hashes of CMS objects from scratch.
+
+    Usage:
+        python manage.py rebuild_tree_hashes [app_label ...] [--batch-size BATCH_SIZE]
+
+    Options:
+        app_label: Optional app_label or app_label.model_name list.
+        --batch-size: Number of objects hashed per relation traversal.
+    """
+
+    help = "Rebuild the stored tree hashes of CMS objects."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "app_label",
+            metavar="app_label",
+            nargs="*",
+            help="Optional app_label or app_label.model_name list.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            default=500,
+            type=int,
+            help="Number of objects hashed per relation traversal.",
+        )
+
+    def get_models(self, app_labels):
+        models = [
+            model
+            for model in apps.get_models()
+            if issubclass(model, LocalizedPublicationModel) and not model._meta.proxy
+        ]
+        if not app_labels:
+            return models
+
+        selected = []
+        for label in app_labels:
+            try:
+                if "." in label:
+                    selected.append(apps.get_model(label))
+                else:
+                    app_config = apps.get_app_config(label)
+                    selected.extend(
+                        model
+                        for model in models
+                        if model._meta.app_config is app_config
+                    )
+            except LookupError as exc:
+                raise CommandError(str(exc)) from exc
+        return [model for model in selected if model in models]
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+        batch_size = options["batch_size"]
+        for model in self.get_models(options["app_label"]):
+            changed = rebuild_tree_hashes(model, batch_size=batch_size)
+            if verbosity >= 1:
+                self.stdout.write(
+                    f"Rebuilt tree hashes for {model._meta.verbose_name}: "
+                    f"{changed} changed"
+                )
@@ -0,0 +1,119 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+
+
+class PublishedSnapshotQuerySet(models.QuerySet):
+    """
+    Custom QuerySet for reading and writing published snapshots.
+    """
+
+    def for_object(self, obj):
+        """
+        Filter the QuerySet to the snapshots of a single object.
+
+        Args:
+            obj (models.Model): The object the snapshots belong to.
+
+        Returns:
+            QuerySet: The snapshots of the object, one per language.
+        """
+        content_type = ContentType.objects.get_for_model(obj)
+        return self.filter(content_type=content_type, object_id=obj.pk)
+
+    def store(self, obj, snapshots):
+        """
+        Replace the snapshots of an object.
+
+        Args:
+            obj (models.Model): The object the snapshots belong to.
+            snapshots (dict): A mapping of language codes to the rendered data.
+        """
+        content_type = ContentType.objects.get_for_model(obj)
+        with transaction.atomic(using=self.db):
+            self.for_object(obj).delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        content_type=content_type,
+                        object_id=obj.pk,
+                        language=language,
+                        data=data,
+                    )
+                    for language, data in snapshots.items()
+                ]
+            )
+
+    def invalidate(self, nodes, include_ancestors=True):
+        """
+        Drop the snapshots of the objects whose published tree contains any of the given
+        nodes. Snapshots are rebuilt on the next publish or read.
+
+        Args:
+            nodes (Iterable[tuple]): The `(model, pk)` nodes that changed.
+            include_ancestors (bool): Whether to look up the ancestors of the nodes.
+                Disable it when the nodes already include them.
+
+        Returns:
+            int: The number of dropped snapshots.
+        """
+        from headless_cms.utils.tree_hash import find_ancestors  # noqa
+
+        nodes = list(nodes)
+        # The ancestors are only looked up while there is something to drop.
+        if not nodes or not self.exists():
+            return 0
+
+        if include_ancestors:
+            nodes = find_ancestors(nodes)
+        pks_by_model = defaultdict(set)
+        for model, pk in nodes:
+            if model.enable_snapshot:
+                pks_by_model[model].add(pk)
+
+        deleted = 0
+        for model, pks in pks_by_model.items():
+            count, _ = self.filter(
+                content_type=ContentType.objects.get_for_model(model),
+                object_id__in=pks,
+            ).delete()
+            deleted += count
+        return deleted
+
+
+class PublishedSnapshot(models.Model):
+    """
+    Materialized API representation of a published object for a single language.
+
+    Snapshots are written when a root object (e.g. a `LocalizedSingletonModel`) is
+    published and dropped whenever published content changes, so page views can answer
+    with a single indexed read instead of serializing the whole relation tree.
+
+    Attributes:
+        content_type (ForeignKey): The content type of the snapshotted object.
+        object_id (PositiveIntegerField): The ID of the snapshotted object.
+        language (CharField): The language the snapshot was rendered in.
+        data (JSONField): The rendered representation of the object.
+        created_date (DateTimeField): When the snapshot was rendered.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    language = models.CharField(max_length=15)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_date = models.DateTimeField(auto_now_add=True)
+
+    objects = PublishedSnapshotQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "language"],
+                name="unique_published_snapshot",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.content_type} - {self.object_id} ({self.language})"
@@ -0,0 +1,248 @@
+from datetime import timedelta
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from reversion.models import Version
+from reversion.signals import post_revision_commit
+
+from headless_cms.models import LocalizedPublicationModel, M2MSortedOrderThrough
+from headless_cms.settings import headless_cms_settings
+from headless_cms.utils.field_dict_cache import published_data_cache
+from headless_cms.utils.hash_utils import digest_serialized_data
+from headless_cms.utils.tree_hash import (
+    clear_tree_hashes,
+    find_ancestors,
+    get_node,
+    get_through_parents,
+    get_tree_fields,
+)
+
+# Ancestors are found through the relations, so removed relations are handled before
+# the change and added ones after it.
+M2M_CHANGED_ACTIONS = {"post_add", "pre_remove", "pre_clear"}
+# Comments of the revisions created by publishing and unpublishing.
+PUBLICATION_REVISION_COMMENTS = {"Publish", "Unpublish"}
+
+
+def invalidate_published_snapshots(nodes, include_ancestors=True):
+    """
+    Drop the stored published snapshots whose tree contains any of the given nodes, if
+    the snapshot store is enabled.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes that changed.
+        include_ancestors (bool): Whether to look up the ancestors of the nodes.
+    """
+    from headless_cms.core.models import PublishedSnapshot  # noqa
+
+    if headless_cms_settings.ENABLE_PUBLISHED_SNAPSHOTS:
+        PublishedSnapshot.objects.invalidate(nodes, include_ancestors=include_ancestors)
+
+
+def invalidate_published_state(nodes, tree_hashes=True):
+    """
+    Clear the stored tree hashes and drop the published snapshots of the trees
+    containing any of the given nodes, with a single ancestor lookup.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes that changed.
+        tree_hashes (bool): Whether to clear the tree hashes as well as the snapshots.
+    """
+    nodes = list(nodes)
+    if not nodes or not (
+        tree_hashes or headless_cms_settings.ENABLE_PUBLISHED_SNAPSHOTS
+    ):
+        return
+
+    ancestors = find_ancestors(nodes)
+    if tree_hashes:
+        clear_tree_hashes(ancestors)
+    invalidate_published_snapshots(ancestors, include_ancestors=False)
+
+
+def get_through_parent_nodes(instance):
+    return [
+        (parent, getattr(instance, source))
+        for parent, source in get_through_parents(instance.__class__)
+        if getattr(instance, source) is not None
+    ]
+
+
+def has_published_state_changes(instance, using, update_fields=None):
+    """
+    Check whether saving a CMS object changes the published trees containing it, by
+    comparing its tree fields to the stored row.
+
+    Args:
+        instance (LocalizedPublicationModel): The object about to be saved.
+        using (str): The database alias.
+        update_fields (Optional[frozenset]): The names of the saved fields, if limited.
+
+    Returns:
+        bool: False if the published version and relations of the object are unchanged.
+    """
+    if instance._state.adding or instance.pk is None:
+        return True
+
+    fields = get_tree_fields(instance._meta.concrete_model)
+    if update_fields is not None and not any(
+        f.name in update_fields or f.attname in update_fields for f in fields
+    ):
+        return False
+
+    attnames = [f.attname for f in fields]
+    stored = (
+        instance.__class__._base_manager.using(using)
+        .filter(pk=instance.pk)
+        .values_list(*attnames)
+        .first()
+    )
+    return stored is None or list(stored) != [
+        getattr(instance, attname) for attname in attnames
+    ]
+
+
+@receiver(pre_save)
+def track_published_state_changes(
+    sender, instance, raw=False, using=None, update_fields=None, **kwargs
+):
+    """
+    Draft saves keep the published version and relations of most objects, so the
+    published trees containing them are only invalidated when these change.
+    """
+    if issubclass(sender, LocalizedPublicationModel) and not raw:
+        instance._published_state_changed = has_published_state_changes(
+            instance, using, update_fields
+        )
+
+
+@receiver(post_save)
+def invalidate_published_state_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Relations are served and hashed live, so a saved CMS object or through row may
+    change the published trees containing it. Raw saves leave the tree hashes alone.
+    """
+    if issubclass(sender, LocalizedPublicationModel):
+        if instance.__dict__.pop("_published_state_changed", True):
+            invalidate_published_state([get_node(instance)], tree_hashes=not raw)
+    elif issubclass(sender, M2MSortedOrderThrough):
+        invalidate_published_state(
+            get_through_parent_nodes(instance), tree_hashes=not raw
+        )
+
+
+@receiver(pre_delete)
+def invalidate_published_state_on_delete(sender, instance, **kwargs):
+    # The trees containing the object are found before its relations are deleted.
+    if issubclass(sender, LocalizedPublicationModel):
+        invalidate_published_state([get_node(instance)])
+
+
+@receiver(post_delete)
+def invalidate_published_state_on_through_delete(sender, instance, **kwargs):
+    if issubclass(sender, M2MSortedOrderThrough):
+        invalidate_published_state(get_through_parent_nodes(instance))
+
+
+@receiver(m2m_changed)
+def invalidate_published_state_on_m2m_change(sender, instance, action, **kwargs):
+    if action in M2M_CHANGED_ACTIONS and isinstance(
+        instance, LocalizedPublicationModel
+    ):
+        invalidate_published_state([get_node(instance)])
+
+
+def is_coalescable_draft(version, revision):
+    """
+    Check whether a version is a draft that a newer draft of the same object saved in
+    `revision` may replace.
+
+    Args:
+        version (Version): The previous version of the object.
+        revision (Revision): The revision of the newer draft.
+
+    Returns:
+        bool: True if the version may be replaced.
+    """
+    window = timedelta(seconds=headless_cms_settings.DRAFT_COALESCE_WINDOW)
+    previous_revision = version.revision
+    return (
+        previous_revision.user_id == revision.user_id
+        and previous_revision.comment not in PUBLICATION_REVISION_COMMENTS
+        and revision.date_created - previous_revision.date_created <= window
+        and not version._model._base_manager.using(version.db)
+        .filter(published_version_id=version.pk)
+        .exists()
+    )
+
+
+@receiver(post_revision_commit)
+def coalesce_draft_versions(sender, revision, versions, **kwargs):
+    """
+    Replace the previous draft of each saved CMS object with the new one, when both
+    were saved by the same user within the `DRAFT_COALESCE_WINDOW` setting. Published
+    versions and versions created by publishing or unpublishing are kept.
+    """
+    if (
+        not headless_cms_settings.DRAFT_COALESCE_WINDOW
+        or revision.user_id is None
+        or revision.comment in PUBLICATION_REVISION_COMMENTS
+    ):
+        return
+
+    using = revision._state.db
+    for version in versions:
+        if not issubclass(version._model, LocalizedPublicationModel):
+            continue
+
+        previous = (
+            Version.objects.using(using)
+            .select_related("revision")
+            .filter(
+                content_type_id=version.content_type_id,
+                object_id=version.object_id,
+                db=version.db,
+                pk__lt=version.pk,
+            )
+            .order_by("-pk")
+            .first()
+        )
+        if previous is None or not is_coalescable_draft(previous, revision):
+            continue
+
+        previous_revision = previous.revision
+        previous.delete()
+        if not previous_revision.version_set.exists():
+            previous_revision.delete()
+
+
+@receiver(post_revision_commit)
+def store_content_digests(sender, revision, versions, **kwargs):
+    """
+    Store the content digest of the new version of each saved CMS object, so publishing
+    can tell unchanged content apart without loading the version data.
+    """
+    for version in versions:
+        model = version._model
+        if not issubclass(model, LocalizedPublicationModel):
+            continue
+
+        model._base_manager.using(version.db).filter(pk=version.object_id).update(
+            content_digest=f"{version.pk}:{digest_serialized_data(version.serialized_data)}"
+        )
+
+
+@receiver(post_migrate)
+def clear_published_data_cache(sender, **kwargs):
+    """
+    Flushing the database resets the version ID sequence, so cached versions could be
+    confused with new ones.
+    """
+    published_data_cache.clear()
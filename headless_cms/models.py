@@ -1,13 +1,18 @@
-import asyncio
 import functools
 from functools import cached_property
 from typing import Optional
 
 import reversion
+from django.apps import apps
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core import checks, serializers
 from django.db import models
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Cast
+from django.utils import translation
 from django.utils.html import format_html
 from localized_fields.fields import (
     LocalizedFileField,
@@ -19,7 +24,96 @@ from solo.models import SingletonModel
 
 from headless_cms.fields import LocalizedUniqueNormalizedSlugField, LocalizedUrlField
 from headless_cms.settings import headless_cms_settings
-from headless_cms.utils.hash_utils import HashTracker
+from headless_cms.utils.field_dict_cache import published_data_cache
+from headless_cms.utils.hash_utils import HashTracker, digest_serialized_data
+
+
+def latest_version_subquery(model, outer_ref="pk", using="default"):
+    """
+    Build a subquery selecting the ID of the latest version of an object.
+
+    Args:
+        model (type[models.Model]): The model of the versioned objects.
+        outer_ref (str, optional): The field of the outer query holding the object key.
+        using (str, optional): The database alias of the objects.
+
+    Returns:
+        Subquery: The subquery.
+    """
+    versions = (
+        Version.objects.using(using)
+        .filter(
+            content_type=ContentType.objects.db_manager(using).get_for_model(model),
+            db=using,
+            object_id=Cast(OuterRef(outer_ref), models.CharField()),
+        )
+        .order_by("-pk")
+        .values("pk")[:1]
+    )
+    return Subquery(versions)
+
+
+def published_ordering_index(ordering, name):
+    """
+    Build a partial index over the published rows of a model, in the given ordering.
+
+    It lets published list queries, which filter on `published_version` and sort by the
+    model's `Meta.ordering`, be served by an index scan.
+
+    Args:
+        ordering (list): The ordering, as in `Meta.ordering`.
+        name (str): The index name.
+
+    Returns:
+        models.Index: The index.
+
+    Example:
+
+        .. code-block:: python
+
+            class Post(LocalizedPublicationModel):
+                class Meta:
+                    ordering = ["-publish_date"]
+                    indexes = [
+                        published_ordering_index(ordering, name="post_published_idx")
+                    ]
+    """
+    expressions = [
+        (
+            (F(item[1:]).desc() if item.startswith("-") else F(item).asc())
+            if isinstance(item, str)
+            else item
+        )
+        for item in ordering
+    ]
+    return models.Index(
+        *expressions, name=name, condition=Q(published_version__isnull=False)
+    )
+
+
+def refresh_published_state(objs):
+    """
+    Refresh the stored tree hashes and snapshots after objects were published or
+    unpublished with queryset updates, which send no signals.
+
+    Args:
+        objs (list[LocalizedPublicationModel]): The published or unpublished objects.
+    """
+    from headless_cms.utils.tree_hash import (  # noqa
+        find_ancestors,
+        get_node,
+        store_tree_hashes,
+    )
+
+    ancestors = find_ancestors(get_node(obj) for obj in objs)
+    store_tree_hashes(ancestors)
+
+    if headless_cms_settings.ENABLE_PUBLISHED_SNAPSHOTS:
+        from headless_cms.core.signals import invalidate_published_snapshots  # noqa
+
+        invalidate_published_snapshots(ancestors, include_ancestors=False)
+        for obj in objs:
+            obj.refresh_snapshots()
 
 
 class PublishedQuerySet(models.QuerySet):
@@ -54,6 +148,148 @@ class PublishedQuerySet(models.QuerySet):
             .filter(published_version__isnull=False)
         )
 
+    def annotate_latest_version(self):
+        """
+        Annotate each object with the ID of its latest version, as `latest_version_id`.
+
+        Returns:
+            QuerySet: The annotated QuerySet.
+        """
+        if "latest_version_id" in self.query.annotations:
+            return self
+        return self.annotate(
+            latest_version_id=latest_version_subquery(self.model, using=self.db)
+        )
+
+    def unpublished(self):
+        """
+        Filter the QuerySet to only include items that were never published or were
+        unpublished.
+
+        Returns:
+            QuerySet: The filtered QuerySet.
+        """
+        return self.filter(published_version__isnull=True)
+
+    def published_latest(self):
+        """
+        Filter the QuerySet to only include items whose latest version is published.
+
+        Returns:
+            QuerySet: The filtered QuerySet, annotated with `latest_version_id`.
+        """
+        return self.annotate_latest_version().filter(
+            published_version_id=F("latest_version_id")
+        )
+
+    def published_outdated(self):
+        """
+        Filter the QuerySet to only include published items that have changed since.
+
+        Returns:
+            QuerySet: The filtered QuerySet, annotated with `latest_version_id`.
+        """
+        return (
+            self.annotate_latest_version()
+            .filter(published_version__isnull=False)
+            .exclude(published_version_id=F("latest_version_id"))
+        )
+
+    def bulk_publish(self, user=None):
+        """
+        Publish the current version of every object in the QuerySet.
+
+        This is the bulk counterpart of `LocalizedPublicationModel.publish`: the objects
+        whose latest version is not published get a new version, all in a single
+        revision, which is then published with a single update. Objects whose content is
+        unchanged since their latest version (see `content_digest`) get no new version.
+
+        Args:
+            user (User, optional): The user performing the publish action.
+
+        Returns:
+            int: The number of published objects.
+        """
+        # The serialized versions include the many-to-many relations.
+        queryset = self.annotate_latest_version().prefetch_related(
+            *(f.name for f in self.model._meta.many_to_many)
+        )
+        objs = [
+            obj
+            for obj in queryset
+            if obj.latest_version_id is None
+            or obj.latest_version_id != obj.published_version_id
+        ]
+        if not objs:
+            return 0
+
+        changed_objs = [
+            obj
+            for obj in objs
+            if obj.latest_version_id is None
+            or not obj.has_latest_content(obj.latest_version_id, obj.content_digest)
+        ]
+        if changed_objs:
+            with reversion.create_revision(using=self.db):
+                reversion.set_comment("Publish")
+                if user:
+                    reversion.set_user(user)
+                for obj in changed_objs:
+                    reversion.add_to_revision(obj)
+
+        latest_version_ids = dict(
+            type(self)(self.model, using=self.db)
+            .filter(pk__in=[obj.pk for obj in objs])
+            .annotate_latest_version()
+            .values_list("pk", "latest_version_id")
+        )
+        for obj in objs:
+            obj.published_version_id = latest_version_ids[obj.pk]
+        self.model._base_manager.using(self.db).bulk_update(
+            objs, ["published_version"], batch_size=1000
+        )
+
+        refresh_published_state(objs)
+        return len(objs)
+
+    def bulk_unpublish(self, user=None):
+        """
+        Unpublish every published object in the QuerySet.
+
+        This is the bulk counterpart of `LocalizedPublicationModel.unpublish`: the current
+        state of the objects is recorded in a single revision before they are unpublished
+        with a single update.
+
+        Args:
+            user (User, optional): The user performing the unpublish action.
+
+        Returns:
+            int: The number of unpublished objects.
+        """
+        objs = list(
+            self.filter(published_version__isnull=False).prefetch_related(
+                *(f.name for f in self.model._meta.many_to_many)
+            )
+        )
+        if not objs:
+            return 0
+
+        with reversion.create_revision(using=self.db):
+            reversion.set_comment("Unpublish")
+            if user:
+                reversion.set_user(user)
+            for obj in objs:
+                reversion.add_to_revision(obj)
+
+        for obj in objs:
+            obj.published_version_id = None
+        self.model._base_manager.using(self.db).bulk_update(
+            objs, ["published_version"], batch_size=1000
+        )
+
+        refresh_published_state(objs)
+        return len(objs)
+
 
 class PublishedManager(models.Manager):
     """
@@ -87,6 +323,13 @@ class LocalizedPublicationModel(LocalizedModel):
     Attributes:
         published_version (ForeignKey): Reference to the published version.
         versions (GenericRelation): Relation to the versions of the model.
+        tree_hash (CharField): The stored recursive hash of the object and its related
+            objects. It is empty when nothing in the tree is published, and null when it
+            has to be recomputed.
+        content_digest (CharField): The `<version_id>:<digest>` of the serialized content
+            of the latest version, so publishing unchanged content can reuse that version.
+        enable_snapshot (bool): Whether the rendered published representation of the
+            object is stored in the snapshot store when it is published.
     """
 
     class AdminPublishedStateHtml:
@@ -113,35 +356,92 @@ class LocalizedPublicationModel(LocalizedModel):
     )
     versions = GenericRelation(Version)
     skip_translation = models.BooleanField(default=False)
+    tree_hash = models.CharField(max_length=128, null=True, editable=False)
+    content_digest = models.CharField(max_length=64, null=True, editable=False)
 
     objects = models.Manager()
     published_objects = PublishedManager()
 
+    enable_snapshot = False
+
     class Meta(LocalizedModel.Meta):
         abstract = True
 
+    @classmethod
+    def check(cls, **kwargs):
+        """
+        Check the model, and that the `headless_cms.core` app is installed, as the
+        tree hashes, snapshots and content digests of the model are kept up to date by
+        its signal receivers.
+
+        Returns:
+            list[CheckMessage]: The errors found.
+        """
+        errors = super().check(**kwargs)
+        if not apps.is_installed("headless_cms.core"):
+            errors.append(
+                checks.Error(
+                    '"headless_cms.core" must be in INSTALLED_APPS to use '
+                    f"{cls._meta.label}.",
+                    hint='Add "headless_cms.core" to INSTALLED_APPS.',
+                    obj=cls,
+                    id="headless_cms.E001",
+                )
+            )
+        return errors
+
     @property
     def published_data(self):
         """
         Get the data of the published version.
 
+        Published versions never change, so the decoded data is kept in a process-wide
+        LRU cache keyed by the published version ID.
+
         Returns:
             dict: The field data of the published version, or None if not published.
         """
         if self.published_version_id:
-            return self.published_version.field_dict
+            data = published_data_cache.get_or_load(
+                (self._state.db, self.published_version_id),
+                lambda: self.published_version,
+            )
+            # Versions of models registered without excluding them carry stale hashes.
+            data.pop("tree_hash", None)
+            data.pop("content_digest", None)
+            return data
 
     def publish(self, user=None):
         """
         Publish the current version of the object.
 
+        If the content of the object is unchanged since its latest version, that version
+        is published as is, without creating a new revision.
+
         Args:
             user (User, optional): The user performing the publish action.
         """
 
-        last_ver = Version.objects.get_for_object(self).first()
+        latest_version_id, content_digest = (
+            self.__class__.published_objects.using(self._state.db)
+            .filter(pk=self.pk)
+            .annotate_latest_version()
+            .values_list("latest_version_id", "content_digest")
+            .first()
+        ) or (None, None)
+
+        if latest_version_id and latest_version_id == self.published_version_id:
+            return
 
-        if last_ver and last_ver.id == self.published_version_id:
+        if latest_version_id and self.has_latest_content(
+            latest_version_id, content_digest
+        ):
+            # Nothing changed since the latest version, which is published as is.
+            self.published_version_id = latest_version_id
+            self.__class__._base_manager.using(self._state.db).filter(
+                pk=self.pk
+            ).update(published_version_id=latest_version_id)
+            refresh_published_state([self])
             return
 
         with reversion.create_revision():
@@ -154,66 +454,98 @@ class LocalizedPublicationModel(LocalizedModel):
         with reversion.create_revision(manage_manually=True):
             last_ver = Version.objects.get_for_object(self).first()
             self.published_version = last_ver
-            self.save()
+            # The content digest stored with the new version must not be overwritten.
+            self.save(update_fields=["published_version"])
+
+        self.refresh_tree_hashes()
+        self.refresh_snapshots()
+
+    def get_content_digest(self):
+        """
+        Get the digest of the content of the object, serialized as in a new version.
+
+        Returns:
+            str: The content digest.
+        """
+        from reversion.revisions import _get_options  # noqa
+
+        options = _get_options(self.__class__)
+        return digest_serialized_data(
+            serializers.serialize(
+                options.format,
+                (self,),
+                fields=options.fields,
+                use_natural_foreign_keys=options.use_natural_foreign_keys,
+            )
+        )
+
+    def has_latest_content(self, latest_version_id, content_digest=None):
+        """
+        Check whether the content of the object is the one of its latest version.
+
+        Args:
+            latest_version_id (int): The latest version ID.
+            content_digest (str, optional): The stored `content_digest` of the object. If
+                missing or computed for another version, the digest is computed from the
+                version data.
+
+        Returns:
+            bool: True if the content is unchanged.
+        """
+        digest_version_id, _, digest = (content_digest or "").partition(":")
+        if digest_version_id == str(latest_version_id):
+            content_digest = digest
+        else:
+            serialized_data = (
+                Version.objects.filter(pk=latest_version_id)
+                .values_list("serialized_data", flat=True)
+                .first()
+            )
+            if serialized_data is None:
+                return False
+            content_digest = digest_serialized_data(serialized_data)
+        return content_digest == self.get_content_digest()
 
     def build_actions(self, action, *args, tracker=None, **kwargs):
         """
         Perform an action recursively on the object and its related objects.
 
+        The related objects are loaded level by level, with one query per model and
+        relation on each level (see `RelationGraph`), and each object is included once.
+
         Args:
             action (callable): The action to be performed.
             tracker: the list to track the object processed, not to do it again when being reference multiple times
         """
-        action_list = []
+        from headless_cms.utils.relations import RelationGraph  # noqa
+
         if tracker is None:
             tracker = set()
 
-        track = (self._meta.object_name, self.id)
-        if track in tracker:
-            return action_list
-
-        action_list.append((action, self, args, kwargs))
-        tracker.add(track)
-
-        for f in self._meta.get_fields():
-            if (
-                f.is_relation
-                and not f.auto_created
-                and f.related_model
-                and issubclass(f.related_model, LocalizedPublicationModel)
-            ):
-                if f.many_to_one:
-                    rel_obj = getattr(self, f.name)
-                    if rel_obj:
-                        action_list.extend(
-                            rel_obj.build_actions(
-                                action, *args, tracker=tracker, **kwargs
-                            )
-                        )
-                elif f.many_to_many or f.one_to_many:
-                    rel_objs = getattr(self, f.name).all()
-                    for rel_obj in rel_objs:
-                        action_list.extend(
-                            rel_obj.build_actions(
-                                action, *args, tracker=tracker, **kwargs
-                            )
-                        )
+        action_list = []
+        for obj in RelationGraph.load([self]).load_objects([self]).values():
+            track = (obj._meta.object_name, obj.id)
+            if track in tracker:
+                continue
+            action_list.append((action, obj, args, kwargs))
+            tracker.add(track)
         return action_list
 
     def recursive_action(self, action, *args, **kwargs):
-        action_list = self.build_actions(action, *args, **kwargs)
-
-        async def run_actions(actions):
-            loop = asyncio.get_event_loop()
-            futures = []
-            for act, _self, r_args, r_kwargs in actions:
-                p_action = functools.partial(act, _self, *r_args, **r_kwargs)
-                futures.append(loop.run_in_executor(None, p_action))
+        """
+        Perform an action on the object and its related objects in parallel, with the
+        execution backend set by the `RECURSIVE_ACTION_EXECUTOR` setting.
 
-            result = await asyncio.gather(*futures)
-            return result
+        Args:
+            action (callable): The action to be performed.
+        """
+        from headless_cms.utils.executors import run_actions  # noqa
 
-        asyncio.run(run_actions(action_list))
+        action_list = self.build_actions(action, *args, **kwargs)
+        run_actions(
+            functools.partial(act, _self, *r_args, **r_kwargs)
+            for act, _self, r_args, r_kwargs in action_list
+        )
 
     def recursively_publish(self, user=None):
         """
@@ -223,6 +555,8 @@ class LocalizedPublicationModel(LocalizedModel):
             user (User, optional): The user performing the publish action.
         """
         self.recursive_action(self.__class__.publish, user=user)
+        self.refresh_tree_hashes(recursive=True)
+        self.refresh_snapshots()
 
     def unpublish(self, user=None):
         """
@@ -240,7 +574,77 @@ class LocalizedPublicationModel(LocalizedModel):
 
         with reversion.create_revision(manage_manually=True):
             self.published_version = None
-            self.save()
+            self.save(update_fields=["published_version"])
+
+        self.refresh_tree_hashes()
+
+    def refresh_tree_hashes(self, recursive=False):
+        """
+        Recompute the stored tree hash of the object and of every object whose tree
+        contains it.
+
+        Args:
+            recursive (bool, optional): Whether to also recompute the tree hashes of all
+                the objects related to this one, e.g. after publishing them all.
+        """
+        from headless_cms.utils.relations import RelationGraph  # noqa
+        from headless_cms.utils.tree_hash import get_node, update_tree_hashes  # noqa
+
+        if recursive:
+            update_tree_hashes(RelationGraph.load([self]).children)
+        else:
+            update_tree_hashes([get_node(self)])
+
+    @classmethod
+    def get_snapshot_serializer_class(cls):
+        """
+        Get the serializer class used to render the snapshots of the model.
+
+        Returns:
+            type[serializers.ModelSerializer]: The serializer class.
+        """
+        from headless_cms.serializers import auto_serializer  # noqa
+
+        return auto_serializer(cls)
+
+    def refresh_snapshots(self):
+        """
+        Render the published representation of the object in every language and store it
+        in the snapshot store.
+
+        Snapshots are only rendered for models with `enable_snapshot` set while the
+        `ENABLE_PUBLISHED_SNAPSHOTS` setting is on. There is no request while rendering,
+        so absolute file URLs are built from the `CMS_HOST` setting.
+
+        Returns:
+            dict: A mapping of language codes to the rendered data, or None if no snapshot
+            was rendered.
+        """
+        from headless_cms.core.models import PublishedSnapshot  # noqa
+
+        if not (
+            self.enable_snapshot and headless_cms_settings.ENABLE_PUBLISHED_SNAPSHOTS
+        ):
+            return None
+
+        obj = (
+            self.__class__.published_objects.published(auto_prefetch=True)
+            .filter(pk=self.pk)
+            .first()
+        )
+        if not obj:
+            return None
+
+        serializer_class = self.get_snapshot_serializer_class()
+        snapshots = {}
+        for language, _name in settings.LANGUAGES:
+            with translation.override(language):
+                snapshots[language] = serializer_class(
+                    obj, context={"snapshot": True}
+                ).data
+
+        PublishedSnapshot.objects.store(obj, snapshots)
+        return snapshots
 
     def translate(self, user=None, force=False):
         """
@@ -288,20 +692,33 @@ class LocalizedPublicationModel(LocalizedModel):
         """
         Generate and retrieve a composite hash representing the current object and its relations.
 
-        This method initializes a new HashTracker and uses it to recursively accumulate hashes
-        starting from the current object's published version ID. It leverages the accumulate_hash
-        method to traverse and include related entities in the hash computation.
+        The hash combines the published version IDs of the object and of every object
+        recursively related to it, each counted once, so it does not depend on the order in
+        which relations are traversed. It is read from the stored `tree_hash` column, and
+        computed without being stored if missing. See `headless_cms.utils.tree_hash.get_recursive_hashes`
+        to hash many objects in one batch.
 
         Returns:
             str: The final calculated hash as a hexadecimal string, representing the state of
             this object and its recursively related entities.
         """
-        hash_tracker = HashTracker()
-        hash_tracker.update_hash(self.published_version_id)
+        from headless_cms.utils.tree_hash import get_recursive_hashes  # noqa
 
-        self.recursive_action(self.__class__.accumulate_hash, hash_tracker)
+        return get_recursive_hashes([self])[self]
 
-        return hash_tracker.current_hash
+    def get_latest_version_id(self):
+        """
+        Get the ID of the latest version of the object.
+
+        The value annotated by `PublishedQuerySet.annotate_latest_version` is used when
+        present, so listing annotated objects costs no query per object.
+
+        Returns:
+            int: The latest version ID, or None if the object has no version.
+        """
+        if "latest_version_id" in self.__dict__:
+            return self.latest_version_id
+        return Version.objects.get_for_object(self).values_list("pk", flat=True).first()
 
     @admin.display
     def published_state(self):
@@ -317,8 +734,7 @@ class LocalizedPublicationModel(LocalizedModel):
         """
         state = self.AdminPublishedStateHtml.UNPUBLISHED
         if self.published_version_id:
-            last_ver = Version.objects.get_for_object(self).first()
-            if last_ver.id == self.published_version_id:
+            if self.get_latest_version_id() == self.published_version_id:
                 state = self.AdminPublishedStateHtml.PUBLISHED_LATEST
             else:
                 state = self.AdminPublishedStateHtml.PUBLISHED_OUTDATED
@@ -333,9 +749,12 @@ class LocalizedSingletonModel(LocalizedPublicationModel, SingletonModel):
     Abstract model for localized singleton.
 
     This model extends SingletonModel to include versioning and publication
-    functionality for singleton instances.
+    functionality for singleton instances. Its published representation is stored
+    in the snapshot store when snapshots are enabled.
     """
 
+    enable_snapshot = True
+
     @classmethod
     def get_solo(cls):
         obj = super().get_solo()
@@ -1,10 +1,13 @@
+import copy
 from collections.abc import Iterable
-from functools import lru_cache
+from functools import cache
+from operator import itemgetter
 from typing import Optional
 
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.db.models import ForeignKey, ManyToManyField
+from django.utils.functional import cached_property
 from localized_fields import fields
 from rest_framework import serializers
 from rest_framework.fields import (
@@ -21,6 +24,11 @@ from headless_cms import serializer_fields
 from headless_cms.fields import AutoLanguageUrlField, LocalizedMartorField
 from headless_cms.models import LocalizedDynamicFileModel, LocalizedPublicationModel
 from headless_cms.settings import headless_cms_settings
+from headless_cms.utils.compiled_serializer import (
+    compile_representation,
+    relation_attnames,
+)
+from headless_cms.utils.tree_hash import get_recursive_hashes
 
 
 class LocalizedModelSerializer(ModelSerializer):
@@ -66,19 +74,28 @@ class LocalizedModelSerializer(ModelSerializer):
         )
         return super().__new__(cls, *args, **kwargs)
 
+    @cached_property
+    def compiled(self):
+        """
+        Whether the representation is compiled, enabled by the `compiled` serializer
+        context flag (see `CompiledSerializerMixin`).
+        """
+        return bool(self.context.get("compiled"))
+
+    @cached_property
+    def compiled_representation(self):
+        return compile_representation(self)
+
     def to_representation(self, instance):
+        if self.compiled:
+            return self.compiled_representation(instance)
+
         data = instance.published_data
 
         if not data:
             return None
 
-        field_list = instance._meta.get_fields()
-
-        rel_fields = {
-            field.attname
-            for field in field_list
-            if field.is_relation and not field.auto_created and field.related_model
-        }
+        rel_fields = relation_attnames(instance.__class__)
 
         for k, v in data.items():
             if k in rel_fields:
@@ -87,12 +104,24 @@ class LocalizedModelSerializer(ModelSerializer):
 
         return super().to_representation(instance)
 
+    def get_fields(self):
+        """
+        Build the fields of the serializer once per class and hand a fresh copy to every
+        instance, skipping DRF's model introspection on each instantiation.
+        """
+        cls = self.__class__
+        fields = cls.__dict__.get("_memoized_fields")
+        if fields is None:
+            fields = super().get_fields()
+            cls._memoized_fields = fields
+        return copy.deepcopy(fields)
+
     def __init__(self, *args, **kwargs):
         if not hasattr(self.Meta, "fields"):
             exclude = set()
             if hasattr(self.Meta, "exclude"):
                 exclude = set(self.Meta.exclude)
-            exclude.update({"published_version"})
+            exclude.update({"published_version", "tree_hash", "content_digest"})
 
             if hasattr(self.Meta, "extra_exclude"):
                 field_names = {f.name for f in self.Meta.model._meta.get_fields()}
@@ -145,15 +174,22 @@ class LocalizedDynamicFileSerializer(LocalizedBaseSerializer):
         """
         Get the source URL of the file.
 
+        Without a request in the context, or when rendering snapshots (see
+        `PublishedSnapshotMixin`), the URL is built from the `CMS_HOST` setting.
+
         Args:
             obj (models.Model): The model instance.
 
         Returns:
             str: The source URL.
         """
+        request = self.context.get("request")
+        if not request or self.context.get("snapshot"):
+            return obj.src_link
+
         src_file = obj.src_file.translate()
         if src_file:
-            return self.context["request"].build_absolute_uri(src_file.url)
+            return request.build_absolute_uri(src_file.url)
         elif obj.src_url:
             return obj.src_url.translate()
 
@@ -165,6 +201,38 @@ class LocalizedDynamicFileSerializer(LocalizedBaseSerializer):
         ]
 
 
+class RecursiveHashListSerializer(serializers.ListSerializer):
+    """
+    A list serializer that computes the recursive hashes of all the listed objects in one
+    batch, so the `hash` field of its child does not traverse the relations of every object
+    separately.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        objs = list(iterable)
+        self.recursive_hashes = get_recursive_hashes(objs)
+        return super().to_representation(objs)
+
+
+def get_recursive_hash(serializer, obj) -> str:
+    """
+    Get the recursive hash of an object, from the batch computed by the parent list
+    serializer when there is one.
+
+    Args:
+        serializer (serializers.Serializer): The serializer rendering the object.
+        obj (LocalizedPublicationModel): The object.
+
+    Returns:
+        str: The recursive hash of the object.
+    """
+    recursive_hashes = getattr(serializer.parent, "recursive_hashes", None)
+    if recursive_hashes is not None and obj in recursive_hashes:
+        return recursive_hashes[obj]
+    return obj.get_recursive_hash()
+
+
 class HashModelSerializer(serializers.Serializer):
     """
     A serializer for representing a model's data with an additional hash field that reflects
@@ -174,8 +242,104 @@ class HashModelSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     hash = serializers.SerializerMethodField()
 
+    class Meta:
+        list_serializer_class = RecursiveHashListSerializer
+
     def get_hash(self, obj) -> str:
-        return obj.get_recursive_hash()
+        return get_recursive_hash(self, obj)
+
+
+_serializer_registry: dict[tuple, type[serializers.ModelSerializer]] = {}
+
+
+@cache
+def _reachable_models(model: type[models.Model]) -> frozenset:
+    """
+    Get the models reachable from a model through the relations `_auto_serializer`
+    follows, including the model itself.
+
+    Args:
+        model (type[models.Model]): The model to start from.
+
+    Returns:
+        frozenset: The reachable models.
+    """
+    reachable = {model}
+    pending = [model]
+    while pending:
+        current = pending.pop()
+        for field in current._meta.get_fields():
+            if (
+                isinstance(field, (ForeignKey, ManyToManyField, GenericRelation))
+                and issubclass(field.related_model, LocalizedPublicationModel)
+                and field.related_model not in reachable
+            ):
+                reachable.add(field.related_model)
+                pending.append(field.related_model)
+    return frozenset(reachable)
+
+
+def _freeze_value(value):
+    """
+    Convert a serializer field, or an argument of one, into a hashable form that compares
+    equal for equivalent values.
+
+    Fields are frozen from their class and the arguments they were created with, as
+    field instances only hash by identity: keying the registry on them would keep a new
+    entry for every call building its overrides anew.
+
+    Args:
+        value: The value to freeze.
+
+    Returns:
+        The hashable value.
+    """
+    if isinstance(value, serializers.Field):
+        return (
+            type(value),
+            _freeze_value(value._args),
+            _freeze_value(value._kwargs),
+        )
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                ((key, _freeze_value(item)) for key, item in value.items()),
+                key=lambda item: str(item[0]),
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value), *(_freeze_value(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze_value(item) for item in value)
+    if hasattr(value, "deconstruct") and not isinstance(value, type):
+        # e.g. validators, which compare by value but are not hashable.
+        return (type(value), _freeze_value(value.deconstruct()))
+    return value
+
+
+def _freeze_overrides(override_model_serializer_fields: dict, model_set) -> tuple:
+    """
+    Convert the field overrides of the given models into a hashable form, see
+    `_freeze_value`.
+
+    Args:
+        override_model_serializer_fields (dict): A mapping from model classes to
+            dictionaries of serializer fields.
+        model_set (Iterable): The models whose overrides are kept.
+
+    Returns:
+        tuple: The frozen overrides, sorted by model label and field name.
+    """
+    return tuple(
+        sorted(
+            (
+                (model._meta.label, _freeze_value(fields))
+                for model, fields in override_model_serializer_fields.items()
+                if model in model_set and fields
+            ),
+            key=itemgetter(0),
+        )
+    )
 
 
 def _auto_serializer(
@@ -193,6 +357,10 @@ def _auto_serializer(
     added at the root level of the serializer, providing a hash that encapsulates the state of the
     object and all its recursively related entities.
 
+    Generated classes are kept in a registry. A class only depends on the ancestors and overrides
+    of the models reachable from it, so nested serializers (e.g. an image model referenced by
+    many parents) are shared across every root that reaches them in the same way.
+
     Args:
         model (type[models.Model]): The model class from which the serializer is generated.
         ancestors (Optional[Iterable], optional): A set of ancestor models that are currently
@@ -213,6 +381,16 @@ def _auto_serializer(
         override_model_serializer_fields = {}
     ancestors = set(ancestors)
 
+    reachable_models = _reachable_models(model)
+    registry_key = (
+        model,
+        entry_point,
+        frozenset(ancestors & reachable_models),
+        _freeze_overrides(override_model_serializer_fields, reachable_models),
+    )
+    if registry_key in _serializer_registry:
+        return _serializer_registry[registry_key]
+
     model_fields = model._meta.get_fields()
 
     custom_fields = {}
@@ -263,7 +441,9 @@ def _auto_serializer(
     else:
         base_serializer = LocalizedBaseSerializer
 
+    meta_attrs = {}
     if entry_point:
+        meta_attrs["list_serializer_class"] = RecursiveHashListSerializer
         custom_fields.update(
             {
                 "hash": serializers.SerializerMethodField(
@@ -273,21 +453,21 @@ def _auto_serializer(
         )
 
         def get_hash(self, obj) -> str:
-            return obj.get_recursive_hash()
+            return get_recursive_hash(self, obj)
 
         custom_fields.update({"get_hash": get_hash})
 
-    meta_class = type("Meta", (base_serializer.Meta,), {})
+    meta_class = type("Meta", (base_serializer.Meta,), meta_attrs)
     meta_class.model = model
     result = type(
         model.__name__ + "Serializer", (base_serializer,), dict(custom_fields)
     )
     result.Meta = meta_class
 
+    _serializer_registry[registry_key] = result
     return result
 
 
-@lru_cache(maxsize=0)
 def auto_serializer(
     model: type[models.Model],
     override_model_serializer_fields: Optional[dict] = None,
@@ -302,6 +482,9 @@ def auto_serializer(
     objects and apply specified field overrides. The 'hash' field is included to provide a dynamic
     representation of the state of the object and all its related entities.
 
+    Serializer classes are cached: calling this function again with the same model and equal
+    overrides returns the same class.
+
     Args:
         model (type[models.Model]): The Django model class for which to create the serializer.
         override_model_serializer_fields (Optional[dict], optional): A dictionary specifying
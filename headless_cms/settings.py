@@ -14,6 +14,14 @@ HEADLESS_CMS_DEFAULTS: dict[str, Any] = {
     "OPENAI_CLIENT": "openai.OpenAI",
     "DEFAULT_CMS_PERMISSION_CLASS": "rest_framework.permissions.AllowAny",
     "CMS_HOST": "http://localhost:8000",
+    "ENABLE_PUBLISHED_SNAPSHOTS": False,
+    "PUBLISHED_DATA_CACHE_SIZE": 2048,
+    "PUBLISHED_DATA_CACHE_MAX_BYTES": 64 * 1024 * 1024,
+    "RECURSIVE_ACTION_EXECUTOR": "thread",
+    "RECURSIVE_ACTION_MAX_WORKERS": 4,
+    "DRAFT_COALESCE_WINDOW": 0,
+    "REVISION_PARTITIONS_AHEAD": 3,
+    "REVISION_RETENTION_MONTHS": 0,
 }
 
 IMPORT_STRINGS = [
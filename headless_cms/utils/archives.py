@@ -0,0 +1,482 @@
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from contextlib import contextmanager
+from http import HTTPStatus
+from pathlib import Path
+from tempfile import TemporaryFile
+from typing import BinaryIO, Optional
+from urllib.request import Request, urlopen
+
+ARCHIVE_EXTENSIONS = {
+    "zip": ".zip",
+    "tar": ".tar",
+    "gztar": ".tar.gz",
+    "bztar": ".tar.bz2",
+    "xztar": ".tar.xz",
+    "zstd": ".tar.zst",
+}
+TAR_COMPRESSIONS = {
+    "tar": "",
+    "gztar": "gz",
+    "bztar": "bz2",
+    "xztar": "xz",
+}
+# Remote archives are read in blocks of this size, one range request per block.
+REMOTE_BUFFER_SIZE = 1024 * 1024
+ARCHIVE_ALIASES = {
+    "gzip": "gztar",
+    "gz": "gztar",
+    "zst": "zstd",
+}
+
+
+def get_archive_format(compress_format: str) -> str:
+    """
+    Get the archive format for a compression format name.
+
+    Args:
+        compress_format (str): One of the `shutil` archive formats, `zip`, `tar`,
+            `gztar` (or `gzip`), `bztar` or `xztar`, or `zstd`.
+
+    Returns:
+        str: The archive format.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    archive_format = ARCHIVE_ALIASES.get(compress_format, compress_format)
+    if archive_format not in ARCHIVE_EXTENSIONS:
+        raise ValueError(f"Unsupported compression format: {compress_format}")
+    return archive_format
+
+
+def guess_archive_format(path: Path, default: str = "zip") -> str:
+    """
+    Guess the archive format of a file from its extension.
+
+    Args:
+        path (Path): The archive path.
+        default (str): The compression format used for unknown extensions.
+
+    Returns:
+        str: The archive format.
+    """
+    for archive_format, extension in ARCHIVE_EXTENSIONS.items():
+        if str(path).endswith(extension):
+            return archive_format
+    return get_archive_format(default)
+
+
+def _import_zstandard():
+    try:
+        import zstandard  # noqa
+    except ImportError as e:
+        raise ValueError(
+            "The zstd compression format requires the zstandard package."
+        ) from e
+    return zstandard
+
+
+def _normalize_name(name: str) -> str:
+    return name.removeprefix("./")
+
+
+class _ZstdReader(io.RawIOBase):
+    """
+    A readable zstd decompression stream that supports seeking backward by decompressing
+    again from the start, as `gzip` does, so tar members can be read in any order.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.position = 0
+        self.stream = None
+        self._reopen()
+
+    def _reopen(self):
+        if self.stream:
+            self.stream.close()
+        zstandard = _import_zstandard()
+        if hasattr(self.source, "read"):
+            self.source.seek(0)
+            self.stream = zstandard.ZstdDecompressor().stream_reader(
+                self.source, closefd=False
+            )
+        else:
+            self.stream = zstandard.open(self.source, "rb")
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Can only seek from the start or position.")
+        if offset < self.position:
+            self._reopen()
+        while self.position < offset:
+            if not self.stream.read(
+                min(offset - self.position, io.DEFAULT_BUFFER_SIZE)
+            ):
+                break
+            self.position = min(offset, self.stream.tell())
+        return self.position
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+        super().close()
+
+
+class _HttpRangeReader(io.RawIOBase):
+    """
+    A seekable stream over a remote file, reading the requested bytes with HTTP range
+    requests.
+    """
+
+    def __init__(self, url, size):
+        self.url = url
+        self.size = size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        end = min(self.position + len(buffer), self.size)
+        if end <= self.position:
+            return 0
+        request = Request(
+            self.url, headers={"Range": f"bytes={self.position}-{end - 1}"}
+        )
+        with urlopen(request) as response:
+            if response.status != HTTPStatus.PARTIAL_CONTENT:
+                raise OSError(f"{self.url} does not support range requests.")
+            data = response.read(end - self.position)
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+
+class _StreamedMember(io.RawIOBase):
+    """
+    A member of a tar archive read as a stream, which `tarfile` reports as seekable
+    without supporting it.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self.fileobj.readinto(buffer)
+
+
+def open_remote_file(response, buffer_size: int = REMOTE_BUFFER_SIZE) -> BinaryIO:
+    """
+    Open a remote zip archive for reading in place, given the response of its URL.
+
+    If the server supports range requests, the file is read block by block on demand,
+    so only the parts of the archive that are read get downloaded. Otherwise the
+    response is spooled to an anonymous temporary file, as the members of a zip archive
+    are found from its central directory, at the end of the file.
+
+    Tar archives do not need this: they are read sequentially, straight from the
+    response, see `ArchiveReader`.
+
+    Args:
+        response (HTTPResponse): The response of the file URL, closed when the file is
+            read with range requests.
+        buffer_size (int): The size of the blocks read with each range request.
+
+    Returns:
+        BinaryIO: A seekable binary stream.
+    """
+    size = response.headers.get("Content-Length")
+    if response.headers.get("Accept-Ranges") == "bytes" and size:
+        response.close()
+        return io.BufferedReader(_HttpRangeReader(response.url, int(size)), buffer_size)
+
+    f = TemporaryFile()
+    with response:
+        shutil.copyfileobj(response, f)
+    f.seek(0)
+    return f
+
+
+class ArchiveWriter:
+    """
+    Writes text files straight into an archive, without a staging directory.
+
+    Zip members are compressed as they are written. Tar members, optionally compressed
+    with gzip, bzip2, xz or zstd, are buffered one at a time in a temporary file since
+    their size must be known before their data.
+
+    Example:
+
+        .. code-block:: python
+
+            with ArchiveWriter(Path("export.zip"), "zip") as archive:
+                with archive.open("app/Post.json") as f:
+                    f.write("[]")
+    """
+
+    def __init__(self, path: Path, compress_format: str):
+        self.path = path
+        self.format = get_archive_format(compress_format)
+        self._zip = None
+        self._tar = None
+        self._stream = None
+
+        if self.format == "zip":
+            self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        elif self.format == "zstd":
+            zstandard = _import_zstandard()
+            self._stream = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+            self._tar = tarfile.open(fileobj=self._stream, mode="w|")
+        else:
+            self._tar = tarfile.open(
+                os.fspath(path), f"w|{TAR_COMPRESSIONS[self.format]}"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def open(self, name: str):
+        """
+        Open an archive member for writing text.
+
+        Args:
+            name (str): The member name.
+
+        Yields:
+            TextIO: The member stream.
+        """
+        if self._zip:
+            with self._zip.open(name, "w", force_zip64=True) as f:
+                text = io.TextIOWrapper(f, encoding="utf-8")
+                yield text
+                text.detach()
+            return
+
+        with TemporaryFile() as f:
+            text = io.TextIOWrapper(f, encoding="utf-8")
+            yield text
+            text.detach()
+
+            info = tarfile.TarInfo(name)
+            info.size = f.tell()
+            info.mtime = int(time.time())
+            f.seek(0)
+            self._tar.addfile(info, f)
+
+    def write(self, name: str, data: str):
+        """
+        Write a text archive member.
+
+        Args:
+            name (str): The member name.
+            data (str): The member content.
+        """
+        with self.open(name) as f:
+            f.write(data)
+
+    def write_file(self, name: str, path: Path):
+        """
+        Copy a file into the archive.
+
+        Args:
+            name (str): The member name.
+            path (Path): The file to copy.
+        """
+        if self._zip:
+            self._zip.write(path, name)
+            return
+
+        info = tarfile.TarInfo(name)
+        info.size = path.stat().st_size
+        info.mtime = int(time.time())
+        with open(path, "rb") as f:
+            self._tar.addfile(info, f)
+
+    def close(self):
+        if self._zip:
+            self._zip.close()
+        if self._tar:
+            self._tar.close()
+        if self._stream:
+            self._stream.close()
+
+
+class ArchiveReader:
+    """
+    Reads text files straight from an archive, without extracting it.
+
+    Archives written by `ArchiveWriter` and by `shutil.make_archive` are supported, from
+    a path or from a binary stream, such as a remote file opened with
+    `open_remote_file`.
+
+    Tar archives given as a non-seekable stream, such as an HTTP response, are read in a
+    single pass. Members are expected in the order they are opened, as
+    `export_cms_data` writes them for `import_cms_data`: the members skipped to reach
+    the requested one are spooled to anonymous temporary files, in case they are opened
+    later.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compress_format: str = "zip",
+        fileobj: Optional[BinaryIO] = None,
+    ):
+        self.path = path
+        self.format = get_archive_format(compress_format)
+        self._zip = None
+        self._tar = None
+        self._stream = None
+        # The members skipped by a streamed tar archive, by name.
+        self._spooled = {}
+        # The names of the members, or None for a streamed tar archive.
+        self.names = None
+
+        streamed = fileobj is not None and not fileobj.seekable()
+        names = None
+        try:
+            if self.format == "zip":
+                self._zip = zipfile.ZipFile(fileobj or path)
+                names = self._zip.namelist()
+            elif self.format == "zstd" and streamed:
+                zstandard = _import_zstandard()
+                self._stream = zstandard.ZstdDecompressor().stream_reader(fileobj)
+                self._tar = tarfile.open(fileobj=self._stream, mode="r|")
+            elif self.format == "zstd":
+                self._stream = _ZstdReader(fileobj or path)
+                self._tar = tarfile.open(fileobj=self._stream, mode="r:")
+                names = self._tar.getnames()
+            elif streamed:
+                self._tar = tarfile.open(fileobj=fileobj, mode="r|*")
+            elif fileobj:
+                self._tar = tarfile.open(fileobj=fileobj, mode="r:*")
+                names = self._tar.getnames()
+            else:
+                self._tar = tarfile.open(path, "r:*")
+                names = self._tar.getnames()
+        except (zipfile.BadZipFile, tarfile.TarError) as e:
+            raise shutil.ReadError(f"{path} is not a {self.format} file") from e
+
+        if names is not None:
+            self.names = {_normalize_name(name): name for name in names}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self, name: str) -> Optional[io.TextIOWrapper]:
+        """
+        Open an archive member for reading text.
+
+        Args:
+            name (str): The member name.
+
+        Returns:
+            TextIO: The member stream, or None if the archive has no such member.
+        """
+        return self.open_any([name])[0]
+
+    def open_any(
+        self, names: list[str]
+    ) -> tuple[Optional[io.TextIOWrapper], Optional[str]]:
+        """
+        Open the first archive member found among several names, e.g. the alternative
+        file names of the same data. A streamed tar archive is only read once to find
+        any of them.
+
+        Args:
+            names (list[str]): The member names.
+
+        Returns:
+            tuple[TextIO, str]: The member stream and its name, or `(None, None)` if the
+            archive has none of the members.
+        """
+        if self.names is None:
+            return self._open_streamed(names)
+
+        for name in names:
+            member = self.names.get(name)
+            if member is None:
+                continue
+            if self._zip:
+                f = self._zip.open(member)
+            else:
+                f = self._tar.extractfile(member)
+            return io.TextIOWrapper(f, encoding="utf-8"), name
+        return None, None
+
+    def _open_streamed(self, names):
+        for name in names:
+            if (f := self._spooled.pop(name, None)) is not None:
+                return io.TextIOWrapper(f, encoding="utf-8"), name
+
+        while (member := self._tar.next()) is not None:
+            if not member.isfile():
+                continue
+            name = _normalize_name(member.name)
+            if name in names:
+                f = io.BufferedReader(_StreamedMember(self._tar.extractfile(member)))
+                return io.TextIOWrapper(f, encoding="utf-8"), name
+
+            spooled = TemporaryFile()
+            shutil.copyfileobj(self._tar.extractfile(member), spooled)
+            spooled.seek(0)
+            self._spooled[name] = spooled
+        return None, None
+
+    def close(self):
+        for f in self._spooled.values():
+            f.close()
+        if self._zip:
+            self._zip.close()
+        if self._tar:
+            self._tar.close()
+        if self._stream:
+            self._stream.close()
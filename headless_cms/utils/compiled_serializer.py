@@ -0,0 +1,166 @@
+from functools import cache
+
+from django.db.models.manager import BaseManager
+from rest_framework.fields import CharField, SerializerMethodField, SkipField, SlugField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+_SKIP = object()
+
+# Serializer fields whose `to_representation` is exactly `str(value)`.
+_STR_FIELDS = (CharField, SlugField)
+
+
+@cache
+def relation_attnames(model) -> frozenset:
+    """
+    Get the attribute names of the relations of a model that are not restored from
+    published data, as relations are served live.
+
+    Args:
+        model (type[models.Model]): The model class.
+
+    Returns:
+        frozenset: The attribute names.
+    """
+    return frozenset(
+        field.attname
+        for field in model._meta.get_fields()
+        if field.is_relation and not field.auto_created and field.related_model
+    )
+
+
+@cache
+def _value_field_names(model) -> frozenset:
+    return frozenset(
+        field.attname
+        for field in model._meta.concrete_fields
+        if not field.is_relation and field.attname == field.name
+    )
+
+
+def _read_attribute(field, instance):
+    """Read a field the way `Serializer.to_representation` does."""
+    try:
+        attribute = field.get_attribute(instance)
+    except SkipField:
+        return _SKIP
+
+    check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+    if check_for_none is None:
+        return None
+    return field.to_representation(attribute)
+
+
+def _compile_value_field(field):
+    name = field.field_name
+    convert = str if type(field) in _STR_FIELDS else field.to_representation
+
+    def read(instance, data):
+        value = data[name] if name in data else getattr(instance, name)
+        if value is None:
+            return None
+        return convert(value)
+
+    return read
+
+
+def _compile_nested_field(field):
+    name = field.field_name
+
+    if isinstance(field, ListSerializer):
+        child_representation = field.child.to_representation
+
+        def convert(value):
+            iterable = value.all() if isinstance(value, BaseManager) else value
+            return [child_representation(item) for item in iterable]
+
+    else:
+        convert = field.to_representation
+
+    def read(instance, data):
+        try:
+            value = getattr(instance, name)
+        except (KeyError, AttributeError):
+            return _read_attribute(field, instance)
+        if value is None:
+            return None
+        return convert(value)
+
+    return read
+
+
+def _compile_method_field(serializer, field):
+    method = getattr(serializer, field.method_name)
+
+    def read(instance, data):
+        return method(instance)
+
+    return read
+
+
+def _compile_generic_field(field):
+    def read(instance, data):
+        return _read_attribute(field, instance)
+
+    return read
+
+
+def compile_representation(serializer):
+    """
+    Compile the `to_representation` of a localized model serializer into a plain function.
+
+    The readable fields of the serializer are resolved once into readers: model values are
+    read straight from the published data and converted without going through DRF's field
+    dispatch, nested serializers (compiled themselves) are called with the live related
+    objects, and method fields call the serializer method. Any other field falls back to
+    DRF's own `get_attribute` and `to_representation`, so the output is identical to the
+    serializer's.
+
+    Args:
+        serializer (LocalizedModelSerializer): A bound serializer instance.
+
+    Returns:
+        Callable: A function turning a model instance into its representation.
+    """
+    model = serializer.Meta.model
+    skipped_attnames = relation_attnames(model)
+    value_field_names = _value_field_names(model)
+
+    readers = []
+    needs_instance_data = False
+    for field in serializer._readable_fields:
+        simple_source = field.source_attrs == [field.field_name]
+        if isinstance(field, SerializerMethodField):
+            reader = _compile_method_field(serializer, field)
+            needs_instance_data = True
+        elif isinstance(field, BaseSerializer) and simple_source:
+            reader = _compile_nested_field(field)
+        elif simple_source and field.field_name in value_field_names:
+            reader = _compile_value_field(field)
+        else:
+            reader = _compile_generic_field(field)
+            needs_instance_data = True
+        readers.append((field.field_name, reader))
+
+    def to_representation(instance):
+        data = instance.published_data
+
+        if not data:
+            return None
+
+        # Methods and generic fields may read any attribute of the instance.
+        if needs_instance_data:
+            for k, v in data.items():
+                if k in skipped_attnames:
+                    continue
+                setattr(instance, k, v)
+
+        ret = {}
+        for field_name, read in readers:
+            value = read(instance, data)
+            if value is not _SKIP:
+                ret[field_name] = value
+        return ret
+
+    return to_representation
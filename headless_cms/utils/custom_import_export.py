@@ -1,10 +1,93 @@
+import hashlib
+import json
+from itertools import islice
+
 import reversion
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import ManyToManyField
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from import_export import widgets
+from import_export import fields, widgets
+from import_export.exceptions import ImportError as IEImportError
 from import_export.resources import ModelDeclarativeMetaclass, ModelResource
 from import_export.widgets import Widget
 from localized_fields.fields import LocalizedField, LocalizedFileField
+from reversion.models import Revision, Version
+from tablib import Dataset
+
+from headless_cms.utils.hash_utils import digest_serialized_data
+
+DEFAULT_CHUNK_SIZE = 2000
+# The manifest of an export, with the hashes of the exported objects, at the root of
+# the export directory or archive.
+MANIFEST_FILE_NAME = "manifest.json"
+# The column of the published version payloads, exported on demand.
+PUBLISHED_VERSION_FIELD = "published_version"
+
+
+def read_jsonl(file):
+    """
+    Read the objects of a JSON Lines file, one line at a time.
+
+    Args:
+        file (TextIO): The file to read from.
+
+    Yields:
+        dict: The objects.
+    """
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def get_row_digest(row):
+    """
+    Compute the digest of an exported row, to detect changed objects between exports.
+
+    Args:
+        row (dict): The exported row.
+
+    Returns:
+        str: The hexadecimal MD5 digest.
+    """
+    return hashlib.md5(json.dumps(row, sort_keys=True).encode()).hexdigest()
+
+
+def get_foreign_key_value(widget, obj):
+    """
+    Get the value identifying an object in the foreign keys exported with a widget.
+
+    Args:
+        widget (ForeignKeyWidget): The widget of the foreign key.
+        obj (Model): The related object.
+
+    Returns:
+        str: The exported value, as a string.
+    """
+    return str(widget.render(obj))
+
+
+def build_id_map(widget):
+    """
+    Map the exported foreign key values of all the objects of a related model to their
+    primary keys, so foreign keys are resolved without a query per row.
+
+    Args:
+        widget (ForeignKeyWidget): The widget of the foreign key.
+
+    Returns:
+        dict: The primary keys by exported value.
+    """
+    queryset = widget.model._base_manager.all()
+    if widget.use_natural_foreign_keys:
+        return {
+            get_foreign_key_value(widget, obj): obj.pk for obj in queryset.iterator()
+        }
+    return {
+        str(value): pk
+        for value, pk in queryset.values_list(widget.field, "pk").iterator()
+    }
 
 
 class LocalizedWidget(Widget):
@@ -17,7 +100,33 @@ class LocalizedFileWidget(LocalizedWidget):
         return {k: "" for k, _v in value.__dict__.items()}
 
 
+class PublishedVersionWidget(Widget):
+    """
+    Exports the published version of an object as the payload restored on import by
+    `LocalizedModelResource.restore_published_versions`.
+    """
+
+    def render(self, value, obj=None, **kwargs):
+        if value is None:
+            return None
+        return {
+            "format": value.format,
+            "serialized_data": value.serialized_data,
+            "object_repr": value.object_repr,
+        }
+
+
 class LocalizedModelResource(ModelResource):
+    def __init__(self, revision_db=None, **kwargs):
+        """
+        Args:
+            revision_db (str, optional): The database of the revision data written by
+                imports. The router decides if not set.
+            **kwargs: Passed on to `ModelResource`.
+        """
+        super().__init__(**kwargs)
+        self.revision_db = revision_db
+
     @classmethod
     def widget_from_django_field(cls, f, default=widgets.Widget):
         if isinstance(f, LocalizedFileField):
@@ -27,18 +136,452 @@ class LocalizedModelResource(ModelResource):
         return super().widget_from_django_field(f, default)
 
     def save_instance(self, *args, **kwargs):
-        with reversion.create_revision():
+        with reversion.create_revision(using=self.revision_db):
             reversion.set_comment(_("Import data"))
             super().save_instance(*args, **kwargs)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if PUBLISHED_VERSION_FIELD in self.fields:
+            queryset = queryset.select_related(PUBLISHED_VERSION_FIELD)
+        return queryset
+
+    def export_jsonl(self, file, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Export the resource in the JSON Lines format, one object per line.
+
+        Unlike `export`, the objects are fetched in chunks and written as they are
+        rendered, so memory usage does not grow with the size of the table.
+
+        Args:
+            file (TextIO): The file to write to.
+            chunk_size (int): The number of objects fetched per query.
+
+        Returns:
+            int: The number of exported objects.
+        """
+        count = 0
+        for _obj, row in self.iter_export_rows(chunk_size=chunk_size):
+            file.write(json.dumps(row))
+            file.write("\n")
+            count += 1
+        return count
+
+    def iter_export_rows(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Render the exported objects one at a time, fetching them in chunks.
+
+        Args:
+            chunk_size (int): The number of objects fetched per query.
+
+        Yields:
+            tuple[Model, dict]: Each object and its exported row.
+        """
+        queryset = self.filter_export(self.get_queryset())
+        headers = self.get_export_headers()
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield obj, dict(zip(headers, self.export_resource(obj)))
+
+    def import_rows(self, rows, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Import rows with `import_data`, one chunk at a time.
+
+        Args:
+            rows (Iterable[dict]): The rows.
+            chunk_size (int): The number of rows imported at once.
+            **kwargs: Passed on to `import_data`.
+        """
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            dataset = Dataset(headers=list(chunk[0]))
+            for row in chunk:
+                dataset.append([row.get(header) for header in dataset.headers])
+            self.import_data(dataset, **kwargs)
+            self.restore_published_versions(chunk)
+
+    def import_jsonl(self, file, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Import data in the JSON Lines format, one chunk of objects at a time.
+
+        Args:
+            file (TextIO): The file to read from.
+            chunk_size (int): The number of objects imported at once.
+            **kwargs: Passed on to `import_data`.
+        """
+        self.import_rows(read_jsonl(file), chunk_size=chunk_size, **kwargs)
+
+    def supports_bulk_upsert(self):
+        """
+        Check whether the rows of the resource model can be upserted in bulk, which
+        requires all of its fields to be stored in its own table.
+
+        Returns:
+            bool: True if `bulk_import` can be used.
+        """
+        return not self._meta.model._meta.parents
+
+    def get_id_map(self, widget, id_maps):
+        """
+        Get the id map of the related model of a foreign key widget, building it on
+        first use.
+
+        Args:
+            widget (ForeignKeyWidget): The widget of the foreign key.
+            id_maps (dict): The id maps shared by the resources of an import.
+
+        Returns:
+            dict: The primary keys by exported value.
+        """
+        key = (widget.model, widget.field, widget.use_natural_foreign_keys)
+        if key not in id_maps:
+            id_maps[key] = build_id_map(widget)
+        return id_maps[key]
+
+    def update_id_maps(self, objs, id_maps):
+        """
+        Add objects of the resource model to the id maps already built for it, so later
+        rows can refer to them.
+
+        Args:
+            objs (list[Model]): The objects.
+            id_maps (dict): The id maps shared by the resources of an import.
+        """
+        model = self._meta.model._meta.concrete_model
+        for (related_model, field, use_natural_foreign_keys), id_map in id_maps.items():
+            if related_model._meta.concrete_model is not model:
+                continue
+            widget = widgets.ForeignKeyWidget(
+                related_model, field, use_natural_foreign_keys=use_natural_foreign_keys
+            )
+            for obj in objs:
+                id_map[get_foreign_key_value(widget, obj)] = obj.pk
+
+    def build_instance(self, row, number, fields, foreign_keys, id_maps):
+        """
+        Build an unsaved instance from a row, resolving its foreign keys from the id
+        maps.
+
+        Args:
+            row (dict): The row.
+            number (int): The row number, for errors.
+            fields (list[Field]): The resource fields set from the row, other than
+                foreign keys.
+            foreign_keys (list[Field]): The foreign key resource fields.
+            id_maps (dict): The id maps shared by the resources of an import.
+
+        Returns:
+            Model: The instance.
+
+        Raises:
+            import_export.exceptions.ImportError: If a value is invalid or a related
+                object does not exist.
+        """
+        model = self._meta.model
+        instance = model()
+        try:
+            for field in fields:
+                field.save(instance, row)
+            for field in foreign_keys:
+                value = row[field.column_name]
+                pk = None
+                if value not in (None, ""):
+                    pk = self.get_id_map(field.widget, id_maps).get(str(value))
+                    if pk is None:
+                        raise field.widget.model.DoesNotExist(
+                            f"{field.widget.model._meta.object_name} matching"
+                            f" {value!r} does not exist."
+                        )
+                setattr(instance, model._meta.get_field(field.attribute).attname, pk)
+        except (KeyError, ValueError, ObjectDoesNotExist) as e:
+            raise IEImportError(e, number=number, row=row) from e
+        return instance
+
+    def bulk_upsert(self, rows, id_maps, first_number=1):
+        """
+        Insert or update rows in a single `INSERT ... ON CONFLICT DO UPDATE` query,
+        instead of saving them one at a time with `import_data`.
+
+        Foreign keys are resolved from in-memory id maps and rows are matched by the
+        import id fields. No `post_save` signal is sent, see `after_bulk_upsert`.
+
+        Args:
+            rows (list[dict]): The rows.
+            id_maps (dict): The id maps shared by the resources of an import.
+            first_number (int): The number of the first row, for errors.
+
+        Returns:
+            list[Model]: The saved objects, as stored in the database. They are the
+            built instances when the rows hold every field and primary key, and are
+            fetched again otherwise.
+        """
+        model = self._meta.model
+        import_fields = [
+            field
+            for field in self.get_import_fields()
+            if field.attribute
+            and not field.readonly
+            and not isinstance(field.widget, widgets.ManyToManyWidget)
+        ]
+        fields = [field for field in import_fields if field.column_name in rows[0]]
+        foreign_keys = [
+            field
+            for field in fields
+            if isinstance(field.widget, widgets.ForeignKeyWidget)
+        ]
+        fields = [field for field in fields if field not in foreign_keys]
+
+        instances = [
+            self.build_instance(row, number, fields, foreign_keys, id_maps)
+            for number, row in enumerate(rows, first_number)
+        ]
+        # Rows of the chunk may refer to each other.
+        self.update_id_maps(instances, id_maps)
+
+        model_fields = [
+            model._meta.get_field(field.attribute) for field in fields + foreign_keys
+        ]
+        conflict_target = [
+            self.fields[name].attribute for name in self._meta.import_id_fields
+        ]
+        # A row cannot be upserted twice in one query, the last one wins.
+        upserted = {}
+        for number, (row, instance) in enumerate(zip(rows, instances), first_number):
+            key = tuple(getattr(instance, name) for name in conflict_target)
+            if None in key:
+                raise IEImportError(
+                    ValueError(f"Missing {', '.join(conflict_target)} value."),
+                    number=number,
+                    row=row,
+                )
+            upserted[key] = instance
+
+        update_fields = [f.name for f in model_fields if f.name not in conflict_target]
+        model._base_manager.bulk_create(
+            upserted.values(),
+            update_conflicts=bool(update_fields),
+            ignore_conflicts=not update_fields,
+            unique_fields=conflict_target if update_fields else None,
+            update_fields=update_fields or None,
+        )
+
+        if len(fields) == len(import_fields) and all(
+            instance.pk is not None for instance in upserted.values()
+        ):
+            return list(upserted.values())
+        return list(
+            model._base_manager.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).order_by("pk")
+        )
+
+    def after_bulk_upsert(self, objs):
+        """
+        Invalidate the tree hashes and published snapshots affected by upserted objects,
+        once for the whole chunk, as the `post_save` receivers would for each object.
+
+        Args:
+            objs (list[Model]): The upserted objects.
+        """
+        from headless_cms.core.signals import (  # noqa
+            get_through_parent_nodes,
+            invalidate_published_state,
+        )
+        from headless_cms.models import (  # noqa
+            LocalizedPublicationModel,
+            M2MSortedOrderThrough,
+        )
+        from headless_cms.utils.tree_hash import get_node  # noqa
+
+        model = self._meta.model
+        if issubclass(model, LocalizedPublicationModel):
+            nodes = [get_node(obj) for obj in objs]
+        elif issubclass(model, M2MSortedOrderThrough):
+            nodes = [node for obj in objs for node in get_through_parent_nodes(obj)]
+        else:
+            return
+        invalidate_published_state(nodes)
+
+    def get_changed_objects(self, objs):
+        """
+        Get the upserted objects whose content differs from their latest version, as
+        told by their stored content digest.
+
+        Args:
+            objs (list[Model]): The upserted objects.
+
+        Returns:
+            list[Model]: The objects to record in a new version. All of them if the
+            model stores no content digest.
+        """
+        from headless_cms.models import LocalizedPublicationModel  # noqa
+
+        model = self._meta.model
+        if not issubclass(model, LocalizedPublicationModel):
+            return objs
+
+        stored_digests = dict(
+            model._base_manager.filter(pk__in=[obj.pk for obj in objs]).values_list(
+                "pk", "content_digest"
+            )
+        )
+        return [
+            obj
+            for obj in objs
+            if (stored_digests.get(obj.pk) or "").partition(":")[2]
+            != obj.get_content_digest()
+        ]
+
+    def bulk_import(self, rows, id_maps=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Import rows in chunks with `bulk_upsert`, recording one revision per chunk.
+        Only the objects whose content changed get a new version.
+
+        Each chunk is imported in its own transaction, nested in the one of the caller
+        if any.
+
+        Args:
+            rows (Iterable[dict]): The rows.
+            id_maps (dict): The id maps shared by the resources of an import, so each
+                related model is only loaded once.
+            chunk_size (int): The number of rows upserted at once.
+
+        Returns:
+            int: The number of imported rows.
+        """
+        id_maps = {} if id_maps is None else id_maps
+        model = self._meta.model
+        rows = iter(rows)
+        count = 0
+        while chunk := list(islice(rows, chunk_size)):
+            with reversion.create_revision(using=self.revision_db):
+                reversion.set_comment(_("Import data"))
+                objs = self.get_changed_objects(
+                    self.bulk_upsert(chunk, id_maps, first_number=count + 1)
+                )
+                if reversion.is_registered(model):
+                    for obj in objs:
+                        reversion.add_to_revision(obj)
+                self.after_bulk_upsert(objs)
+            self.restore_published_versions(chunk)
+            count += len(chunk)
+        return count
+
+    def restore_published_versions(self, rows):
+        """
+        Restore the published versions exported with imported rows, and link them to
+        their objects in bulk, so the objects need not be published again.
+
+        An object whose latest version has the exported content gets that version
+        published. Otherwise the exported version is recreated in one revision, then the
+        current content, if different, is recorded in another one so it stays the latest.
+        Objects exported unpublished are unpublished. Rows without the published version
+        column are left as they are.
+
+        Args:
+            rows (list[dict]): The imported rows.
+
+        Returns:
+            int: The number of objects whose published version changed.
+        """
+        from headless_cms.models import (  # noqa
+            LocalizedPublicationModel,
+            refresh_published_state,
+        )
+
+        model = self._meta.model
+        if not issubclass(model, LocalizedPublicationModel):
+            return 0
+        pk_column = self.fields[model._meta.pk.name].column_name
+        payloads = {
+            str(row[pk_column]): row[PUBLISHED_VERSION_FIELD]
+            for row in rows
+            if PUBLISHED_VERSION_FIELD in row
+        }
+        if not payloads:
+            return 0
+
+        objs = list(
+            model.published_objects.filter(pk__in=payloads).annotate_latest_version()
+        )
+        latest_versions = Version.objects.using(self.revision_db).in_bulk(
+            [obj.latest_version_id for obj in objs if obj.latest_version_id]
+        )
+
+        published_version_ids = {}
+        restored = []
+        for obj in objs:
+            payload = payloads[str(obj.pk)]
+            latest_version = latest_versions.get(obj.latest_version_id)
+            if not payload:
+                published_version_ids[obj] = None
+            elif (
+                latest_version
+                and latest_version.serialized_data == payload["serialized_data"]
+            ):
+                published_version_ids[obj] = latest_version.pk
+            else:
+                restored.append(obj)
+
+        if restored:
+            db = model._base_manager.db
+            content_type = ContentType.objects.db_manager(db).get_for_model(model)
+            revision = Revision.objects.using(self.revision_db).create(
+                date_created=timezone.now(), comment=_("Import published data")
+            )
+            versions = Version.objects.using(self.revision_db).bulk_create(
+                Version(
+                    revision=revision,
+                    object_id=str(obj.pk),
+                    content_type=content_type,
+                    db=db,
+                    format=payloads[str(obj.pk)]["format"],
+                    serialized_data=payloads[str(obj.pk)]["serialized_data"],
+                    object_repr=payloads[str(obj.pk)]["object_repr"],
+                )
+                for obj in restored
+            )
+            for obj, version in zip(restored, versions):
+                published_version_ids[obj] = version.pk
+
+            # The current content stays the latest version.
+            drafts = [
+                obj
+                for obj in restored
+                if obj.get_content_digest()
+                != digest_serialized_data(payloads[str(obj.pk)]["serialized_data"])
+            ]
+            if drafts:
+                with reversion.create_revision(using=self.revision_db):
+                    reversion.set_comment(_("Import data"))
+                    for obj in drafts:
+                        reversion.add_to_revision(obj)
+
+        changed = [
+            obj
+            for obj, version_id in published_version_ids.items()
+            if obj.published_version_id != version_id
+        ]
+        for obj in changed:
+            obj.published_version_id = published_version_ids[obj]
+        model._base_manager.bulk_update(changed, ["published_version"], batch_size=1000)
+        if changed:
+            refresh_published_state(changed)
+        return len(changed)
+
 
 def override_modelresource_factory(
-    model, resource_class=LocalizedModelResource, exclude_m2m=False
+    model,
+    resource_class=LocalizedModelResource,
+    exclude_m2m=False,
+    with_published=False,
 ):
     """
     Factory for creating ``ModelResource`` class for given Django model.
+
+    With `with_published`, the published version of publication models is exported too,
+    see `PublishedVersionWidget`.
     """
-    exclude = ["published_version"]
+    exclude = ["published_version", "tree_hash", "content_digest"]
     if exclude_m2m:
         model_fields = model._meta.get_fields()
         for field in model_fields:
@@ -58,6 +601,15 @@ def override_modelresource_factory(
     class_attrs = {
         "Meta": Meta,
     }
+    if with_published and any(
+        field.name == PUBLISHED_VERSION_FIELD for field in model._meta.concrete_fields
+    ):
+        class_attrs[PUBLISHED_VERSION_FIELD] = fields.Field(
+            attribute=PUBLISHED_VERSION_FIELD,
+            column_name=PUBLISHED_VERSION_FIELD,
+            widget=PublishedVersionWidget(),
+            readonly=True,
+        )
 
     metaclass = ModelDeclarativeMetaclass
     return metaclass(class_name, (resource_class,), class_attrs)
@@ -0,0 +1,188 @@
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Optional
+
+from django.db import connections
+
+from headless_cms.settings import headless_cms_settings
+
+SYNC = "sync"
+THREAD = "thread"
+PROCESS = "process"
+
+_thread_pools: dict[int, ThreadPoolExecutor] = {}
+_thread_pool_lock = threading.Lock()
+_worker = threading.local()
+
+
+def get_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by all recursive actions of the process with the given
+    size.
+
+    Pools are created on first use and kept for the life of the process, one per size,
+    so callers asking for another size never shut down a pool still in use.
+
+    Args:
+        max_workers (int): The maximum number of worker threads.
+
+    Returns:
+        ThreadPoolExecutor: The shared thread pool.
+    """
+    with _thread_pool_lock:
+        pool = _thread_pools.get(max_workers)
+        if pool is None:
+            pool = _thread_pools[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="headless_cms"
+            )
+        return pool
+
+
+def _run_in_thread(func: Callable) -> Any:
+    _worker.active = True
+    try:
+        return func()
+    finally:
+        _worker.active = False
+        # Worker threads outlive the task, so their connections are closed here
+        # instead of lingering until the thread exits.
+        connections.close_all()
+
+
+def _init_process() -> None:
+    # The connections inherited from the parent process must not be used, nor closed,
+    # as they share their sockets with it.
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+
+
+def _run_in_process(func: Callable) -> Any:
+    try:
+        return func()
+    finally:
+        connections.close_all()
+
+
+def run_actions(
+    actions: Iterable[Callable],
+    executor: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> list:
+    """
+    Run independent actions with the configured execution backend.
+
+    The backends are:
+
+    - `sync`: the actions run one after the other in the calling thread.
+    - `thread`: the actions run in a bounded thread pool shared across calls. The database
+      connections opened by each action are closed when it finishes.
+    - `process`: the actions run in a new bounded process pool. The actions and their
+      results must be picklable.
+
+    Actions started from a worker thread run synchronously, so nested calls cannot
+    exhaust the shared pool. The first exception raised by an action is propagated after
+    all actions have finished.
+
+    Args:
+        actions (Iterable[Callable]): The actions, called without arguments.
+        executor (str, optional): The backend name. Defaults to the
+            `RECURSIVE_ACTION_EXECUTOR` setting.
+        max_workers (int, optional): The maximum parallelism. Defaults to the
+            `RECURSIVE_ACTION_MAX_WORKERS` setting.
+
+    Returns:
+        list: The results of the actions, in order.
+    """
+    actions = list(actions)
+    executor = executor or headless_cms_settings.RECURSIVE_ACTION_EXECUTOR
+    max_workers = max_workers or headless_cms_settings.RECURSIVE_ACTION_MAX_WORKERS
+
+    if executor == SYNC or len(actions) <= 1 or getattr(_worker, "active", False):
+        return [action() for action in actions]
+
+    if executor == THREAD:
+        pool = get_thread_pool(max_workers)
+        futures = [pool.submit(_run_in_thread, action) for action in actions]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    if executor == PROCESS:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(actions)), initializer=_init_process
+        ) as pool:
+            futures = [pool.submit(_run_in_process, action) for action in actions]
+            wait(futures)
+            return [future.result() for future in futures]
+
+    raise ValueError(f"Unknown recursive action executor: {executor!r}")
+
+
+def iter_actions(
+    actions: Iterable[Callable],
+    executor: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[tuple[int, Any]]:
+    """
+    Run independent actions like `run_actions`, yielding each result as soon as its
+    action finishes, e.g. to report progress.
+
+    If an action raises, the pending actions are cancelled and the exception is
+    propagated once the running ones have finished.
+
+    Args:
+        actions (Iterable[Callable]): The actions, called without arguments.
+        executor (str, optional): The backend name. Defaults to the
+            `RECURSIVE_ACTION_EXECUTOR` setting.
+        max_workers (int, optional): The maximum parallelism. Defaults to the
+            `RECURSIVE_ACTION_MAX_WORKERS` setting.
+
+    Yields:
+        tuple: The `(index, result)` pair of each action, in completion order.
+    """
+    actions = list(actions)
+    executor = executor or headless_cms_settings.RECURSIVE_ACTION_EXECUTOR
+    max_workers = max_workers or headless_cms_settings.RECURSIVE_ACTION_MAX_WORKERS
+
+    if executor == SYNC or len(actions) <= 1 or getattr(_worker, "active", False):
+        for index, action in enumerate(actions):
+            yield index, action()
+        return
+
+    if executor == THREAD:
+        pool = get_thread_pool(max_workers)
+        futures = {
+            pool.submit(_run_in_thread, action): index
+            for index, action in enumerate(actions)
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+        return
+
+    if executor == PROCESS:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(actions)), initializer=_init_process
+        ) as pool:
+            futures = {
+                pool.submit(_run_in_process, action): index
+                for index, action in enumerate(actions)
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+        return
+
+    raise ValueError(f"Unknown recursive action executor: {executor!r}")
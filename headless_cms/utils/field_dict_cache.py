@@ -0,0 +1,173 @@
+import copy
+import datetime
+import threading
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, NamedTuple, Optional
+
+from headless_cms.settings import headless_cms_settings
+
+# Field values of these types cannot be mutated, so they are shared with the cache.
+IMMUTABLE_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    Decimal,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    uuid.UUID,
+    type(None),
+)
+
+
+def copy_field_dict(field_dict: dict) -> dict:
+    """
+    Copy a field dict, deep-copying its mutable values such as `LocalizedValue`.
+
+    Args:
+        field_dict (dict): The field dict.
+
+    Returns:
+        dict: A copy that shares no mutable value with `field_dict`.
+    """
+    return {
+        name: value if isinstance(value, IMMUTABLE_TYPES) else copy.deepcopy(value)
+        for name, value in field_dict.items()
+    }
+
+
+class FieldDictCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    size: int
+    max_entries: int
+    max_size: int
+
+
+class FieldDictCache:
+    """
+    A thread-safe, size-aware LRU cache of decoded version field dicts.
+
+    Published versions are immutable, so their decoded `field_dict` can be shared across
+    requests. Field dicts are copied in and out of the cache (see `copy_field_dict`), so
+    callers may mutate what they get without altering the cache. Entries are weighted by
+    the length of the version's serialized data, and the least recently used entries are
+    evicted once either limit is exceeded.
+    """
+
+    def __init__(self, max_entries: int, max_size: int) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of cached field dicts. 0 disables the
+                cache.
+            max_size (int): The maximum total size of cached field dicts, measured as
+                the length of their serialized data.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[dict]:
+        """
+        Get a cached field dict and mark it as recently used.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            Optional[dict]: A copy of the cached field dict, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_field_dict(entry[0])
+
+    def set(self, key, field_dict: dict, size: int) -> None:
+        """
+        Store a field dict, evicting the least recently used entries when needed.
+
+        Args:
+            key: The cache key.
+            field_dict (dict): The decoded field dict.
+            size (int): The weight of the entry.
+        """
+        if not self.max_entries or size > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (copy_field_dict(field_dict), size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_size:
+                _key, (_field_dict, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def get_or_load(self, key, load: Callable) -> dict:
+        """
+        Get a cached field dict, loading and caching the version on a miss.
+
+        Args:
+            key: The cache key.
+            load (Callable): A callable returning the version to decode.
+
+        Returns:
+            dict: A copy of the field dict.
+        """
+        field_dict = self.get(key)
+        if field_dict is not None:
+            return field_dict
+
+        version = load()
+        field_dict = version.field_dict
+        self.set(key, field_dict, len(version.serialized_data))
+        return copy_field_dict(field_dict)
+
+    def clear(self) -> None:
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> FieldDictCacheInfo:
+        """
+        Get the statistics of the cache.
+
+        Returns:
+            FieldDictCacheInfo: The hit/miss counters, current usage and limits.
+        """
+        with self._lock:
+            return FieldDictCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._entries),
+                size=self._size,
+                max_entries=self.max_entries,
+                max_size=self.max_size,
+            )
+
+
+published_data_cache = FieldDictCache(
+    max_entries=headless_cms_settings.PUBLISHED_DATA_CACHE_SIZE,
+    max_size=headless_cms_settings.PUBLISHED_DATA_CACHE_MAX_BYTES,
+)
@@ -1,7 +1,21 @@
 import hashlib
+from collections.abc import Iterable
 from typing import Optional, Union
 
 
+def digest_serialized_data(serialized_data: str) -> str:
+    """
+    Compute the digest of the serialized data of a version.
+
+    Args:
+        serialized_data (str): The serialized data.
+
+    Returns:
+        str: The hexadecimal MD5 digest.
+    """
+    return hashlib.md5(serialized_data.encode("utf-8")).hexdigest()
+
+
 class HashTracker:
     def __init__(self, initial_data: Optional[str] = None, algo: str = "md5") -> None:
         """
@@ -23,14 +37,16 @@ class HashTracker:
     def _hash_function(self, data: str) -> bytes:
         """Compute the hash of the given data using the initialized hashing algorithm.
 
+        Every value is hashed on its own, so the combined hash does not depend on the
+        order in which values are added.
+
         Args:
             data (str): The data to hash.
 
         Returns:
             bytes: The hash digest of the data.
         """
-        self.hasher.update(data.encode("utf-8"))
-        return self.hasher.digest()
+        return hashlib.new(self.algo, data.encode("utf-8")).digest()
 
     def _combine_hashes(self, hash1: bytes, hash2: bytes) -> bytes:
         """Combines two hash bytes using XOR, intended as a private method.
@@ -61,6 +77,30 @@ class HashTracker:
         else:
             self._current_hash = self._combine_hashes(self._current_hash, new_hash)
 
+    def update_hashes(self, new_data: Iterable[Optional[Union[str, int]]]) -> None:
+        """
+        Update the current hash with many values at once. None values are skipped.
+
+        This gives the same result as calling `update_hash` for every value, in any order.
+
+        Args:
+            new_data (Iterable[Optional[Union[str, int]]]): The values to add to the
+                current hash.
+        """
+        combined = None
+        for data in new_data:
+            if data is None:
+                continue
+            value = int.from_bytes(self._hash_function(str(data)), "big")
+            combined = value if combined is None else combined ^ value
+
+        if combined is None:
+            return
+
+        if self._current_hash is not None:
+            combined ^= int.from_bytes(self._current_hash, "big")
+        self._current_hash = combined.to_bytes(self.hasher.digest_size, "big")
+
     @property
     def current_hash(self) -> Optional[str]:
         """
@@ -1,8 +1,14 @@
-from typing import Optional
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache
+from typing import NamedTuple, Optional
 
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Prefetch
 
 from headless_cms.models import LocalizedPublicationModel, M2MSortedOrderThrough
+from headless_cms.utils.hash_utils import HashTracker
 
 calculated_models = {}
 
@@ -67,3 +73,340 @@ def calculate_prefetch_relation(
             )
 
     return prefetch_relations, select_relations
+
+
+class PublicationRelations(NamedTuple):
+    foreign_keys: tuple
+    many_to_many: tuple
+    generic_relations: tuple
+
+
+@cache
+def get_publication_relations(
+    model: type[LocalizedPublicationModel],
+) -> PublicationRelations:
+    """
+    Get the relations of a model to other publication models that recursive actions follow.
+
+    Args:
+        model (type[LocalizedPublicationModel]): The model class.
+
+    Returns:
+        PublicationRelations: The forward foreign keys, many-to-many fields and generic
+        relations of the model.
+    """
+    foreign_keys = []
+    many_to_many = []
+    generic_relations = []
+    for f in model._meta.get_fields():
+        if not (
+            f.is_relation
+            and not f.auto_created
+            and f.related_model
+            and issubclass(f.related_model, LocalizedPublicationModel)
+        ):
+            continue
+        if f.many_to_one:
+            foreign_keys.append(f)
+        elif f.many_to_many:
+            many_to_many.append(f)
+        elif isinstance(f, GenericRelation):
+            generic_relations.append(f)
+    return PublicationRelations(
+        tuple(foreign_keys), tuple(many_to_many), tuple(generic_relations)
+    )
+
+
+class RelationGraph:
+    """
+    The graph of the publication objects reachable from a set of objects, through the
+    relations that recursive actions follow.
+
+    The graph is loaded breadth-first: each level costs one query per model for the
+    published versions and foreign keys of the newly reached objects, plus one query per
+    many-to-many field and generic relation. Objects shared by several roots are only
+    loaded once.
+
+    Nodes are `(model, pk)` pairs.
+
+    Attributes:
+        version_ids (dict): The published version ID of every loaded node.
+        tree_hashes (dict): The stored tree hash of every loaded node.
+        children (dict): The nodes directly related to every node.
+        sorted_children (dict): The `(position, pk)` pairs of the related objects of
+            every node, per sorted many-to-many field name.
+    """
+
+    def __init__(self):
+        self.version_ids: dict[tuple, Optional[int]] = {}
+        self.tree_hashes: dict[tuple, Optional[str]] = {}
+        self.children: dict[tuple, set] = {}
+        self.sorted_children: dict[tuple, dict] = defaultdict(lambda: defaultdict(list))
+
+    @classmethod
+    def load(cls, objs: Iterable[LocalizedPublicationModel]) -> "RelationGraph":
+        """
+        Load the graph reachable from the given objects.
+
+        The published versions and foreign keys of the objects are read from the
+        instances, so unsaved changes to them are taken into account.
+
+        Args:
+            objs (Iterable[LocalizedPublicationModel]): The root objects.
+
+        Returns:
+            RelationGraph: The loaded graph.
+        """
+        graph = cls()
+        to_expand = defaultdict(dict)
+        for obj in objs:
+            model = obj._meta.concrete_model
+            node = (model, obj.pk)
+            if node in graph.children:
+                continue
+            graph.children[node] = set()
+            graph.version_ids[node] = obj.published_version_id
+            graph.tree_hashes[node] = obj.tree_hash
+            to_expand[model][obj.pk] = [
+                getattr(obj, f.attname)
+                for f in get_publication_relations(model).foreign_keys
+            ]
+        return graph._load(to_expand)
+
+    @classmethod
+    def load_nodes(cls, nodes: Iterable[tuple]) -> "RelationGraph":
+        """
+        Load the graph reachable from the given nodes.
+
+        Args:
+            nodes (Iterable[tuple]): The `(model, pk)` root nodes.
+
+        Returns:
+            RelationGraph: The loaded graph.
+        """
+        graph = cls()
+        to_fetch = defaultdict(set)
+        for model, pk in nodes:
+            if (model, pk) not in graph.children:
+                graph.children[(model, pk)] = set()
+                to_fetch[model].add(pk)
+        return graph._load(graph._fetch(to_fetch))
+
+    def _load(self, to_expand):
+        while to_expand:
+            to_fetch = defaultdict(set)
+            for model, rows in to_expand.items():
+                self._expand(model, rows, to_fetch)
+            to_expand = self._fetch(to_fetch)
+        return self
+
+    def _add_edge(self, parent, model, pk, to_fetch):
+        child = (model._meta.concrete_model, pk)
+        self.children[parent].add(child)
+        if child not in self.children:
+            self.children[child] = set()
+            to_fetch[child[0]].add(pk)
+
+    def _expand(self, model, rows, to_fetch):
+        relations = get_publication_relations(model)
+
+        for pk, fk_values in rows.items():
+            for f, value in zip(relations.foreign_keys, fk_values):
+                if value is not None:
+                    self._add_edge((model, pk), f.related_model, value, to_fetch)
+
+        pks = list(rows)
+        for f in relations.many_to_many:
+            through = f.remote_field.through
+            source = through._meta.get_field(f.m2m_field_name()).attname
+            target = through._meta.get_field(f.m2m_reverse_field_name()).attname
+            is_sorted = issubclass(through, M2MSortedOrderThrough)
+            rows = through._base_manager.filter(**{f"{source}__in": pks}).values_list(
+                source, target, *(["position"] if is_sorted else [])
+            )
+            for pk, related_pk, *position in rows:
+                self._add_edge((model, pk), f.related_model, related_pk, to_fetch)
+                if is_sorted:
+                    self.sorted_children[(model, pk)][f.name].append(
+                        (position[0], related_pk)
+                    )
+
+        for f in relations.generic_relations:
+            related_model = f.related_model
+            content_type = ContentType.objects.get_for_model(
+                model, for_concrete_model=f.for_concrete_model
+            )
+            object_id = related_model._meta.get_field(f.object_id_field_name).attname
+            content_type_id = related_model._meta.get_field(
+                f.content_type_field_name
+            ).attname
+            pk_by_key = {str(pk): pk for pk in pks}
+            pairs = related_model._base_manager.filter(
+                **{content_type_id: content_type.pk, f"{object_id}__in": pks}
+            ).values_list(object_id, "pk")
+            for object_pk, related_pk in pairs:
+                self._add_edge(
+                    (model, pk_by_key[str(object_pk)]),
+                    related_model,
+                    related_pk,
+                    to_fetch,
+                )
+
+    def _fetch(self, to_fetch):
+        to_expand = defaultdict(dict)
+        for model, pks in to_fetch.items():
+            attnames = [
+                f.attname for f in get_publication_relations(model).foreign_keys
+            ]
+            rows = model._base_manager.filter(pk__in=pks).values_list(
+                "pk", "published_version_id", "tree_hash", *attnames
+            )
+            for pk, version_id, tree_hash, *fk_values in rows:
+                self.version_ids[(model, pk)] = version_id
+                self.tree_hashes[(model, pk)] = tree_hash
+                to_expand[model][pk] = fk_values
+        return to_expand
+
+    def load_objects(
+        self, known: Iterable[LocalizedPublicationModel] = ()
+    ) -> dict[tuple, LocalizedPublicationModel]:
+        """
+        Load the objects of every node of the graph, with one query per model.
+
+        Args:
+            known (Iterable[LocalizedPublicationModel], optional): Objects already loaded,
+                which are reused instead of fetched again.
+
+        Returns:
+            dict: A mapping from every node to its object, in the order the nodes were
+            reached.
+        """
+        objects = {(obj._meta.concrete_model, obj.pk): obj for obj in known}
+        to_fetch = defaultdict(list)
+        for model, pk in self.children:
+            if (model, pk) not in objects:
+                to_fetch[model].append(pk)
+        for model, pks in to_fetch.items():
+            for obj in model._base_manager.filter(pk__in=pks):
+                objects[(model, obj.pk)] = obj
+        return {node: objects[node] for node in self.children if node in objects}
+
+    def reachable_nodes(self, roots: Iterable[tuple]) -> dict:
+        """
+        Get the nodes reachable from each of the given nodes, including the node itself.
+
+        Strongly connected components are collapsed (Tarjan's algorithm), so the reachable
+        set of every component is built once from the sets of the components below it and
+        shared by all its members.
+
+        Args:
+            roots (Iterable[tuple]): The nodes to start from.
+
+        Returns:
+            dict: A mapping from every node reached to the frozenset of its reachable nodes.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        reachable = {}
+
+        def visit(node):
+            index[node] = lowlink[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            work.append((node, iter(self.children.get(node, ()))))
+
+        for root in roots:
+            if root in index:
+                continue
+            work = []
+            visit(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        visit(child)
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        members = [stack.pop()]
+                        while members[-1] != node:
+                            members.append(stack.pop())
+                        on_stack.difference_update(members)
+                        self._collapse_component(members, reachable)
+
+        return reachable
+
+    def _collapse_component(self, members, reachable):
+        component = set(members)
+        for member in members:
+            for child in self.children.get(member, ()):
+                if child not in component:
+                    component |= reachable[child]
+        component = frozenset(component)
+        for member in members:
+            reachable[member] = component
+
+    def get_orderings(self, node: tuple) -> list[str]:
+        """
+        Get the order of the related objects of a published node in its sorted
+        many-to-many relations, which the published representation follows.
+
+        Args:
+            node (tuple): The `(model, pk)` node.
+
+        Returns:
+            list[str]: One key per sorted relation of the node, listing the related
+            primary keys in order.
+        """
+        if self.version_ids.get(node) is None or node not in self.sorted_children:
+            return []
+
+        model, pk = node
+        return [
+            f"{model._meta.label}:{pk}:{name}:"
+            + ",".join(str(related_pk) for _, related_pk in sorted(pairs))
+            for name, pairs in sorted(self.sorted_children[node].items())
+        ]
+
+    def recursive_hashes(self, roots: Iterable[tuple]) -> dict:
+        """
+        Compute the recursive hash of each of the given nodes.
+
+        The hash combines the published version IDs of every node reachable from the node,
+        each counted once, so it does not depend on the traversal order. The order of the
+        related objects in sorted many-to-many relations is hashed along with them.
+
+        Args:
+            roots (Iterable[tuple]): The nodes to hash.
+
+        Returns:
+            dict: A mapping from each node to its hash, or None if nothing reachable from
+            it is published.
+        """
+        roots = list(roots)
+        reachable = self.reachable_nodes(roots)
+        hashes_by_component = {}
+        hashes = {}
+        for root in roots:
+            component = reachable[root]
+            if component not in hashes_by_component:
+                hash_tracker = HashTracker()
+                hash_tracker.update_hashes(
+                    self.version_ids.get(node) for node in component
+                )
+                hash_tracker.update_hashes(
+                    ordering
+                    for node in component
+                    for ordering in self.get_orderings(node)
+                )
+                hashes_by_component[component] = hash_tracker.current_hash
+            hashes[root] = hashes_by_component[component]
+        return hashes
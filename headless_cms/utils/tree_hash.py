@@ -0,0 +1,282 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache
+from typing import Optional
+
+from django.apps import apps
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+
+from headless_cms.models import LocalizedPublicationModel, M2MSortedOrderThrough
+from headless_cms.utils.relations import RelationGraph, get_publication_relations
+
+
+def get_node(obj: LocalizedPublicationModel) -> tuple:
+    """
+    Get the relation graph node of an object.
+
+    Args:
+        obj (LocalizedPublicationModel): The object.
+
+    Returns:
+        tuple: The `(model, pk)` node.
+    """
+    return obj._meta.concrete_model, obj.pk
+
+
+def _group_by_model(nodes: Iterable[tuple]) -> dict:
+    pks_by_model = defaultdict(set)
+    for model, pk in nodes:
+        pks_by_model[model].add(pk)
+    return pks_by_model
+
+
+def _sorted_by_model(items_by_model: dict) -> list:
+    return sorted(items_by_model.items(), key=lambda item: item[0]._meta.label)
+
+
+@cache
+def get_reverse_publication_relations(model: type[LocalizedPublicationModel]) -> tuple:
+    """
+    Get the relations of other publication models that point to a model.
+
+    Args:
+        model (type[LocalizedPublicationModel]): The model class.
+
+    Returns:
+        tuple: `(parent_model, field)` pairs.
+    """
+    reverse_relations = []
+    for parent in apps.get_models():
+        if not issubclass(parent, LocalizedPublicationModel) or parent._meta.proxy:
+            continue
+        for f in (
+            field for fields in get_publication_relations(parent) for field in fields
+        ):
+            if f.related_model._meta.concrete_model is model:
+                reverse_relations.append((parent, f))
+    return tuple(reverse_relations)
+
+
+@cache
+def get_through_parents(through: type[M2MSortedOrderThrough]) -> tuple:
+    """
+    Get the publication models owning a many-to-many relation through a model.
+
+    Args:
+        through (type[M2MSortedOrderThrough]): The through model.
+
+    Returns:
+        tuple: `(parent_model, source_attname)` pairs, where `source_attname` is the
+        attribute of the through model holding the parent key.
+    """
+    parents = []
+    for parent in apps.get_models():
+        if not issubclass(parent, LocalizedPublicationModel) or parent._meta.proxy:
+            continue
+        for f in get_publication_relations(parent).many_to_many:
+            if f.remote_field.through is through:
+                source = through._meta.get_field(f.m2m_field_name()).attname
+                parents.append((parent, source))
+    return tuple(parents)
+
+
+@cache
+def get_tree_fields(model: type[LocalizedPublicationModel]) -> tuple:
+    """
+    Get the fields of a model whose values are part of the published trees containing
+    its objects: the published version, the foreign keys to other publication models
+    and the keys of the generic relations pointing to the model.
+
+    Args:
+        model (type[LocalizedPublicationModel]): The model class.
+
+    Returns:
+        tuple: The fields.
+    """
+    fields = [model._meta.get_field("published_version")]
+    fields.extend(get_publication_relations(model).foreign_keys)
+    for _, field in get_reverse_publication_relations(model):
+        if isinstance(field, GenericRelation):
+            fields.append(model._meta.get_field(field.object_id_field_name))
+            fields.append(model._meta.get_field(field.content_type_field_name))
+    return tuple(dict.fromkeys(fields))
+
+
+def _get_parent_pks(parent, field, model, pks):
+    if field.many_to_one:
+        return parent._base_manager.filter(**{f"{field.attname}__in": pks}).values_list(
+            "pk", flat=True
+        )
+
+    if field.many_to_many:
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        return through._base_manager.filter(**{f"{target}__in": pks}).values_list(
+            source, flat=True
+        )
+
+    content_type = ContentType.objects.get_for_model(
+        parent, for_concrete_model=field.for_concrete_model
+    )
+    object_id = model._meta.get_field(field.object_id_field_name).attname
+    content_type_id = model._meta.get_field(field.content_type_field_name).attname
+    object_pks = model._base_manager.filter(
+        **{content_type_id: content_type.pk, "pk__in": pks}
+    ).values_list(object_id, flat=True)
+    return [
+        parent._meta.pk.to_python(object_pk)
+        for object_pk in object_pks
+        if object_pk is not None
+    ]
+
+
+def find_ancestors(nodes: Iterable[tuple]) -> set:
+    """
+    Find the nodes whose tree contains any of the given nodes, including the nodes
+    themselves.
+
+    The graph is walked upward breadth-first, with one query per reverse relation on each
+    level.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes to start from.
+
+    Returns:
+        set: The nodes and all their ancestors.
+    """
+    found = set(nodes)
+    frontier = _group_by_model(found)
+    while frontier:
+        next_frontier = defaultdict(set)
+        for model, pks in frontier.items():
+            for parent, field in get_reverse_publication_relations(model):
+                for parent_pk in _get_parent_pks(parent, field, model, list(pks)):
+                    node = (parent, parent_pk)
+                    if node not in found:
+                        found.add(node)
+                        next_frontier[parent].add(parent_pk)
+        frontier = next_frontier
+    return found
+
+
+def store_tree_hashes(nodes: Iterable[tuple]) -> int:
+    """
+    Compute the recursive hashes of the given nodes and store the ones that changed.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes to refresh.
+
+    Returns:
+        int: The number of stored hashes that changed.
+    """
+    nodes = list(nodes)
+    graph = RelationGraph.load_nodes(nodes)
+    changed_by_model = defaultdict(list)
+    for (model, pk), recursive_hash in graph.recursive_hashes(nodes).items():
+        if (model, pk) not in graph.tree_hashes:
+            continue
+        tree_hash = recursive_hash or ""
+        if graph.tree_hashes[(model, pk)] != tree_hash:
+            changed_by_model[model].append(model(pk=pk, tree_hash=tree_hash))
+
+    for model, objs in _sorted_by_model(changed_by_model):
+        objs.sort(key=lambda obj: obj.pk)
+        model._base_manager.bulk_update(objs, ["tree_hash"], batch_size=1000)
+    return sum(len(objs) for objs in changed_by_model.values())
+
+
+def update_tree_hashes(nodes: Iterable[tuple]) -> int:
+    """
+    Recompute the stored tree hashes of the given nodes and of all their ancestors.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes that changed.
+
+    Returns:
+        int: The number of stored hashes that changed.
+    """
+    return store_tree_hashes(find_ancestors(nodes))
+
+
+def invalidate_tree_hashes(nodes: Iterable[tuple]) -> None:
+    """
+    Clear the stored tree hashes of the given nodes and of all their ancestors, until
+    they are stored again when publishing or rebuilding them.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes that changed.
+    """
+    clear_tree_hashes(find_ancestors(nodes))
+
+
+def clear_tree_hashes(nodes: Iterable[tuple]) -> None:
+    """
+    Clear the stored tree hashes of the given nodes only.
+
+    The rows are cleared right away, so hashes recomputed later in the same transaction
+    are kept. Models and primary keys are updated in a fixed order, so concurrent
+    transactions with shared ancestors lock their rows in the same order.
+
+    Args:
+        nodes (Iterable[tuple]): The `(model, pk)` nodes to clear, usually found with
+            `find_ancestors`.
+    """
+    for model, pks in _sorted_by_model(_group_by_model(nodes)):
+        model._base_manager.filter(pk__in=sorted(pks), tree_hash__isnull=False).update(
+            tree_hash=None
+        )
+
+
+def get_recursive_hashes(
+    objs: Iterable[LocalizedPublicationModel],
+) -> dict[LocalizedPublicationModel, Optional[str]]:
+    """
+    Get the recursive hashes of many objects in one batch.
+
+    Stored tree hashes are read with one query per model. Missing ones are computed in a
+    single relation traversal, but not stored, so reads never write.
+
+    Args:
+        objs (Iterable[LocalizedPublicationModel]): The objects to hash.
+
+    Returns:
+        dict: A mapping from each object to its recursive hash.
+    """
+    objs = list(objs)
+    tree_hashes = {}
+    for model, pks in _group_by_model(get_node(obj) for obj in objs).items():
+        rows = model._base_manager.filter(pk__in=pks).values_list("pk", "tree_hash")
+        tree_hashes.update(((model, pk), tree_hash) for pk, tree_hash in rows)
+
+    missing = [node for node, tree_hash in tree_hashes.items() if tree_hash is None]
+    if missing:
+        for node, tree_hash in (
+            RelationGraph.load_nodes(missing).recursive_hashes(missing).items()
+        ):
+            tree_hashes[node] = tree_hash or ""
+
+    return {obj: tree_hashes.get(get_node(obj)) or None for obj in objs}
+
+
+def rebuild_tree_hashes(
+    model: type[LocalizedPublicationModel], batch_size: int = 500
+) -> int:
+    """
+    Recompute the stored tree hashes of every object of a model.
+
+    Args:
+        model (type[LocalizedPublicationModel]): The model class.
+        batch_size (int): The number of objects hashed per relation traversal.
+
+    Returns:
+        int: The number of stored hashes that changed.
+    """
+    pks = list(model._base_manager.order_by("pk").values_list("pk", flat=True))
+    changed = 0
+    for start in range(0, len(pks), batch_size):
+        changed += store_tree_hashes(
+            (model, pk) for pk in pks[start : start + batch_size]
+        )
+    return changed
@@ -10,6 +10,7 @@ from test_app.models import (
     Blog,
     Category,
     Domain,
+    HomePage,
     Item,
     Note,
     Post,
@@ -125,3 +126,10 @@ class BlogFactory(DjangoModelFactory):
         model = Blog
 
     name = factory.Faker("sentence", nb_words=3)
+
+
+class HomePageFactory(DjangoModelFactory):
+    class Meta:
+        model = HomePage
+
+    title = factory.Faker("sentence", nb_words=3)
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:54
+
+import django.db.models.deletion
+import localized_fields.fields.text_field
+import localized_fields.mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reversion", "0002_add_index_on_version_for_content_type_and_db"),
+        ("test_app", "0003_alter_articleimage_src_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HomePage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("skip_translation", models.BooleanField(default=False)),
+                (
+                    "title",
+                    localized_fields.fields.text_field.LocalizedTextField(
+                        blank=True, null=True, required=[]
+                    ),
+                ),
+                ("articles", models.ManyToManyField(blank=True, to="test_app.article")),
+                (
+                    "featured_post",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="test_app.post",
+                    ),
+                ),
+                (
+                    "published_version",
+                    models.ForeignKey(
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="reversion.version",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+            bases=(localized_fields.mixins.AtomicSlugRetryMixin, models.Model),
+        ),
+    ]
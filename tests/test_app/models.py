@@ -5,6 +5,7 @@ from headless_cms.fields import AutoLanguageUrlField, LocalizedMartorField
 from headless_cms.models import (
     LocalizedDynamicFileModel,
     LocalizedPublicationModel,
+    LocalizedSingletonModel,
     LocalizedTitleSlugModel,
     M2MSortedOrderThrough,
     SortableGenericBaseModel,
@@ -15,14 +16,14 @@ from localized_fields.fields import (
 from localized_fields.fields.char_field import LocalizedCharField
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Item(SortableGenericBaseModel):
     title = LocalizedTextField(blank=True, null=True, required=False)
     description = LocalizedTextField(blank=True, null=True, required=False)
     icon = models.CharField(blank=True, default="")
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Note(LocalizedPublicationModel):
     text = LocalizedTextField(blank=True, null=True, required=False)
 
@@ -36,7 +37,7 @@ class News(LocalizedPublicationModel):
         abstract = True
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Post(News):
     description = LocalizedTextField(blank=True, null=True, required=False)
     body = LocalizedMartorField(blank=False, null=False, required=False)
@@ -61,17 +62,17 @@ class Post(News):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Category(LocalizedTitleSlugModel):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class PostTag(LocalizedTitleSlugModel):
     pass
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Article(News):
     story = LocalizedMartorField(blank=False, null=False, required=False)
     images = models.ManyToManyField("ArticleImage", through="ArticleImageThrough")
@@ -85,7 +86,7 @@ class Article(News):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class ArticleImage(LocalizedDynamicFileModel):
     pass
 
@@ -95,7 +96,7 @@ class ArticleImageThrough(M2MSortedOrderThrough):
     article_image = models.ForeignKey("ArticleImage", on_delete=models.CASCADE)
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Blog(LocalizedTitleSlugModel):
     name = LocalizedCharField()
     posts = models.ManyToManyField(
@@ -115,6 +116,18 @@ class Blog(LocalizedTitleSlugModel):
     )
 
 
-@reversion.register(exclude=("published_version",))
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
 class Domain(LocalizedTitleSlugModel):
     pass
+
+
+@reversion.register(exclude=("published_version", "tree_hash", "content_digest"))
+class HomePage(LocalizedSingletonModel):
+    title = LocalizedTextField(blank=True, null=True, required=False)
+    featured_post = models.ForeignKey(
+        Post,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+    )
+    articles = models.ManyToManyField(Article, blank=True)
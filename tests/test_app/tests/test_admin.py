@@ -3,7 +3,9 @@ from unittest.mock import patch
 import factory
 import reversion
 from django.conf import settings
+from django.db import connection
 from django.shortcuts import resolve_url
+from django.test.utils import CaptureQueriesContext
 from reversion.models import Version
 
 from helpers.base import BaseTestCase
@@ -49,6 +51,44 @@ class AdminChangeListViewTests(BaseTestCase):
         res = self.client.get(resolve_url("admin:test_app_post_changelist"))
         self.assertContains(res, Post.AdminPublishedStateHtml.PUBLISHED_OUTDATED)
 
+    def test_change_list_publish_state_filter(self):
+        with reversion.create_revision():
+            unpublished, outdated, latest = PostFactory.create_batch(3)
+        outdated.publish()
+        latest.publish()
+        with reversion.create_revision():
+            outdated.title = "new title"
+            outdated.save()
+
+        url = resolve_url("admin:test_app_post_changelist")
+        for state, post in [
+            ("unpublished", unpublished),
+            ("outdated", outdated),
+            ("latest", latest),
+        ]:
+            res = self.client.get(url, {"publish_state": state})
+            self.assertEqual(
+                [obj.pk for obj in res.context["cl"].result_list], [post.pk]
+            )
+
+    def test_change_list_query_count_does_not_grow_with_rows(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(resolve_url("admin:test_app_post_changelist"))
+            self.assertEqual(res.status_code, 200)
+            return len(ctx.captured_queries)
+
+        with reversion.create_revision():
+            post = PostFactory.create()
+        post.publish(self.user)
+        single_count = count_queries()
+
+        with reversion.create_revision():
+            posts = PostFactory.create_batch(5)
+        Post.published_objects.filter(pk__in=[p.pk for p in posts]).bulk_publish()
+
+        self.assertEqual(count_queries(), single_count)
+
 
 class AdminImportExportViewTests(BaseTestCase):
     def test_render_import_view_with_auto_fields_post(self):
@@ -100,6 +140,35 @@ class AdminChangeViewTests(BaseTestCase):
         self.assertContains(res, '"_recursively_publish"')
         self.assertContains(res, '"_unpublish"')
 
+    def test_inline_publish_status_version_queries(self):
+        def count_queries():
+            url = resolve_url("admin:test_app_post_change", self.obj.id)
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(url)
+            # Inline select widgets query their choices once per row.
+            version_queries = [
+                query
+                for query in ctx.captured_queries
+                if "reversion_version" in query["sql"]
+            ]
+            return len(version_queries), res
+
+        with reversion.create_revision():
+            self.obj.tags.set(PostTagFactory.create_batch(1))
+            PostItemFactory.create_batch(1, content_object=self.obj)
+        self.obj.recursively_publish()
+        single_count, _ = count_queries()
+
+        with reversion.create_revision():
+            self.obj.tags.add(*PostTagFactory.create_batch(4))
+            PostItemFactory.create_batch(4, content_object=self.obj)
+        many_count, res = count_queries()
+
+        self.assertEqual(many_count, single_count)
+        self.assertContains(res, "published (latest)", count=2)
+        # The new tags and items, and the empty item form.
+        self.assertContains(res, "unpublished", count=9)
+
 
 class AdminPostRequestTests(BaseTestCase):
     def setUp(self):
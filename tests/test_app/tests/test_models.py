@@ -1,8 +1,13 @@
-from unittest.mock import Mock, call
+from datetime import timedelta
+from unittest.mock import Mock, call, patch
 
 import reversion
-from django.utils import translation
-from reversion.models import Version
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
+from headless_cms.settings import headless_cms_settings
+from reversion.models import Revision, Version
 
 from helpers.base import BaseTestCase
 from test_app.factories import (
@@ -10,6 +15,8 @@ from test_app.factories import (
     BlogFactory,
     NoteFactory,
     PostFactory,
+    PostItemFactory,
+    PostTagFactory,
 )
 from test_app.models import Article, Blog, Post
 
@@ -57,6 +64,43 @@ class TestPublicationModel(BaseTestCase):
         assert obj.published_state() == Post.AdminPublishedStateHtml.PUBLISHED_OUTDATED
         translation.deactivate()
 
+    def test_publish_unchanged_content(self):
+        with reversion.create_revision():
+            obj: Post = PostFactory.create()
+        draft_version = Version.objects.get_for_object(obj).get()
+
+        obj.refresh_from_db()
+        assert obj.content_digest.startswith(f"{draft_version.pk}:")
+
+        obj.publish()
+        assert obj.published_version_id == draft_version.pk
+        assert Version.objects.get_for_object(obj).count() == 1
+
+        # Unpublishing saves a version, which is published back as is.
+        obj.unpublish()
+        obj.refresh_from_db()
+        obj.publish()
+        versions = Version.objects.get_for_object(obj)
+        assert versions.count() == 2
+        assert obj.published_version_id == versions.first().pk
+
+        # A missing digest is computed from the version data.
+        obj.unpublish()
+        Post.objects.filter(pk=obj.pk).update(content_digest=None)
+        obj.publish()
+        assert Version.objects.get_for_object(obj).count() == 3
+        assert obj.published_state() == Post.AdminPublishedStateHtml.PUBLISHED_LATEST
+
+        obj.unpublish()
+        obj.title.en = "Changed"
+        obj.publish()
+        obj.refresh_from_db()
+        assert Version.objects.get_for_object(obj).count() == 5
+        assert obj.published_data["title"].en == "Changed"
+        # Publishing keeps the digest stored with the published version.
+        assert obj.content_digest.startswith(f"{obj.published_version_id}:")
+        assert obj.has_latest_content(obj.published_version_id, obj.content_digest)
+
     def test_published_queryset(self):
         with reversion.create_revision():
             PostFactory.create()
@@ -97,3 +141,167 @@ class TestPublicationModel(BaseTestCase):
             ],
             any_order=True,
         )  # note only call once because we have deduplicated
+
+    def test_build_actions_query_count(self):
+        def create_blog(post_count):
+            with reversion.create_revision():
+                blog = BlogFactory.create()
+                posts = PostFactory.create_batch(post_count, note=NoteFactory.create())
+                for post in posts:
+                    post.tags.set(PostTagFactory.create_batch(2))
+                    PostItemFactory.create_batch(2, content_object=post)
+                blog.posts.set(posts)
+            return blog
+
+        def count_queries(blog):
+            with CaptureQueriesContext(connection) as ctx:
+                actions = blog.build_actions(Mock())
+            return len(ctx.captured_queries), actions
+
+        small_count, _ = count_queries(create_blog(1))
+        large_count, actions = count_queries(create_blog(5))
+
+        assert small_count == large_count
+        # The blog, its five posts with their tags and items, and the shared note.
+        assert len(actions) == 1 + 5 * (1 + 2 + 2) + 1
+        nodes = {(obj.__class__, obj.pk) for _, obj, _, _ in actions}
+        assert len(nodes) == len(actions)
+
+
+class BulkPublicationTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.posts = PostFactory.create_batch(3)
+        self.posts[0].publish()
+
+    def test_bulk_publish(self):
+        published_version_id = self.posts[0].published_version_id
+        draft_version_id = Version.objects.get_for_object(self.posts[2]).first().pk
+        revision_count = Version.objects.values("revision").distinct().count()
+        # Saved without a revision, so its latest version is outdated.
+        self.posts[1].title.en = "Changed"
+        self.posts[1].save()
+
+        assert Post.published_objects.all().bulk_publish(self.user) == 2
+
+        posts = Post.published_objects.all().annotate_latest_version().order_by("pk")
+        for post in posts:
+            assert post.published_version_id == post.latest_version_id
+            assert post.tree_hash
+        assert posts[0].published_version_id == published_version_id
+
+        revisions = Version.objects.values("revision").distinct()
+        assert revisions.count() == revision_count + 1
+        revision = Version.objects.get(pk=posts[1].published_version_id).revision
+        assert revision.comment == "Publish"
+        assert revision.user == self.user
+        # Unchanged content is published from its latest version.
+        assert posts[2].published_version_id == draft_version_id
+
+        assert Post.published_objects.all().bulk_publish() == 0
+
+    def test_bulk_publish_query_count(self):
+        def count_queries(queryset):
+            with CaptureQueriesContext(connection) as ctx:
+                queryset.bulk_publish()
+            return len(ctx.captured_queries)
+
+        with reversion.create_revision():
+            PostFactory.create_batch(10)
+
+        single_count = count_queries(Post.published_objects.filter(pk=self.posts[1].pk))
+        assert count_queries(Post.published_objects.all()) == single_count
+
+    def test_bulk_unpublish(self):
+        assert Post.published_objects.all().bulk_unpublish() == 1
+
+        assert not Post.published_objects.published().exists()
+        self.posts[0].refresh_from_db()
+        assert self.posts[0].tree_hash == ""
+        assert (
+            Version.objects.get_for_object(self.posts[0]).first().revision.comment
+            == "Unpublish"
+        )
+
+
+class PublishedStateInvalidationTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.post = PostFactory.create()
+        self.post.publish()
+        self.post.refresh_from_db()
+
+    def test_draft_save_keeps_tree_hash(self):
+        tree_hash = self.post.tree_hash
+        assert tree_hash
+
+        with reversion.create_revision():
+            self.post.title.en = "Draft"
+            self.post.save()
+        self.post.refresh_from_db()
+        assert self.post.tree_hash == tree_hash
+
+        # Relations are served live, so changing them clears the hash.
+        with reversion.create_revision():
+            self.post.note = NoteFactory.create()
+            self.post.save()
+        self.post.refresh_from_db()
+        assert self.post.tree_hash is None
+
+    def test_missing_core_app_fails_check(self):
+        assert not Post.check()
+
+        with patch("headless_cms.models.apps.is_installed", return_value=False):
+            errors = Post.check()
+        assert [error.id for error in errors] == ["headless_cms.E001"]
+
+
+class DraftCoalescingTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(headless_cms_settings, "DRAFT_COALESCE_WINDOW", 60)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.post = self.save_draft(PostFactory.build())
+
+    def save_draft(self, post, user=None):
+        with reversion.create_revision():
+            reversion.set_user(user or self.user)
+            post.save()
+        return post
+
+    def get_versions(self):
+        return Version.objects.get_for_object(self.post)
+
+    def test_consecutive_drafts_are_coalesced(self):
+        for title in ["First", "Second"]:
+            self.post.title.en = title
+            self.save_draft(self.post)
+
+        assert self.get_versions().count() == 1
+        assert self.get_versions().get().field_dict["title"].en == "Second"
+        assert Revision.objects.count() == 1
+
+    def test_published_versions_are_kept(self):
+        self.post.title.en = "Published"
+        self.post.publish(self.user)
+        published_version_id = self.post.published_version_id
+
+        self.save_draft(self.post)
+        self.save_draft(self.post)
+
+        # The initial draft, the published version and the coalesced drafts.
+        versions = list(self.get_versions().values_list("pk", flat=True))
+        assert len(versions) == 3
+        assert versions[1] == published_version_id
+
+    def test_other_users_and_old_drafts_are_kept(self):
+        other_user = User.objects.create(username="other")
+        self.save_draft(self.post, other_user)
+        assert self.get_versions().count() == 2
+
+        Revision.objects.update(date_created=timezone.now() - timedelta(minutes=5))
+        self.save_draft(self.post, other_user)
+        assert self.get_versions().count() == 3
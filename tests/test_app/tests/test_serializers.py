@@ -0,0 +1,190 @@
+import json
+from unittest.mock import patch
+
+import reversion
+from django.core.validators import MaxLengthValidator
+from django.utils import translation
+from headless_cms.serializers import (
+    LocalizedBaseSerializer,
+    _serializer_registry,
+    auto_serializer,
+)
+from rest_framework import serializers
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIRequestFactory
+
+from helpers.base import BaseTestCase
+from test_app.factories import (
+    ArticleFactory,
+    ArticleImageFactory,
+    BlogFactory,
+    CategoryFactory,
+    NoteFactory,
+    PostFactory,
+    PostItemFactory,
+    PostTagFactory,
+)
+from test_app.models import Article, ArticleImage, Blog, Note, Post
+
+
+class AutoSerializerRegistryTests(BaseTestCase):
+    def get_nested_serializer_class(self, serializer_class, field_name):
+        field = serializer_class._declared_fields[field_name]
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        return field.__class__
+
+    def test_same_class_for_same_model(self):
+        assert auto_serializer(Post) is auto_serializer(Post)
+
+    def test_same_class_for_equal_overrides(self):
+        field = serializers.CharField(read_only=True)
+
+        first = auto_serializer(
+            Post, override_model_serializer_fields={Note: {"x": field}}
+        )
+        second = auto_serializer(
+            Post, override_model_serializer_fields={Note: {"x": field}}
+        )
+
+        assert first is second
+        assert first is not auto_serializer(Post)
+
+    def test_same_class_for_equivalent_override_fields(self):
+        def get_serializer_class(max_length):
+            return auto_serializer(
+                Post,
+                override_model_serializer_fields={
+                    Note: {
+                        "x": serializers.CharField(
+                            max_length=max_length,
+                            validators=[MaxLengthValidator(max_length)],
+                        )
+                    }
+                },
+            )
+
+        first = get_serializer_class(10)
+        registry_size = len(_serializer_registry)
+
+        # New but equivalent field instances do not grow the registry.
+        assert get_serializer_class(10) is first
+        assert len(_serializer_registry) == registry_size
+        assert get_serializer_class(20) is not first
+
+    def test_nested_serializers_are_shared_across_roots(self):
+        post_note = self.get_nested_serializer_class(auto_serializer(Post), "note")
+        article_note = self.get_nested_serializer_class(
+            auto_serializer(Article), "note"
+        )
+        blog_article = self.get_nested_serializer_class(
+            auto_serializer(Blog), "articles"
+        )
+
+        assert post_note is article_note
+        assert self.get_nested_serializer_class(blog_article, "note") is post_note
+        assert self.get_nested_serializer_class(
+            blog_article, "images"
+        ) is self.get_nested_serializer_class(auto_serializer(Article), "images")
+
+    def test_root_serializer_differs_from_nested(self):
+        nested_post = self.get_nested_serializer_class(auto_serializer(Blog), "posts")
+
+        assert nested_post is not auto_serializer(Post)
+        assert "hash" in auto_serializer(Post)._declared_fields
+        assert "hash" not in nested_post._declared_fields
+
+    def test_field_declarations_are_memoized(self):
+        serializer_class = auto_serializer(ArticleImage)
+        first_fields = serializer_class().fields
+
+        with patch.object(
+            ModelSerializer, "get_fields", side_effect=AssertionError
+        ) as get_fields:
+            second_fields = serializer_class().fields
+
+        get_fields.assert_not_called()
+        assert list(first_fields) == list(second_fields)
+        assert first_fields["alt"] is not second_fields["alt"]
+        assert second_fields["alt"].parent is not first_fields["alt"].parent
+
+    def test_memoized_fields_are_per_class(self):
+        class NoteTextSerializer(LocalizedBaseSerializer):
+            class Meta(LocalizedBaseSerializer.Meta):
+                model = Note
+                fields = ["id", "text"]
+
+        assert list(NoteTextSerializer().fields) == ["id", "text"]
+        assert "text" in auto_serializer(Note)().fields
+        assert "skip_translation" not in auto_serializer(Note)().fields
+
+
+class CompiledSerializerTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.note = NoteFactory.create()
+            self.category = CategoryFactory.create()
+            self.tags = PostTagFactory.create_batch(2)
+            self.post = PostFactory.create(note=self.note, category=self.category)
+            self.post.tags.set(self.tags)
+            items = PostItemFactory.create_batch(2, content_object=self.post)
+            icon = f"<getattr>('test_app.Item', {items[0].id}, 'icon')<getattr/>"
+            self.post.body = f"Icon: {icon}"
+            self.post.save()
+            self.external_post = PostFactory.create(href="https://example.com/post")
+            self.article = ArticleFactory.create(note=self.note)
+            self.article.images.set(ArticleImageFactory.create_batch(2))
+            self.blog = BlogFactory.create()
+            self.blog.posts.set([self.post, self.external_post])
+            self.blog.articles.set([self.article])
+
+        for obj in [self.post, self.external_post, self.article, self.blog]:
+            obj.recursively_publish()
+
+    def serialize(self, model, context):
+        queryset = model.published_objects.published(auto_prefetch=True)
+        return auto_serializer(model)(queryset, many=True, context=context).data
+
+    def assert_compiled_output_identical(self, model, context):
+        expected = self.serialize(model, context)
+        compiled = self.serialize(model, {**context, "compiled": True})
+
+        assert expected
+        assert json.dumps(compiled) == json.dumps(expected)
+
+    def test_compiled_output_is_identical(self):
+        request = APIRequestFactory().get("/")
+
+        for model in [Post, Article, Blog]:
+            for language in ["en", "vi"]:
+                with translation.override(language):
+                    self.assert_compiled_output_identical(model, {})
+                    self.assert_compiled_output_identical(model, {"request": request})
+
+    def test_compiled_serializer_resolves_fields_once(self):
+        serializer = auto_serializer(Post)(
+            Post.published_objects.published(auto_prefetch=True),
+            many=True,
+            context={"compiled": True},
+        )
+
+        with patch.object(
+            serializers.Field, "get_attribute", side_effect=AssertionError
+        ):
+            data = serializer.data
+
+        assert {post["id"] for post in data} == {self.post.id, self.external_post.id}
+        assert "/" + translation.get_language() + self.post.href in [
+            post["href"] for post in data
+        ]
+
+    def test_list_hashes_are_computed_in_batch(self):
+        expected = {post: post.get_recursive_hash() for post in Post.objects.all()}
+
+        with patch.object(Post, "get_recursive_hash", side_effect=AssertionError):
+            data = self.serialize(Post, {})
+
+        assert {post["id"]: post["hash"] for post in data} == {
+            post.id: recursive_hash for post, recursive_hash in expected.items()
+        }
@@ -0,0 +1,188 @@
+from unittest.mock import patch
+
+import reversion
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from headless_cms.core.models import PublishedSnapshot
+from headless_cms.settings import headless_cms_settings
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+
+from helpers.base import BaseAPITestCase
+from test_app.factories import (
+    ArticleFactory,
+    ArticleImageFactory,
+    HomePageFactory,
+    PostFactory,
+)
+from test_app.views import HomePageView
+
+
+class DenyObjectPermission(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return False
+
+
+class PublishedSnapshotTests(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.post = PostFactory.create(title="Featured post")
+        self.post.publish()
+
+        with reversion.create_revision():
+            self.home_page = HomePageFactory.create(
+                title="Home", featured_post=self.post
+            )
+        self.url = reverse("home")
+
+    def enable_snapshots(self):
+        return patch.object(headless_cms_settings, "ENABLE_PUBLISHED_SNAPSHOTS", True)
+
+    def get_content_queries(self, ctx):
+        return [
+            q["sql"]
+            for q in ctx.captured_queries
+            if "django_session" not in q["sql"] and "auth_user" not in q["sql"]
+        ]
+
+    def test_snapshots_disabled_by_default(self):
+        self.home_page.publish()
+
+        assert not PublishedSnapshot.objects.exists()
+
+        response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "Home"
+
+    def test_publish_writes_snapshot_per_language(self):
+        with self.enable_snapshots():
+            self.home_page.publish()
+
+            snapshots = PublishedSnapshot.objects.for_object(self.home_page)
+            assert set(snapshots.values_list("language", flat=True)) == {
+                "en",
+                "ro",
+                "vi",
+            }
+            en_snapshot = snapshots.get(language="en").data
+            assert en_snapshot["title"] == "Home"
+            assert en_snapshot["featured_post"]["title"] == "Featured post"
+
+    def test_view_serves_snapshot_in_single_query(self):
+        live_response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+        assert live_response.status_code == status.HTTP_404_NOT_FOUND
+
+        self.home_page.publish()
+        live_response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+
+        with self.enable_snapshots():
+            self.home_page.refresh_snapshots()
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == live_response.json()
+            content_queries = self.get_content_queries(ctx)
+            assert len(content_queries) == 1
+            assert "publishedsnapshot" in content_queries[0]
+            assert response["ETag"] == live_response["ETag"]
+
+            response = self.client.get(
+                self.url,
+                HTTP_ACCEPT_LANGUAGE="en",
+                HTTP_IF_NONE_MATCH=live_response["ETag"],
+            )
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_changes_invalidate_snapshots(self):
+        with self.enable_snapshots():
+            self.home_page.publish()
+            assert PublishedSnapshot.objects.exists()
+
+            with reversion.create_revision():
+                self.post.title = "Updated post"
+                self.post.save()
+            self.post.publish()
+
+            assert not PublishedSnapshot.objects.exists()
+
+            response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+            assert response.data["featured_post"]["title"] == "Updated post"
+            assert PublishedSnapshot.objects.for_object(self.home_page).count() == 3
+
+    def test_recursively_publish_writes_snapshot(self):
+        with reversion.create_revision():
+            self.post.title = "Draft title"
+            self.post.save()
+
+        with self.enable_snapshots():
+            self.home_page.recursively_publish()
+
+            snapshot = PublishedSnapshot.objects.for_object(self.home_page).get(
+                language="en"
+            )
+            assert snapshot.data["featured_post"]["title"] == "Draft title"
+
+    def test_unpublish_removes_snapshot(self):
+        with self.enable_snapshots():
+            self.home_page.publish()
+            self.home_page.unpublish()
+
+            assert not PublishedSnapshot.objects.exists()
+            response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unrelated_changes_keep_snapshots(self):
+        with self.enable_snapshots():
+            self.home_page.publish()
+
+            with reversion.create_revision():
+                other_post = PostFactory.create(title="Other post")
+            other_post.publish()
+            other_post.delete()
+
+            assert PublishedSnapshot.objects.for_object(self.home_page).count() == 3
+
+    def test_snapshot_checks_object_permissions(self):
+        with self.enable_snapshots():
+            self.home_page.publish()
+
+            with patch.object(
+                HomePageView, "permission_classes", [DenyObjectPermission]
+            ):
+                response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_snapshot_and_live_file_urls_match(self):
+        with reversion.create_revision():
+            article = ArticleFactory.create()
+            article.images.set(ArticleImageFactory.create_batch(1))
+            self.home_page.articles.add(article)
+        self.home_page.recursively_publish()
+
+        live_response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+        with self.enable_snapshots():
+            self.home_page.refresh_snapshots()
+            response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+
+        # Without snapshots, file URLs are built from the request.
+        live_src = live_response.json()["articles"][0]["images"][0]["src"]
+        assert live_src.startswith("http://testserver/")
+        src = response.json()["articles"][0]["images"][0]["src"]
+        assert src.startswith(headless_cms_settings.CMS_HOST)
+        assert src.endswith(live_src.removeprefix("http://testserver"))
+
+        with self.enable_snapshots():
+            with patch.object(HomePageView, "use_published_snapshot", False):
+                live_response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+        assert live_response.json()["articles"][0]["images"][0]["src"] == live_src
+
+        # With snapshots, the live responses build them like the snapshots.
+        with self.enable_snapshots():
+            PublishedSnapshot.objects.for_object(self.home_page).delete()
+            live_response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="en")
+        assert response.json() == live_response.json()
@@ -1,13 +1,20 @@
+from unittest.mock import patch
+
 import reversion
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.pagination import LimitOffsetPagination
 
 from helpers.base import BaseAPITestCase
 from test_app.factories import (  # assuming you have a factory for Post model
+    ArticleFactory,
+    ArticleImageFactory,
     CategoryFactory,
+    HomePageFactory,
     PostFactory,
 )
-from test_app.models import Post
+from test_app.models import ArticleImageThrough, Post
+from test_app.views import HomePageView, PostCMSViewSet
 
 
 class PostCMSViewSetTest(BaseAPITestCase):
@@ -38,3 +45,124 @@ class PostCMSViewSetTest(BaseAPITestCase):
         self.assertNotIn(
             self.unpublished_post.id, [post["id"] for post in response.data]
         )
+
+
+class ETagTest(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.post: Post = PostFactory.create()
+            self.home_page = HomePageFactory.create()
+        self.post.publish()
+        self.home_page.publish()
+
+    def test_list_etag(self):
+        url = reverse("posts-list")
+        response = self.client.get(url)
+
+        etag = response["ETag"]
+        assert response.status_code == status.HTTP_200_OK
+        assert etag.startswith('"') and etag.endswith('"')
+        assert "Accept-Language" in response["Vary"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert "Accept-Language" in response["Vary"]
+        assert not response.content
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_paginated_list_etag(self):
+        with reversion.create_revision():
+            posts = PostFactory.create_batch(2)
+        for post in posts:
+            post.publish()
+        url = f"{reverse('posts-list')}?limit=1&offset=1"
+
+        with patch.multiple(
+            PostCMSViewSet,
+            pagination_class=LimitOffsetPagination,
+            queryset=PostCMSViewSet.queryset.order_by("pk"),
+        ):
+            response = self.client.get(url)
+            etag = response["ETag"]
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["count"] == 3
+            assert [post["id"] for post in response.data["results"]] == [posts[0].id]
+
+            # Objects outside of the page do not change its ETag.
+            with reversion.create_revision():
+                posts[1].title = "Updated"
+                posts[1].save()
+            posts[1].publish()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+            # The count and links of the page do.
+            with reversion.create_revision():
+                post = PostFactory.create()
+            post.publish()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert response["ETag"] != etag
+
+    def test_etag_changes_with_content_and_language(self):
+        url = reverse("posts-detail", args=[self.post.id])
+        etag = self.client.get(url)["ETag"]
+
+        assert self.client.get(url, HTTP_ACCEPT_LANGUAGE="vi")["ETag"] != etag
+
+        with reversion.create_revision():
+            self.post.title = "Updated"
+            self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.post.publish()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_etag_changes_with_sorted_relation_order(self):
+        with reversion.create_revision():
+            article = ArticleFactory.create()
+            for position, image in enumerate(ArticleImageFactory.create_batch(2)):
+                article.images.add(image, through_defaults={"position": position})
+            self.home_page.articles.add(article)
+        self.home_page.recursively_publish()
+
+        url = reverse("home")
+        response = self.client.get(url)
+        etag = response["ETag"]
+        image_ids = [image["id"] for image in response.json()["articles"][0]["images"]]
+
+        first, second = ArticleImageThrough.objects.filter(article=article).order_by(
+            "position"
+        )
+        first.position, second.position = second.position, first.position
+        first.save()
+        second.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            image["id"] for image in response.json()["articles"][0]["images"]
+        ] == image_ids[::-1]
+        assert response["ETag"] != etag
+
+    def test_not_modified_skips_serialization(self):
+        url = reverse("home")
+        etag = self.client.get(url)["ETag"]
+
+        with patch.object(
+            HomePageView, "get_serializer", side_effect=AssertionError
+        ) as get_serializer:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        get_serializer.assert_not_called()
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
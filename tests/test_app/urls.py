@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework import routers
 
-from test_app.views import PostCMSViewSet
+from test_app.views import HomePageView, PostCMSViewSet
 
 router = routers.SimpleRouter()
 router.register(r"", PostCMSViewSet, basename="posts")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("home/", HomePageView.as_view(), name="home"),
+] + router.urls
@@ -1,11 +1,13 @@
-from headless_cms.mixins import CMSSchemaMixin
+from django.http import Http404
+from headless_cms.mixins import CMSSchemaMixin, ETagMixin, PublishedSnapshotMixin
 from headless_cms.serializers import auto_serializer
 from rest_framework import viewsets
+from rest_framework.generics import RetrieveAPIView
 
-from test_app.models import Article, Post
+from test_app.models import Article, HomePage, Post
 
 
-class PostCMSViewSet(CMSSchemaMixin, viewsets.ReadOnlyModelViewSet):
+class PostCMSViewSet(ETagMixin, CMSSchemaMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Post.published_objects.published(auto_prefetch=True)
     serializer_class = auto_serializer(Post)
 
@@ -13,3 +15,14 @@ class PostCMSViewSet(CMSSchemaMixin, viewsets.ReadOnlyModelViewSet):
 class ArticleCMSViewSet(CMSSchemaMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Article.published_objects.published(auto_prefetch=True)
     serializer_class = auto_serializer(Article)
+
+
+class HomePageView(PublishedSnapshotMixin, RetrieveAPIView):
+    model = HomePage
+    serializer_class = auto_serializer(HomePage)
+
+    def get_object(self):
+        obj = self.model.published_objects.published(auto_prefetch=True).first()
+        if not obj:
+            raise Http404
+        return obj
@@ -4,6 +4,7 @@ from reversion.models import Version
 
 from helpers.base import BaseTestCase
 from test_app.factories import PostFactory
+from test_app.models import Post
 
 
 class CleanOutdatedDraftsTests(BaseTestCase):
@@ -21,8 +22,46 @@ class CleanOutdatedDraftsTests(BaseTestCase):
             post.title.en = "Another title"
             post.save()
 
-        assert Version.objects.get_for_object(post).count() == 4
+        # Publishing the unchanged content reuses the latest draft.
+        assert Version.objects.get_for_object(post).count() == 3
 
         call_command("clean_outdated_drafts")
 
         assert Version.objects.get_for_object(post).count() == 2
+
+    def test_clean_outdated_drafts_in_batches(self):
+        posts = []
+        for _ in range(3):
+            with reversion.create_revision():
+                post = PostFactory()
+            with reversion.create_revision():
+                post.title.en = "Other title"
+                post.save()
+            post.publish()
+            posts.append(post)
+
+        call_command("clean_outdated_drafts", dry_run=True, verbosity=0)
+        assert Version.objects.get_for_object(posts[0]).count() == 2
+
+        call_command("clean_outdated_drafts", batch_size=2, verbosity=0)
+        for post in posts:
+            post.refresh_from_db()
+            versions = Version.objects.get_for_object(post)
+            assert versions.count() == 1
+            assert versions.get().pk == post.published_version_id
+
+    def test_clean_outdated_drafts_keeps_published_revisions(self):
+        with reversion.create_revision():
+            post, other_post = PostFactory.create_batch(2)
+        Post.published_objects.all().bulk_publish()
+
+        post.publish()
+        with reversion.create_revision():
+            post.title.en = "Other title"
+            post.save()
+        post.publish()
+
+        call_command("clean_outdated_drafts", verbosity=0)
+
+        other_post.refresh_from_db()
+        assert other_post.published_version_id
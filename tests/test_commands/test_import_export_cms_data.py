@@ -1,17 +1,67 @@
 import json
 import os
+import re
 import shutil
+import tarfile
+import threading
 from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+import reversion
 from django.conf import settings
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from freezegun import freeze_time
 from import_export.exceptions import ImportError as IEImportError
+from reversion.models import Revision, Version
 
 from helpers.base import BaseTestCase
-from test_app.models import Article, Category, Item, Post
+from test_app.models import Article, ArticleImage, Category, Item, Post
+
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class RangeRequestHandler(QuietRequestHandler):
+    """
+    Serves files with support for single byte range requests, and records them along
+    with the number of bytes sent for each response.
+    """
+
+    ranges = []
+    sent = []
+
+    def send_head(self):
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if not match:
+            return super().send_head()
+
+        with open(self.translate_path(self.path), "rb") as f:
+            data = f.read()
+        start, end = int(match[1]), int(match[2])
+        self.ranges.append((start, end))
+        self.sent.append(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(data[start : end + 1])
+        return None
+
+    def copyfile(self, source, outputfile):
+        data = source.read()
+        self.sent.append(len(data))
+        outputfile.write(data)
+
+    def end_headers(self):
+        self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
 
 
 class ImportExportCMSDataTests(BaseTestCase):
@@ -91,6 +141,491 @@ class ImportExportCMSDataTests(BaseTestCase):
 
             self.compare_folder(temp_extracted_result_zip, temp_extracted_expected_zip)
 
+    def test_import_export_cms_gztar_data(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_zip)
+
+            call_command(
+                "export_cms_data",
+                "test_app",
+                output=self.result_dir / "gztar",
+                compress=True,
+                cf="gztar",
+                jobs=2,
+            )
+            result = self.result_dir / "gztar" / f"{now}.tar.gz"
+            assert not (self.result_dir / "gztar" / now).exists()
+
+            Article.objects.all().delete()
+            Item.objects.all().delete()
+            call_command("import_cms_data", "test_app", input=result)
+
+            assert Article.objects.count() == 3
+            assert Item.objects.count() == 9
+
+            temp_extracted_result = self.result_dir / "extracted" / "gztar"
+            shutil.unpack_archive(result, temp_extracted_result)
+            self.compare_folder(temp_extracted_result, self.expected_data_dir)
+
+    def test_export_follows_import_order(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+            for jobs in (1, 2):
+                call_command(
+                    "export_cms_data",
+                    "test_app",
+                    output=self.result_dir / f"ordered-{jobs}",
+                    compress=True,
+                    cf="tar",
+                    jobs=jobs,
+                )
+
+        for jobs in (1, 2):
+            result = self.result_dir / f"ordered-{jobs}" / f"{now}.tar"
+            out = StringIO()
+            call_command("import_cms_data", "test_app", input=result, stdout=out)
+
+            imported = re.findall(r"Import data for (\w+)", out.getvalue())
+            with tarfile.open(result) as tar:
+                exported = [Path(name).stem for name in tar.getnames()]
+            assert exported == imported
+
+    def test_parallel_export(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+
+            out = StringIO()
+            call_command(
+                "export_cms_data",
+                "test_app",
+                output=self.result_dir / "parallel",
+                jobs=2,
+                stdout=out,
+            )
+
+            self.compare_folder(
+                self.expected_data_dir, self.result_dir / "parallel" / now
+            )
+            assert "Export data for Post (" in out.getvalue()
+
+    def test_export_jsonl_data(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+
+            call_command(
+                "export_cms_data",
+                "test_app",
+                output=self.result_dir / "jsonl",
+                format="jsonl",
+                chunk_size=2,
+            )
+            result = self.result_dir / "jsonl" / now
+
+            expected = self.get_folder_contents(self.expected_data_dir)
+            for path, _sub_dirs, files in os.walk(result):
+                for name in files:
+                    rel_file = os.path.relpath(os.path.join(path, name), result)
+                    with open(os.path.join(path, name)) as f:
+                        rows = [json.loads(line) for line in f]
+                    assert rows == expected.pop(rel_file.replace(".jsonl", ".json"))
+            assert not expected
+
+    def test_import_jsonl_data(self):
+        jsonl_dir = self.result_dir / "jsonl-input"
+        for rel_file, rows in self.get_folder_contents(self.expected_data_dir).items():
+            dest_file = (jsonl_dir / rel_file).with_suffix(".jsonl")
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(dest_file, "w") as f:
+                f.writelines(f"{json.dumps(row)}\n" for row in rows)
+
+        call_command("import_cms_data", "test_app", input=jsonl_dir, chunk_size=2)
+
+        assert Post.objects.count() == 3
+        assert Article.objects.count() == 3
+        assert Item.objects.count() == 9
+
+    def test_fast_import(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command(
+                "import_cms_data",
+                "test_app",
+                input=self.expected_data_dir,
+                fast=True,
+                chunk_size=2,
+            )
+
+            assert Post.objects.count() == 3
+            assert Article.objects.count() == 3
+            assert Item.objects.count() == 9
+            post = Post.objects.get(pk=1)
+            assert Version.objects.get_for_object(post).count() == 1
+            # One revision per chunk of 2 posts.
+            assert (
+                Revision.objects.filter(version__content_type__model="post")
+                .distinct()
+                .count()
+                == 2
+            )
+
+            # Importing again updates the existing rows. Only the objects whose
+            # many-to-many relations were imported after them get a new version.
+            call_command(
+                "import_cms_data", "test_app", input=self.expected_data_dir, fast=True
+            )
+            assert Item.objects.count() == 9
+            assert Version.objects.get_for_object(post).count() == 2
+            assert Version.objects.get_for_object(Item.objects.first()).count() == 1
+
+            version_count = Version.objects.count()
+            call_command(
+                "import_cms_data", "test_app", input=self.expected_data_dir, fast=True
+            )
+            assert Version.objects.count() == version_count
+
+            call_command("export_cms_data", "test_app", output=self.result_dir / "fast")
+            self.compare_folder(self.expected_data_dir, self.result_dir / "fast" / now)
+
+            # Only the changed rows get a new version.
+            post.title.en = "Changed"
+            post.save()
+            call_command(
+                "import_cms_data", "test_app", input=self.expected_data_dir, fast=True
+            )
+            assert Version.objects.get_for_object(post).count() == 3
+            assert Version.objects.count() == version_count + 1
+
+    def test_fast_import_missing_relation(self):
+        input_dir = self.result_dir / "fast-missing-relation"
+        shutil.copytree(self.expected_data_dir, input_dir, dirs_exist_ok=True)
+        (input_dir / "test_app" / "Category.json").write_text("[]")
+
+        with pytest.raises(IEImportError, match="Category matching 1 does not exist"):
+            call_command("import_cms_data", "test_app", input=input_dir, fast=True)
+
+        assert not Post.objects.exists()
+
+    def test_model_commit_import(self):
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = self.result_dir / "model-checkpoint.json"
+
+        with pytest.raises(IEImportError):
+            call_command(
+                "import_cms_data",
+                "test_app",
+                input=self.corrupted_data_dir,
+                commit="model",
+                checkpoint=checkpoint,
+            )
+
+        # The categories were committed before the posts failed.
+        assert Category.objects.count() == 2
+        assert not Post.objects.exists()
+        data = json.loads(checkpoint.read_text())
+        assert "test_app.Category" in data["models"]
+        assert "test_app.Post" not in data["models"]
+        assert not data["finished"]
+
+    def test_resume_chunk_commit_import(self):
+        input_dir = self.result_dir / "resume-input"
+        shutil.copytree(self.expected_data_dir, input_dir, dirs_exist_ok=True)
+        articles_file = input_dir / "test_app" / "Article.json"
+        articles = json.loads(articles_file.read_text())
+        broken_articles = json.loads(articles_file.read_text())
+        broken_articles[2]["note"] = 999
+        articles_file.write_text(json.dumps(broken_articles))
+        checkpoint = self.result_dir / "chunk-checkpoint.json"
+        options = {
+            "input": input_dir,
+            "commit": "chunk",
+            "chunk_size": 2,
+            "checkpoint": checkpoint,
+            "fast": True,
+        }
+
+        with pytest.raises(IEImportError, match="Note matching 999 does not exist"):
+            call_command("import_cms_data", "test_app", **options)
+
+        assert Article.objects.count() == 2
+        data = json.loads(checkpoint.read_text())
+        assert data["current_model"] == "test_app.Article"
+        assert data["current_rows"] == 2
+
+        articles_file.write_text(json.dumps(articles))
+        call_command("import_cms_data", "test_app", resume=True, **options)
+
+        assert Post.objects.count() == 3
+        assert Article.objects.count() == 3
+        assert Item.objects.count() == 9
+        # The committed chunks were not imported again.
+        for article in Article.objects.all():
+            assert Version.objects.get_for_object(article).count() == 1
+        assert json.loads(checkpoint.read_text())["finished"]
+
+    def test_resume_errors(self):
+        with pytest.raises(CommandError, match="requires --commit"):
+            call_command(
+                "import_cms_data", "test_app", input=self.expected_data_dir, resume=True
+            )
+
+        with pytest.raises(CommandError, match="No checkpoint"):
+            call_command(
+                "import_cms_data",
+                "test_app",
+                input=self.expected_data_dir,
+                commit="model",
+                checkpoint=self.result_dir / "missing-checkpoint.json",
+                resume=True,
+            )
+
+    def test_delta_export_import(self):
+        base_dir = self.result_dir / "delta-base"
+        delta_dir = self.result_dir / "delta"
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+            call_command("export_cms_data", "test_app", output=base_dir, manifest=True)
+            base = base_dir / now
+
+        with freeze_time("2012-01-15 12:00:01"):
+            post = Post.objects.get(pk=1)
+            with reversion.create_revision():
+                post.title.en = "Changed"
+                post.save()
+            Item.objects.filter(pk=9).delete()
+
+        with freeze_time("2012-01-16 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("export_cms_data", "test_app", output=delta_dir, since=base)
+            delta = delta_dir / now
+
+        contents = self.get_folder_contents(delta)
+        assert [row["id"] for row in contents["test_app/Post.json"]] == ["1"]
+        assert contents["test_app/Category.json"] == []
+        assert contents["test_app/Item.json"] == []
+        manifest = contents["./manifest.json"]
+        assert manifest["since"] == "2012-01-14T12:00:01+00:00"
+        assert manifest["deleted"] == {"test_app.Item": ["9"]}
+
+        # The delta applies on top of the base export.
+        call_command("import_cms_data", "test_app", input=base)
+        assert Item.objects.filter(pk=9).exists()
+        call_command("import_cms_data", "test_app", input=delta, delta=True)
+        assert Post.objects.get(pk=1).title.en == "Changed"
+        assert not Item.objects.filter(pk=9).exists()
+        assert Item.objects.count() == 8
+
+        with pytest.raises(CommandError, match="requires an export"):
+            call_command(
+                "import_cms_data", "test_app", input=self.expected_data_dir, delta=True
+            )
+
+    def test_delta_import_deletes_dependents_first(self):
+        base_dir = self.result_dir / "delta-parent-base"
+        delta_dir = self.result_dir / "delta-parent"
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+            call_command("export_cms_data", "test_app", output=base_dir, manifest=True)
+            base = base_dir / now
+
+        # An article is deleted with one of its images and their through rows.
+        Article.objects.filter(pk=2).delete()
+        ArticleImage.objects.filter(pk=2).delete()
+
+        with freeze_time("2012-01-16 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("export_cms_data", "test_app", output=delta_dir, since=base)
+            delta = delta_dir / now
+
+        call_command("import_cms_data", "test_app", input=base)
+        out = StringIO()
+        call_command("import_cms_data", "test_app", input=delta, delta=True, stdout=out)
+
+        # Each model is deleted before the ones it depends on, so no deletion cascades
+        # to the objects of another model.
+        deleted = {
+            name: int(count)
+            for count, name in re.findall(
+                r"Deleted (\d+) objects for (\w+)", out.getvalue()
+            )
+        }
+        names = list(deleted)
+        assert names.index("Item") < names.index("Article")
+        assert names.index("ArticleImageThrough") < names.index("Article")
+        assert names.index("Blog_articles") < names.index("Article")
+        assert names.index("Article") < names.index("ArticleImage")
+        assert deleted["Item"] > 0
+        assert deleted["ArticleImageThrough"] == 3
+        assert deleted["Blog_articles"] == 2
+        assert not Article.objects.filter(pk=2).exists()
+        assert not ArticleImage.objects.filter(pk=2).exists()
+
+    def test_delta_export_since_date(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+        with freeze_time("2012-01-15 12:00:01"):
+            with reversion.create_revision():
+                Category.objects.get(pk=1).save()
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output = self.result_dir / "delta-since-date"
+            call_command(
+                "export_cms_data", "test_app", output=output, since="2012-01-15"
+            )
+
+        contents = self.get_folder_contents(output / now)
+        assert [row["id"] for row in contents["test_app/Category.json"]] == ["1"]
+        assert contents["test_app/Post.json"] == []
+        assert contents["./manifest.json"]["deleted"] == {}
+
+        with pytest.raises(CommandError):
+            call_command("export_cms_data", "test_app", output=output, since="soon")
+
+    def test_export_import_published_versions(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+            Post.objects.get(pk=1).publish()
+            post = Post.objects.get(pk=2)
+            post.title.en = "Published"
+            post.publish()
+            with reversion.create_revision():
+                post.title.en = "Draft"
+                post.save()
+
+            output = self.result_dir / "published"
+            call_command("export_cms_data", "test_app", output=output, published=True)
+
+        rows = self.get_folder_contents(output / now)["test_app/Post.json"]
+        payloads = {row["id"]: row["published_version"] for row in rows}
+        assert payloads["3"] is None
+        fields = json.loads(payloads["2"]["serialized_data"])[0]["fields"]
+        assert json.loads(fields["title"])["en"] == "Published"
+        # Through models have no published version.
+        assert (
+            "published_version"
+            not in self.get_folder_contents(output / now)["test_app/Post_tags.json"][0]
+        )
+
+        # Restore the export in an environment without revisions.
+        Revision.objects.all().delete()
+        for options in ({}, {"fast": True}):
+            call_command("import_cms_data", "test_app", input=output / now, **options)
+
+            post = Post.objects.get(pk=1)
+            assert post.published_version_id == post.get_latest_version_id()
+            assert post.published_data["title"] == post.title
+            post = Post.objects.get(pk=2)
+            assert post.published_data["title"].en == "Published"
+            assert post.title.en == "Draft"
+            assert post.get_latest_version_id() > post.published_version_id
+            assert (
+                Version.objects.get(pk=post.get_latest_version_id()).field_dict["title"]
+                == post.title
+            )
+            assert Post.objects.get(pk=3).published_version_id is None
+            assert Post.published_objects.published().count() == 2
+
+        # The published versions are restored in the revision database.
+        Revision.objects.all().delete()
+        with patch.object(
+            Revision.objects, "using", wraps=Revision.objects.using
+        ) as revision_using:
+            call_command(
+                "import_cms_data",
+                "test_app",
+                input=output / now,
+                fast=True,
+                using="default",
+            )
+        revision_using.assert_any_call("default")
+        assert Post.published_objects.published().count() == 2
+
+    def serve_data_dir(self, handler_class):
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(handler_class, directory=str(self.data_dir))
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_import_remote_data(self):
+        RangeRequestHandler.ranges = []
+        url = self.serve_data_dir(RangeRequestHandler)
+        call_command("import_cms_data", "test_app", input=f"{url}/expected_data.zip")
+
+        assert Post.objects.count() == 3
+        assert Item.objects.count() == 9
+        # The archive was read with range requests, not downloaded first.
+        assert RangeRequestHandler.ranges
+        assert not Path("temp_import").exists()
+
+    def test_import_remote_gztar_data(self):
+        archive = shutil.make_archive(
+            str(self.result_dir / "remote"), "gztar", self.expected_data_dir
+        )
+        RangeRequestHandler.ranges = []
+        RangeRequestHandler.sent = []
+        url = self.serve_data_dir(RangeRequestHandler)
+        call_command(
+            "import_cms_data",
+            "test_app",
+            input=f"{url}/results/remote.tar.gz",
+            verbosity=0,
+        )
+
+        assert Post.objects.count() == 3
+        assert Item.objects.count() == 9
+        # The compressed tar was downloaded once, not read again with range requests.
+        assert not RangeRequestHandler.ranges
+        assert sum(RangeRequestHandler.sent) == os.path.getsize(archive)
+
+    def test_import_remote_export_streams_tar(self):
+        with freeze_time("2012-01-14 12:00:01"):
+            now = datetime.now().strftime("%Y%m%d-%H%M%S")
+            call_command("import_cms_data", "test_app", input=self.expected_data_dir)
+            call_command(
+                "export_cms_data",
+                "test_app",
+                output=self.result_dir / "streamed",
+                compress=True,
+                cf="gztar",
+            )
+        Item.objects.all().delete()
+        Article.objects.all().delete()
+
+        url = self.serve_data_dir(RangeRequestHandler)
+        with patch(
+            "headless_cms.utils.archives.TemporaryFile",
+            side_effect=AssertionError("spooled"),
+        ):
+            call_command(
+                "import_cms_data",
+                "test_app",
+                input=f"{url}/results/streamed/{now}.tar.gz",
+                verbosity=0,
+            )
+
+        assert Article.objects.count() == 3
+        assert Item.objects.count() == 9
+
+    def test_import_remote_data_without_range_requests(self):
+        url = self.serve_data_dir(QuietRequestHandler)
+        call_command(
+            "import_cms_data",
+            "test_app",
+            input=f"{url}/expected_data.zip",
+            verbosity=0,
+        )
+
+        assert Post.objects.count() == 3
+        assert Item.objects.count() == 9
+
     def test_invalid_import_data(self):
         with pytest.raises(shutil.ReadError, match=r"is not a zip file"):
             call_command(
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+import reversion
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.utils import timezone
+from headless_cms.contrib.revision_partitions.partitioning import is_partitioned
+from headless_cms.settings import headless_cms_settings
+from reversion.models import Revision, Version
+
+from helpers.base import BaseTestCase
+from test_app.factories import PostFactory
+
+
+class PartitionRevisionsTests(BaseTestCase):
+    def create_post(self, days_ago=0, publish=False):
+        with reversion.create_revision():
+            post = PostFactory()
+        if publish:
+            post.title.en = "Published"
+            post.publish()
+        Revision.objects.filter(version__object_id=str(post.pk)).update(
+            date_created=timezone.now() - timedelta(days=days_ago)
+        )
+        return post
+
+    def test_partition_revisions(self):
+        draft = self.create_post(days_ago=180)
+        published = self.create_post(days_ago=210, publish=True)
+        post = self.create_post(publish=True)
+
+        # The conversion is rolled back at the end, so the tables are never left
+        # partitioned for the other tests.
+        with transaction.atomic():
+            assert not is_partitioned()
+            with pytest.raises(CommandError):
+                call_command("partition_revisions", verbosity=0)
+
+            call_command("partition_revisions", convert=True, verbosity=0)
+            assert is_partitioned()
+            assert Version.objects.count() == 5
+
+            # Converting again is a no-op.
+            out = StringIO()
+            call_command("partition_revisions", convert=True, stdout=out)
+            assert "Partitioned the revision tables." not in out.getvalue()
+            assert is_partitioned()
+            assert Version.objects.count() == 5
+
+            # The partitioned tables keep working as before.
+            with reversion.create_revision():
+                post.title.en = "Changed"
+                post.save()
+            post.publish()
+            post.refresh_from_db()
+            assert post.published_data["title"].en == "Changed"
+
+            with patch.object(headless_cms_settings, "REVISION_RETENTION_MONTHS", 2):
+                call_command("partition_revisions", verbosity=0)
+
+            assert not Version.objects.get_for_object(draft).exists()
+            published.refresh_from_db()
+            assert published.published_data["title"].en == "Published"
+            assert Version.objects.get_for_object(post).count() == 3
+
+            transaction.set_rollback(True)
+
+        assert not is_partitioned()
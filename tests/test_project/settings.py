@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     "headless_cms.contrib.astrowind.astrowind_pages",
     "headless_cms.contrib.astrowind.astrowind_posts",
     "headless_cms.contrib.astrowind.astrowind_metadata",
+    "headless_cms.contrib.revision_partitions",
 ]
 
 MIDDLEWARE = [
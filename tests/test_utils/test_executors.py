@@ -0,0 +1,105 @@
+import functools
+import operator
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import reversion
+from django.test import SimpleTestCase
+from headless_cms.settings import headless_cms_settings
+from headless_cms.utils.executors import get_thread_pool, iter_actions, run_actions
+
+from helpers.base import BaseTestCase
+from test_app.factories import CategoryFactory, PostFactory, PostTagFactory
+
+
+class RunActionsTests(SimpleTestCase):
+    def actions(self, count):
+        return [functools.partial(operator.neg, i) for i in range(count)]
+
+    def test_backends_return_results_in_order(self):
+        for executor in ["sync", "thread", "process"]:
+            with self.subTest(executor=executor):
+                results = run_actions(self.actions(5), executor=executor)
+                assert results == [0, -1, -2, -3, -4]
+
+    def test_iter_actions_yields_indexed_results(self):
+        for executor in ["sync", "thread", "process"]:
+            with self.subTest(executor=executor):
+                results = dict(iter_actions(self.actions(5), executor=executor))
+                assert results == {0: 0, 1: -1, 2: -2, 3: -3, 4: -4}
+
+    def test_thread_pool_is_bounded(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def action():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        run_actions([action] * 10, executor="thread", max_workers=2)
+
+        assert max(peak) <= 2
+
+    def test_thread_pools_of_other_sizes_are_kept(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def action():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        pool = get_thread_pool(3)
+        future = pool.submit(action)
+        started.wait(5)
+        try:
+            results = run_actions(self.actions(2), executor="thread", max_workers=4)
+            assert results == [0, -1]
+            # The pool of the first size is still running and accepting tasks.
+            assert get_thread_pool(3) is pool
+            assert pool.submit(operator.neg, 1).result(5) == -1
+        finally:
+            release.set()
+        assert future.result(5) == "done"
+
+    def test_nested_actions_run_in_worker(self):
+        def action():
+            return run_actions([threading.get_ident] * 2, executor="thread")
+
+        for idents in run_actions([action] * 2, executor="thread", max_workers=1):
+            assert len(set(idents)) == 1
+
+    def test_exceptions_are_propagated(self):
+        def fail():
+            raise ValueError("failed")
+
+        with pytest.raises(ValueError, match="failed"):
+            run_actions([fail, *self.actions(3)], executor="thread")
+
+        with pytest.raises(ValueError, match="Unknown"):
+            run_actions(self.actions(2), executor="unknown")
+
+
+class RecursiveActionTests(BaseTestCase):
+    def test_recursively_publish_with_each_backend(self):
+        for executor in ["sync", "thread"]:
+            with self.subTest(executor=executor):
+                with patch.object(
+                    headless_cms_settings, "RECURSIVE_ACTION_EXECUTOR", executor
+                ):
+                    with reversion.create_revision():
+                        post = PostFactory.create(category=CategoryFactory.create())
+                        post.tags.set(PostTagFactory.create_batch(2))
+                    post.recursively_publish()
+
+                post.refresh_from_db()
+                assert post.published_version
+                assert post.category.published_version
+                assert all(tag.published_version for tag in post.tags.all())
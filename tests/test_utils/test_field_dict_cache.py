@@ -0,0 +1,95 @@
+import reversion
+from django.utils import translation
+from headless_cms.utils.field_dict_cache import FieldDictCache, published_data_cache
+from localized_fields.value import LocalizedValue
+
+from helpers.base import BaseTestCase
+from test_app.factories import PostFactory
+from test_app.models import Post
+
+
+class FieldDictCacheTests(BaseTestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = FieldDictCache(max_entries=2, max_size=100)
+        cache.set(1, {"a": 1}, 10)
+        cache.set(2, {"b": 2}, 10)
+        cache.get(1)
+        cache.set(3, {"c": 3}, 10)
+
+        assert cache.get(2) is None
+        assert cache.get(1) == {"a": 1}
+        assert cache.get(3) == {"c": 3}
+
+    def test_evicts_by_size(self):
+        cache = FieldDictCache(max_entries=10, max_size=25)
+        cache.set(1, {"a": 1}, 10)
+        cache.set(2, {"b": 2}, 10)
+        cache.set(3, {"c": 3}, 10)
+        cache.set(4, {"d": 4}, 30)
+
+        info = cache.info()
+        assert info.entries == 2
+        assert info.size == 20
+        assert cache.get(1) is None
+        assert cache.get(4) is None
+
+    def test_disabled_cache(self):
+        cache = FieldDictCache(max_entries=0, max_size=100)
+        cache.set(1, {"a": 1}, 10)
+
+        assert cache.get(1) is None
+
+    def test_returns_copies(self):
+        cache = FieldDictCache(max_entries=2, max_size=100)
+        cache.set(1, {"a": 1}, 10)
+        cache.get(1)["a"] = 2
+
+        assert cache.get(1) == {"a": 1}
+
+    def test_mutable_values_are_not_shared(self):
+        cache = FieldDictCache(max_entries=2, max_size=100)
+        field_dict = {"title": LocalizedValue({"en": "Title"})}
+        cache.set(1, field_dict, 10)
+        field_dict["title"].en = "Changed"
+        cache.get(1)["title"].en = "Changed"
+
+        assert cache.get(1)["title"].en == "Title"
+
+    def test_counters(self):
+        cache = FieldDictCache(max_entries=2, max_size=100)
+        cache.get(1)
+        cache.set(1, {"a": 1}, 10)
+        cache.get(1)
+        cache.get(1)
+
+        info = cache.info()
+        assert (info.hits, info.misses) == (2, 1)
+
+        cache.clear()
+        assert cache.info() == (0, 0, 0, 0, 2, 100)
+
+
+class PublishedDataCacheTests(BaseTestCase):
+    def test_published_data_is_cached_by_version(self):
+        translation.activate("en")
+        with reversion.create_revision():
+            post: Post = PostFactory.create(title="Init title")
+        post.publish()
+        published_data_cache.clear()
+
+        assert post.published_data["title"] == "Init title"
+        reloaded = Post.objects.get(pk=post.pk)
+        with self.assertNumQueries(0):
+            assert reloaded.published_data["title"] == "Init title"
+        assert published_data_cache.info()[:2] == (1, 1)
+
+        reloaded.published_data["title"].en = "Mutated"
+        assert post.published_data["title"] == "Init title"
+
+        with reversion.create_revision():
+            post.title = "New title"
+            post.save()
+        post.publish()
+
+        assert post.published_data["title"] == "New title"
+        translation.deactivate()
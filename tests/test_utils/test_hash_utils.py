@@ -0,0 +1,34 @@
+import itertools
+
+from django.test import SimpleTestCase
+from headless_cms.utils.hash_utils import HashTracker
+
+
+class HashTrackerTests(SimpleTestCase):
+    def test_hash_does_not_depend_on_order(self):
+        values = [1, "2", 3]
+        hashes = set()
+        for permutation in itertools.permutations(values):
+            tracker = HashTracker()
+            for value in permutation:
+                tracker.update_hash(value)
+            hashes.add(tracker.current_hash)
+
+        assert len(hashes) == 1
+
+    def test_update_hashes_matches_update_hash(self):
+        tracker = HashTracker()
+        for value in [1, 2, 3]:
+            tracker.update_hash(value)
+
+        bulk_tracker = HashTracker(initial_data="1")
+        bulk_tracker.update_hashes([3, None, 2])
+
+        assert bulk_tracker.current_hash == tracker.current_hash
+
+    def test_none_values_are_skipped(self):
+        tracker = HashTracker()
+        tracker.update_hashes([None, None])
+        tracker.update_hash(None)
+
+        assert tracker.current_hash is None
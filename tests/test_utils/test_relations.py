@@ -1,7 +1,23 @@
-from headless_cms.utils.relations import calculate_prefetch_relation
+import reversion
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from headless_cms.utils.hash_utils import HashTracker
+from headless_cms.utils.relations import RelationGraph, calculate_prefetch_relation
+from headless_cms.utils.tree_hash import get_recursive_hashes
 
 from helpers.base import BaseTestCase
-from test_app.models import Blog
+from test_app.factories import (
+    ArticleFactory,
+    ArticleImageFactory,
+    BlogFactory,
+    CategoryFactory,
+    NoteFactory,
+    PostFactory,
+    PostItemFactory,
+    PostTagFactory,
+)
+from test_app.models import Blog, Post
 
 
 class RelationTests(BaseTestCase):
@@ -36,3 +52,183 @@ class RelationTests(BaseTestCase):
             "domain",
             "domain__published_version",
         }
+
+
+class RecursiveHashTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.category = CategoryFactory.create()
+            self.tags = PostTagFactory.create_batch(2)
+            self.note = NoteFactory.create()
+        for obj in [self.category, self.note, *self.tags]:
+            obj.publish()
+
+    def create_posts(self, count):
+        posts = []
+        for _ in range(count):
+            with reversion.create_revision():
+                post = PostFactory.create(category=self.category, note=self.note)
+                post.tags.set(self.tags)
+                PostItemFactory.create_batch(2, content_object=post)
+            post.recursively_publish()
+            posts.append(post)
+        return posts
+
+    def count_queries(self, objs):
+        nodes = [(obj.__class__, obj.pk) for obj in objs]
+        with CaptureQueriesContext(connection) as ctx:
+            RelationGraph.load(objs).recursive_hashes(nodes)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_objects(self):
+        posts = self.create_posts(5)
+
+        assert self.count_queries(posts[:1]) == self.count_queries(posts)
+
+    def test_hash_covers_each_reachable_version_once(self):
+        post = self.create_posts(1)[0]
+        post.refresh_from_db()
+
+        graph = RelationGraph.load([post])
+        reachable = graph.reachable_nodes([(Post, post.pk)])[(Post, post.pk)]
+        assert len(reachable) == 1 + 1 + 1 + 2 + 2
+
+        expected = HashTracker()
+        expected.update_hashes(graph.version_ids[node] for node in reachable)
+        assert post.get_recursive_hash() == expected.current_hash
+
+    def test_batch_hashes_match_single_hashes(self):
+        posts = self.create_posts(3)
+        with reversion.create_revision():
+            blog = BlogFactory.create()
+            blog.posts.set(posts[:2])
+            article = ArticleFactory.create(note=self.note)
+            article.images.set(ArticleImageFactory.create_batch(2))
+            blog.articles.set([article])
+        blog.recursively_publish()
+
+        objs = [*Post.objects.all(), blog]
+        hashes = get_recursive_hashes(objs)
+
+        assert hashes == {obj: obj.get_recursive_hash() for obj in objs}
+        assert len(set(hashes.values())) == len(objs)
+
+    def test_hash_follows_publication_and_relations(self):
+        post = self.create_posts(1)[0]
+        initial_hash = post.get_recursive_hash()
+
+        with reversion.create_revision():
+            self.note.text = "Updated"
+            self.note.save()
+        assert post.get_recursive_hash() == initial_hash
+
+        self.note.publish()
+        published_hash = post.get_recursive_hash()
+        assert published_hash != initial_hash
+
+        post.tags.remove(self.tags[0])
+        assert post.get_recursive_hash() != published_hash
+
+        post.tags.add(self.tags[0])
+        assert post.get_recursive_hash() == published_hash
+
+    def test_unpublished_tree_has_no_hash(self):
+        with reversion.create_revision():
+            post = PostFactory.create()
+
+        assert post.get_recursive_hash() is None
+
+    def test_reachable_nodes_with_cycles(self):
+        graph = RelationGraph()
+        graph.children = {
+            "a": {"b"},
+            "b": {"c", "d"},
+            "c": {"b"},
+            "d": set(),
+            "e": {"a"},
+        }
+
+        reachable = graph.reachable_nodes(["e", "c"])
+
+        assert reachable["b"] is reachable["c"]
+        assert reachable["c"] == {"b", "c", "d"}
+        assert reachable["a"] == {"a", "b", "c", "d"}
+        assert reachable["e"] == {"a", "b", "c", "d", "e"}
+        assert reachable["d"] == {"d"}
+
+
+class TreeHashTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with reversion.create_revision():
+            self.category = CategoryFactory.create()
+            self.tags = PostTagFactory.create_batch(2)
+            self.post = PostFactory.create(category=self.category)
+            self.post.tags.set(self.tags)
+        self.post.recursively_publish()
+        self.post.refresh_from_db()
+
+    def stored_hash(self, obj):
+        return obj.__class__.objects.values_list("tree_hash", flat=True).get(pk=obj.pk)
+
+    def computed_hash(self, obj):
+        node = (obj.__class__, obj.pk)
+        return RelationGraph.load([obj]).recursive_hashes([node])[node]
+
+    def test_hash_is_stored_on_publish(self):
+        assert self.post.tree_hash
+        assert self.post.tree_hash == self.computed_hash(self.post)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert self.post.get_recursive_hash() == self.post.tree_hash
+        assert len(ctx.captured_queries) == 1
+
+    def test_publishing_a_child_updates_its_ancestors(self):
+        with reversion.create_revision():
+            self.category.name = "Updated"
+            self.category.save()
+        self.category.publish()
+
+        assert self.stored_hash(self.post) == self.computed_hash(self.post)
+        assert self.stored_hash(self.post) != self.post.tree_hash
+
+        self.category.unpublish()
+        assert self.stored_hash(self.category) == ""
+        assert self.stored_hash(self.post) == self.computed_hash(self.post)
+
+    def test_relation_changes_invalidate_hash(self):
+        self.post.tags.remove(self.tags[0])
+        assert self.stored_hash(self.post) is None
+        with CaptureQueriesContext(connection) as ctx:
+            assert self.post.get_recursive_hash() == self.computed_hash(self.post)
+        assert not [q for q in ctx.captured_queries if "UPDATE" in q["sql"]]
+        assert self.stored_hash(self.post) is None
+
+        self.post.refresh_tree_hashes()
+        assert self.stored_hash(self.post) == self.computed_hash(self.post)
+
+        with reversion.create_revision():
+            self.post.category = None
+            self.post.save()
+        assert self.stored_hash(self.post) is None
+
+        self.tags[1].delete()
+        assert self.post.get_recursive_hash() == self.computed_hash(self.post)
+
+    def test_hashes_refreshed_in_a_transaction_are_kept(self):
+        with transaction.atomic():
+            with reversion.create_revision():
+                self.category.name = "Updated"
+                self.category.save()
+            self.category.publish()
+
+        assert self.stored_hash(self.post) == self.computed_hash(self.post)
+        assert self.stored_hash(self.category) == self.computed_hash(self.category)
+
+    def test_rebuild_tree_hashes_command(self):
+        Post.objects.update(tree_hash=None)
+
+        call_command("rebuild_tree_hashes", "test_app.post", verbosity=0)
+
+        assert self.stored_hash(self.post) == self.post.tree_hash